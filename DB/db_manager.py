@@ -1,27 +1,292 @@
 # Fichier : db_manager.py
 
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime
+
 import oracledb
-from configs.config import DB_USER, DB_PASSWORD, DB_DSN
-from .db_schema import CREATE_TABLES_SQL, DROP_TABLES_SQL
+from configs.config import (DB_USER, DB_PASSWORD, DB_DSN, DB_BATCH_SIZE, QUARANTINE_DIR,
+                            DB_POOL_ENABLED, DB_POOL_MIN, DB_POOL_MAX, DB_POOL_INCREMENT,
+                            DB_LOAD_WORKERS, DB_FETCH_ARRAYSIZE,
+                            DB_DOCUMENT_CHUNK_SIZE, DB_STORAGE_PROFILE, DB_EXTRACT_VIEW,
+                            DB_EXTRACT_PARTITIONS)
+from .db_schema import (DROP_TABLES_SQL, TABLE_DEPENDENCIES, FOREIGN_KEYS,
+                        STAGING_TABLES, STAGING_TABLES_SQL, DROP_STAGING_TABLES_SQL, MERGE_KEYS,
+                        SECONDARY_INDEXES, CREATE_INDEXES_SQL, STORAGE_PROFILES,
+                        XML_EXTRACT_FROM, XML_EXTRACT_COLUMNS, EXTRACT_VIEW,
+                        CREATE_EXTRACT_VIEW_SQL, CREATE_EXTRACT_VIEW_INDEX_SQL,
+                        DROP_EXTRACT_VIEW_SQL, get_create_tables_sql)
+from services.data_processor import CODE_PREFIX, normalize_release_dates
+import numpy as np
 import pandas as pd
-from datetime import datetime
+
+# pyarrow est optionnel : sans lui, fetch_extract_frame construit le DataFrame
+# à partir de tableaux NumPy
+try:
+    import pyarrow
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Méthode de chargement de chaque table, dans l'ordre du chargement séquentiel
+TABLE_LOADERS = {
+    'sp_genres': '_load_genres',
+    'sp_artists': '_load_artists',
+    'sp_subgenres': '_load_subgenres',
+    'sp_albums': '_load_albums',
+    'sp_tracks': '_load_tracks',
+    'sp_audio_features': '_load_audio_features',
+    'sp_playlists': '_load_playlists',
+    'sp_playlist_tracks': '_load_playlist_tracks'
+}
+
+# Tables comptées par get_statistics (ordre d'affichage)
+STATISTICS_TABLES = [
+    'sp_genres', 'sp_subgenres', 'sp_artists', 'sp_albums',
+    'sp_tracks', 'sp_audio_features', 'sp_playlists', 'sp_playlist_tracks'
+]
+
+# Extraction XML par la jointure des huit tables (une ligne par piste de playlist)
+XML_EXTRACT_SQL = f"""
+    SELECT {XML_EXTRACT_COLUMNS}
+    {XML_EXTRACT_FROM}
+    ORDER BY p.id_playlist, t.track_name, t.id_track
+"""
+
+# Même extraction lue dans la vue matérialisée (déjà jointe)
+EXTRACT_VIEW_SQL = f"SELECT * FROM {EXTRACT_VIEW} ORDER BY id_playlist, track_name, id_track"
+
+# Variantes limitées à une tranche de playlists (extraction parallèle)
+XML_EXTRACT_RANGE_SQL = f"""
+    SELECT {XML_EXTRACT_COLUMNS}
+    {XML_EXTRACT_FROM}
+    WHERE p.id_playlist BETWEEN :1 AND :2
+    ORDER BY p.id_playlist, t.track_name, t.id_track
+"""
+
+EXTRACT_VIEW_RANGE_SQL = (
+    f"SELECT * FROM {EXTRACT_VIEW} WHERE id_playlist BETWEEN :1 AND :2 "
+    "ORDER BY id_playlist, track_name, id_track"
+)
+
+# Bornes de :1 tranches contiguës de playlists, de tailles égales à une près
+PARTITION_BOUNDS_SQL = """
+    SELECT MIN(id_playlist), MAX(id_playlist)
+    FROM (SELECT id_playlist, NTILE(:1) OVER (ORDER BY id_playlist) AS tranche
+          FROM sp_playlists)
+    GROUP BY tranche
+    ORDER BY tranche
+"""
+
+
+# --- Génération des documents côté serveur (un document par playlist) ---
+
+# Durée au format MM:SS (même règle que xml_exporter.format_duration)
+_DURATION_SQL = """CASE WHEN NVL(t.duration_ms, 0) = 0 THEN '00:00'
+                        ELSE TO_CHAR(TRUNC(t.duration_ms / 60000), 'FM999999900') || ':' ||
+                             TO_CHAR(TRUNC(MOD(t.duration_ms, 60000) / 1000), 'FM00') END"""
+
+# <audio_features> n'est créé que si une caractéristique est non nulle, et
+# chaque caractéristique nulle ou à zéro est omise (comme en Python)
+_XML_FEATURES_SQL = """CASE WHEN NVL(af.energy, 0) <> 0 OR NVL(af.tempo, 0) <> 0
+                              OR NVL(af.danceability, 0) <> 0 OR NVL(af.loudness, 0) <> 0
+                              OR NVL(af.valence, 0) <> 0 OR NVL(af.liveness, 0) <> 0
+                              OR NVL(af.speechiness, 0) <> 0 OR NVL(af.acousticness, 0) <> 0
+                              OR NVL(af.instrumentalness, 0) <> 0 THEN
+                            XMLELEMENT("audio_features",
+                                CASE WHEN af.energy <> 0 THEN XMLELEMENT("energy", TO_CHAR(af.energy, 'FM990.09999')) END,
+                                CASE WHEN af.tempo <> 0 THEN XMLELEMENT("tempo", TO_CHAR(af.tempo, 'FM99990.09999')) END,
+                                CASE WHEN af.danceability <> 0 THEN XMLELEMENT("danceability", TO_CHAR(af.danceability, 'FM990.09999')) END,
+                                CASE WHEN af.loudness <> 0 THEN XMLELEMENT("loudness", TO_CHAR(af.loudness, 'FM99990.09999')) END,
+                                CASE WHEN af.valence <> 0 THEN XMLELEMENT("valence", TO_CHAR(af.valence, 'FM990.09999')) END)
+                        END"""
+
+XML_DOCUMENTS_SQL = f"""
+    SELECT XMLSERIALIZE(CONTENT
+        XMLELEMENT("playlist",
+            XMLATTRIBUTES(p.id_playlist AS "id"),
+            XMLELEMENT("nom", p.nom_playlist),
+            XMLELEMENT("genre", g.nom_genre),
+            XMLELEMENT("subgenre", sg.nom_subgenre),
+            XMLELEMENT("tracks",
+                XMLATTRIBUTES(COUNT(*) AS "count"),
+                XMLAGG(
+                    XMLELEMENT("track",
+                        XMLATTRIBUTES(t.id_track AS "id"),
+                        XMLELEMENT("name", t.track_name),
+                        XMLELEMENT("duration", XMLATTRIBUTES(t.duration_ms AS "ms"), {_DURATION_SQL}),
+                        XMLELEMENT("popularity", t.track_popularity),
+                        XMLELEMENT("album",
+                            XMLATTRIBUTES(a.id_album AS "id"),
+                            XMLELEMENT("name", a.nom_album),
+                            CASE WHEN a.date_sortie IS NOT NULL THEN
+                                XMLELEMENT("release_date", TO_CHAR(a.date_sortie, 'YYYY-MM-DD'))
+                            END),
+                        XMLELEMENT("artist", XMLELEMENT("name", ar.nom_artist)),
+                        {_XML_FEATURES_SQL})
+                    ORDER BY t.track_name, t.id_track)))
+        AS CLOB INDENT SIZE = 2) AS document
+    {XML_EXTRACT_FROM}
+    GROUP BY p.id_playlist, p.nom_playlist, g.nom_genre, sg.nom_subgenre
+    ORDER BY p.id_playlist
+"""
+
+# Même forme que le JSON produit par la XSLT (data/input/spotify_to_json.xslt)
+JSON_DOCUMENTS_SQL = f"""
+    SELECT JSON_OBJECT(
+        'id' VALUE p.id_playlist,
+        'nom' VALUE p.nom_playlist,
+        'genre' VALUE g.nom_genre,
+        'subgenre' VALUE sg.nom_subgenre,
+        'tracks_count' VALUE COUNT(*),
+        'tracks' VALUE JSON_ARRAYAGG(
+            JSON_OBJECT(
+                'id' VALUE t.id_track,
+                'name' VALUE t.track_name,
+                'duration_ms' VALUE t.duration_ms,
+                'duration_formatted' VALUE {_DURATION_SQL},
+                'popularity' VALUE t.track_popularity,
+                'album' VALUE JSON_OBJECT(
+                    'id' VALUE a.id_album,
+                    'name' VALUE a.nom_album,
+                    'release_date' VALUE TO_CHAR(a.date_sortie, 'YYYY-MM-DD')),
+                'artist' VALUE JSON_OBJECT('name' VALUE ar.nom_artist),
+                'audio_features' VALUE JSON_OBJECT(
+                    'energy' VALUE af.energy,
+                    'tempo' VALUE af.tempo,
+                    'danceability' VALUE af.danceability,
+                    'loudness' VALUE af.loudness,
+                    'valence' VALUE af.valence))
+            ORDER BY t.track_name, t.id_track RETURNING CLOB)
+        RETURNING CLOB) AS document
+    {XML_EXTRACT_FROM}
+    GROUP BY p.id_playlist, p.nom_playlist, g.nom_genre, sg.nom_subgenre
+    ORDER BY p.id_playlist
+"""
+
+DOCUMENT_QUERIES = {'xml': XML_DOCUMENTS_SQL, 'json': JSON_DOCUMENTS_SQL}
+
+def _null_to_empty(value):
+    """Convertit un NULL Oracle en chaîne vide (valeur attendue par l'export XML)."""
+    return '' if value is None else value
+
+
+# Types des colonnes texte, dont les NULL sont convertis par le pilote
+_STRING_TYPES = (oracledb.DB_TYPE_VARCHAR, oracledb.DB_TYPE_NVARCHAR,
+                 oracledb.DB_TYPE_CHAR, oracledb.DB_TYPE_NCHAR)
+
+
+def _empty_string_for_nulls(cursor, metadata):
+    """
+    Gestionnaire de types de sortie : les colonnes texte sont lues avec leur
+    type d'origine, les NULL étant convertis en '' directement par le pilote.
+    Les autres colonnes (NUMBER) gardent la conversion par défaut (int ou
+    float selon la précision et l'échelle) : une variable créée ici les
+    lirait en float.
+    """
+    if metadata.type_code in _STRING_TYPES:
+        return cursor.var(metadata.type_code, arraysize=cursor.arraysize,
+                          convert_nulls=True, outconverter=_null_to_empty)
+
+
+
+def _lobs_as_strings(cursor, metadata):
+    """Gestionnaire de types de sortie : lit les CLOB directement en chaînes."""
+    if metadata.type_code is oracledb.DB_TYPE_CLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
 
 class DatabaseManager:
     """
     Gère la connexion à la base de données Oracle et les opérations DDL/DML/Query.
+
+    Si DB_POOL_ENABLED est actif, toutes les instances du processus partagent
+    un pool de sessions oracledb : connect() et acquire_connection() y
+    empruntent une connexion, rendue au pool à la fermeture.
     """
-    def __init__(self):
+    # Exception des erreurs de la base (redéfinie par les autres moteurs)
+    Error = oracledb.Error
+
+    # Documents <playlist> / JSON construits par le serveur (iter_playlist_documents)
+    SERVER_SIDE_DOCUMENTS = True
+
+    # Pool de sessions partagé par toutes les instances (créé à la demande)
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, use_pool=None):
         self.connection = None
         self.cursor = None
+        self.use_pool = DB_POOL_ENABLED if use_pool is None else use_pool
+        # Statistiques par mode ('exact' ou 'estimate'), vidées à chaque écriture
+        self._stats_cache = {}
+
+    @classmethod
+    def get_pool(cls):
+        """Retourne le pool de sessions partagé, en le créant au premier appel."""
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = oracledb.create_pool(
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    dsn=DB_DSN,
+                    min=DB_POOL_MIN,
+                    max=DB_POOL_MAX,
+                    increment=DB_POOL_INCREMENT,
+                    getmode=oracledb.POOL_GETMODE_WAIT
+                )
+                print(f"🏊 Pool de sessions Oracle créé (min={DB_POOL_MIN}, max={DB_POOL_MAX}, "
+                      f"incrément={DB_POOL_INCREMENT}).")
+            return cls._pool
+
+    @classmethod
+    def close_pool(cls):
+        """Ferme le pool de sessions partagé s'il a été créé."""
+        with cls._pool_lock:
+            if cls._pool is not None:
+                try:
+                    cls._pool.close(force=True)
+                    print("✅ Pool de sessions Oracle fermé.")
+                except oracledb.Error as e:
+                    print(f"⚠️ Erreur lors de la fermeture du pool : {e}")
+                finally:
+                    cls._pool = None
+
+    def _open_connection(self):
+        """Ouvre une connexion : empruntée au pool si activé, autonome sinon."""
+        if self.use_pool:
+            return self.get_pool().acquire()
+        return oracledb.connect(
+            user=DB_USER,
+            password=DB_PASSWORD,
+            dsn=DB_DSN
+        )
+
+    @contextmanager
+    def acquire_connection(self):
+        """
+        Fournit une connexion dédiée au thread appelant, distincte de
+        self.connection (une connexion Oracle ne doit pas être partagée entre
+        threads). Elle est rendue au pool (ou fermée) en sortie de bloc.
+
+        Exemple :
+            with db_manager.acquire_connection() as connection:
+                ...
+        """
+        connection = self._open_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
 
     def connect(self):
         """Établit et retourne la connexion à la base de données."""
         try:
-            self.connection = oracledb.connect(
-                user=DB_USER,
-                password=DB_PASSWORD,
-                dsn=DB_DSN
-            )
+            self.connection = self._open_connection()
             print("✅ Connexion à la base de données Oracle établie.")
             print(f"   Version Oracle : {self.connection.version}")
             return True
@@ -32,7 +297,7 @@ class DatabaseManager:
             return False
 
     def close(self):
-        """Ferme la connexion à la base de données."""
+        """Ferme la connexion à la base de données (ou la rend au pool)."""
         if self.connection:
             try:
                 self.connection.close()
@@ -72,7 +337,7 @@ class DatabaseManager:
                 try:
                     cursor.execute(statement)
                     success_count += 1
-                except oracledb.Error as e:
+                except self.Error as e:
                     error_count += 1
                     # Ne pas afficher l'erreur "table does not exist" lors du DROP
                     if "does not exist" not in str(e).lower():
@@ -91,21 +356,35 @@ class DatabaseManager:
         finally:
             cursor.close()
 
-    def initialize_db(self, drop_first=False):
-        """Crée toutes les tables si elles n'existent pas (option de suppression)."""
+    def initialize_db(self, drop_first=False, storage_profile=None):
+        """
+        Crée toutes les tables si elles n'existent pas (option de suppression).
+
+        Args:
+            drop_first: Si True, supprime d'abord les tables existantes
+            storage_profile: Profil de stockage physique, clé de STORAGE_PROFILES
+                             (défaut : DB_STORAGE_PROFILE)
+        """
         if not self.connection:
             print("❌ Pas de connexion active.")
             return False
 
+        storage_profile = storage_profile or DB_STORAGE_PROFILE
+        if storage_profile not in STORAGE_PROFILES:
+            print(f"⚠️ Profil de stockage inconnu '{storage_profile}' : profil 'standard' utilisé.")
+            storage_profile = 'standard'
+
+        self._stats_cache.clear()
+
         if drop_first:
             print("\n⚠️  Suppression des tables existantes...")
-            for drop_sql in DROP_TABLES_SQL:
+            for drop_sql in [DROP_EXTRACT_VIEW_SQL] + DROP_TABLES_SQL + DROP_STAGING_TABLES_SQL:
                 cursor = self.connection.cursor()
                 try:
                     cursor.execute(drop_sql)
                     self.connection.commit()
                     print(f"   ✓ Table supprimée")
-                except oracledb.Error as e:
+                except self.Error as e:
                     # Ignorer l'erreur si la table n'existe pas
                     if "does not exist" not in str(e).lower():
                         print(f"   ⚠️ Erreur DROP : {e}")
@@ -113,392 +392,1559 @@ class DatabaseManager:
                     cursor.close()
             print("✅ Suppression terminée.\n")
         
-        print("⚙️  Création des tables de la BD Spotify...")
+        print(f"⚙️  Création des tables de la BD Spotify (stockage '{storage_profile}')...")
         
-        # Exécuter le script de création
-        if self._execute_sql_script(CREATE_TABLES_SQL, commit=True):
+        # Exécuter le script de création (tables puis tables de préparation)
+        create_sql = get_create_tables_sql(storage_profile)
+        if self._execute_sql_script(create_sql, commit=True) and self._ensure_staging_tables():
             print("✅ Initialisation du schéma de base de données terminée.\n")
             return True
         else:
             print("⚠️ Initialisation terminée avec des avertissements.\n")
             return False
 
-    def _execute_many(self, sql_query, data_list):
+    def _execute_many(self, sql_query, data_list, batch_size=None, connection=None,
+                      batch_errors=True, commit=True, failed_chunks=None, rejected_rows=None):
         """
         Exécute une insertion de masse (executemany) pour les tables SANS colonne IDENTITY.
-        Retourne le nombre de lignes insérées.
+
+        Les lignes sont envoyées par lots de batch_size, chacun validé (commit)
+        séparément. Avec batcherrors, une ligne rejetée par Oracle (valeur trop
+        longue, dépassement de précision...) n'annule plus le lot : elle est
+        écrite dans le fichier de quarantaine de la table et les autres lignes
+        sont insérées normalement.
+
+        Oracle refuse batcherrors sur un INSERT en chemin direct
+        (APPEND_VALUES, ORA-38910) : avec batch_errors=False, il n'y a pas de
+        quarantaine et une ligne rejetée annule son lot.
+
+        Un lot en erreur est annulé (rollback) et les lots suivants sont
+        envoyés normalement ; il est ajouté à failed_chunks pour que
+        l'appelant signale le chargement comme incomplet.
+
+        Avec commit=False, rien n'est validé : l'appelant valide (ou annule)
+        la transaction entière, et une erreur SQL est propagée après le
+        rollback au lieu d'être seulement affichée.
+
+        Args:
+            sql_query: Requête DML à paramètres positionnels
+            data_list: Liste des lignes (listes de valeurs)
+            batch_size: Nombre de lignes par lot (défaut : DB_BATCH_SIZE)
+            connection: Connexion à utiliser (défaut : self.connection)
+            batch_errors: Si False, executemany sans batcherrors ni quarantaine
+            commit: Si False, aucun lot n'est validé (transaction de l'appelant)
+            failed_chunks: Liste complétée par (position, taille, erreur) de
+                           chaque lot annulé
+            rejected_rows: Liste complétée par chaque ligne mise en quarantaine
+
+        Returns:
+            int: Nombre de lignes traitées avec succès
         """
-        if not self.connection:
+        connection = connection or self.connection
+        if not connection:
             return 0
         
         if not data_list:
             return 0
         
-        cursor = self.connection.cursor()
+        if batch_size is None:
+            batch_size = DB_BATCH_SIZE
+        
+        cursor = connection.cursor()
+        rows_processed = 0
+        rejected = []
+        
         try:
-            cursor.executemany(sql_query, data_list)
-            self.connection.commit()
-            rows_inserted = cursor.rowcount
-            return rows_inserted
-        except oracledb.Error as e:
-            print(f"❌ Erreur SQL lors de l'insertion (executemany): {e}")
-            print(f"   Première ligne de données : {data_list[0] if data_list else 'N/A'}")
-            self.connection.rollback()
-            return 0
+            for start in range(0, len(data_list), batch_size):
+                chunk = data_list[start:start + batch_size]
+                try:
+                    cursor.executemany(sql_query, chunk, batcherrors=batch_errors)
+                except self.Error as e:
+                    print(f"❌ Erreur SQL lors de l'insertion (executemany): {e}")
+                    print(f"   Lot annulé : {len(chunk)} lignes, première ligne : {chunk[0]}")
+                    connection.rollback()
+                    if not commit:
+                        raise
+                    if failed_chunks is not None:
+                        failed_chunks.append((start, len(chunk), str(e)))
+                    continue
+                
+                if batch_errors:
+                    for error in cursor.getbatcherrors():
+                        rejected.append((start + error.offset, chunk[error.offset], error.message))
+                
+                if commit:
+                    connection.commit()
+                rows_processed += cursor.rowcount
         finally:
             cursor.close()
+        
+        if rejected:
+            self._quarantine_rows(sql_query, rejected)
+            if rejected_rows is not None:
+                rejected_rows.extend(row for _, row, _ in rejected)
+        
+        return rows_processed
+
+    def _quarantine_rows(self, sql_query, rejected):
+        """
+        Ajoute les lignes rejetées au fichier de quarantaine de la table visée
+        (QUARANTINE_DIR/<table>.jsonl), avec le message d'erreur Oracle.
+
+        Args:
+            sql_query: Requête DML dont les lignes ont été rejetées
+            rejected: Liste de tuples (position, ligne, message d'erreur)
+        """
+        match = re.search(r'\b(?:INTO|UPDATE|FROM)\s+(\w+)', sql_query, re.IGNORECASE)
+        table_name = match.group(1).lower() if match else 'unknown'
+        path = os.path.join(QUARANTINE_DIR, f"{table_name}.jsonl")
+        
+        try:
+            os.makedirs(QUARANTINE_DIR, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                for position, row, message in rejected:
+                    record = {
+                        'rejected_at': datetime.now().isoformat(),
+                        'position': position,
+                        'error': message.strip(),
+                        'row': row
+                    }
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            print(f"   ⚠️ {len(rejected)} lignes rejetées mises en quarantaine : {path}")
+            print(f"      Première erreur : {rejected[0][2].strip()}")
+        except OSError as e:
+            print(f"   ⚠️ {len(rejected)} lignes rejetées (quarantaine impossible : {e})")
 
-    def _insert_with_identity(self, table_name, df, columns, id_col):
+    def _insert_with_identity(self, table_name, df, columns, id_col, connection=None,
+                              commit=True):
         """
-        Insère ligne par ligne dans une table avec IDENTITY et récupère les IDs générés.
+        Insère un lot dans une table avec IDENTITY et récupère les IDs générés.
+
+        Toutes les lignes partent en un seul executemany : la clause
+        RETURNING ... INTO alimente une variable tableau qui reçoit l'ID généré
+        de chaque ligne, sans aller-retour réseau par ligne.
         
         Args:
             table_name: Nom de la table
             df: DataFrame contenant les données
             columns: Liste des colonnes à insérer (sans l'ID)
             id_col: Nom de la colonne ID à récupérer
+            connection: Connexion à utiliser (défaut : self.connection)
+            commit: Si False, l'insertion n'est pas validée et une erreur est propagée
             
         Returns:
             Dictionnaire mappant les valeurs vers leurs IDs générés
         """
-        if not self.connection or df.empty:
+        connection = connection or self.connection
+        if not connection or df.empty:
             return {}
         
-        cursor = self.connection.cursor()
+        cursor = connection.cursor()
         
         # Construction de la requête SQL
         placeholders = ', '.join([f':{i+1}' for i in range(len(columns))])
         sql_insert = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) RETURNING {id_col} INTO :{len(columns)+1}"
         
-        id_map = {}
-        rows_inserted = 0
+        rows = self._rows_for_binding(df, columns)
         
         try:
-            for index, row in df.iterrows():
-                # Extraire les valeurs pour cette ligne
-                values = [row[col] for col in columns]
-                
-                # Variable pour récupérer l'ID généré
-                new_id_var = cursor.var(oracledb.NUMBER)
-                
-                # Exécuter l'insertion
-                cursor.execute(sql_insert, values + [new_id_var])
-                
-                # Récupérer l'ID généré
-                generated_id = new_id_var.getvalue()[0]
-                
-                # Mapper la première colonne (clé naturelle) vers l'ID
-                key = row[columns[0]]
-                id_map[key] = int(generated_id)
-                
-                rows_inserted += 1
+            # Variable tableau : une entrée (liste des IDs retournés) par ligne
+            new_ids_var = cursor.var(oracledb.NUMBER, arraysize=len(rows))
+            cursor.setinputsizes(*([None] * len(columns)), new_ids_var)
             
-            self.connection.commit()
-            print(f"   → {rows_inserted} lignes insérées avec mapping des IDs")
+            cursor.executemany(sql_insert, rows)
+            if commit:
+                connection.commit()
+            
+            # Mapper la première colonne (clé naturelle) vers l'ID
+            id_map = {
+                row[0]: int(new_ids_var.getvalue(i)[0])
+                for i, row in enumerate(rows)
+            }
+            print(f"   → {len(id_map)} lignes insérées avec mapping des IDs")
             
             return id_map
         
-        except oracledb.Error as e:
+        except self.Error as e:
             print(f"❌ Erreur lors de l'insertion dans {table_name}: {e}")
-            self.connection.rollback()
+            connection.rollback()
+            if not commit:
+                raise
             return {}
         finally:
             cursor.close()
 
-    def _parse_date_for_oracle(self, date_str):
+    def _rows_for_binding(self, df, columns):
         """
-        Convertit une chaîne de date en objet datetime.date pour Oracle.
-        Gère les formats : YYYY-MM-DD, YYYY-MM, YYYY
+        Prépare les lignes d'un DataFrame pour executemany.
+        Les valeurs manquantes (NaN, NaT) sont remplacées par None (NULL Oracle)
+        et les dates datetime64 sont liées telles quelles.
         """
-        if pd.isna(date_str) or date_str is None or date_str == '':
-            return None
-        
-        date_str = str(date_str).strip()
-        
-        try:
-            # Format complet YYYY-MM-DD
-            if len(date_str) == 10:
-                return datetime.strptime(date_str, '%Y-%m-%d').date()
-            # Format YYYY-MM
-            elif len(date_str) == 7:
-                return datetime.strptime(date_str + '-01', '%Y-%m-%d').date()
-            # Format YYYY seulement
-            elif len(date_str) == 4:
-                return datetime.strptime(date_str + '-01-01', '%Y-%m-%d').date()
-            else:
-                return None
-        except:
-            return None
+        values = df[columns].astype(object)
+        return values.where(df[columns].notna(), None).values.tolist()
 
-    def insert_data(self, data_dict):
+    def _ensure_staging_tables(self):
         """
-        Insère les données normalisées dans les tables dans l'ordre de dépendance.
-        Gère les clés étrangères et les tables IDENTITY.
+        Crée les tables temporaires de préparation du mode upsert si elles
+        n'existent pas encore (ORA-00955 ignorée).
         """
         if not self.connection:
-            print("❌ Pas de connexion active.")
             return False
 
-        print("\n" + "="*60)
-        print("🚀 DÉMARRAGE DE L'INSERTION DES DONNÉES NORMALISÉES")
-        print("="*60 + "\n")
-        
+        cursor = self.connection.cursor()
         try:
-            # ========================================
-            # PHASE 1 : TABLES PARENTES AVEC IDENTITY
-            # ========================================
-            
-            # 1. sp_genres (table parente, IDENTITY)
-            print("1️⃣  Insertion des GENRES (IDENTITY)...")
-            genres_map = self._insert_with_identity(
-                'sp_genres',
-                data_dict['sp_genres'],
-                ['nom_genre'],
-                'id_genre'
+            for statement in STAGING_TABLES_SQL.split(';'):
+                if not statement.strip():
+                    continue
+                try:
+                    cursor.execute(statement.strip())
+                except self.Error as e:
+                    if "ORA-00955" not in str(e):
+                        print(f"   ⚠️ Table de préparation : {str(e)[:100]}")
+                        return False
+            return True
+        finally:
+            cursor.close()
+
+    def _store_rows(self, table_name, columns, rows, state, connection):
+        """
+        Écrit des lignes dans une table sans IDENTITY : INSERT en masse
+        (chemin direct APPEND_VALUES en mode bulk), ou MERGE via la table de
+        préparation en mode upsert.
+
+        Returns:
+            int: Nombre de lignes insérées (ou fusionnées en mode upsert)
+        """
+        if state['upsert']:
+            return self._merge_rows(table_name, columns, rows, connection)
+
+        # Chargement direct (au-dessus de la high water mark) en mode bulk,
+        # sans batcherrors ni quarantaine (incompatibles avec APPEND_VALUES)
+        hint = "/*+ APPEND_VALUES */ " if state['bulk'] else ""
+        placeholders = ', '.join([f':{i+1}' for i in range(len(columns))])
+        sql_insert = f"INSERT {hint}INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        rejected = []
+        rows_inserted = self._execute_many(sql_insert, rows, connection=connection,
+                                           batch_errors=not state['bulk'], commit=state['commit'],
+                                           failed_chunks=state['failed_chunks'],
+                                           rejected_rows=rejected)
+        self._note_rejected(state, table_name, columns, rejected)
+        return rows_inserted
+
+    def _note_rejected(self, state, table_name, columns, rows):
+        """
+        Note dans state['rejected'] les clés naturelles (MERGE_KEYS) de lignes
+        liées selon columns et non écrites.
+        """
+        if not rows:
+            return
+        positions = [columns.index(col) for col in MERGE_KEYS[table_name]]
+        state['rejected'].setdefault(table_name, set()).update(
+            tuple(row[i] for i in positions) for row in rows
+        )
+
+    def _keep_resolved(self, table_name, df, mask, state):
+        """
+        Garde les lignes de df dont les références sont résolues (mask) ; les
+        autres, dont le parent n'a pas été écrit, sont notées non écrites.
+        """
+        dropped = df.loc[~mask, MERGE_KEYS[table_name]]
+        if not dropped.empty:
+            state['rejected'].setdefault(table_name, set()).update(
+                dropped.itertuples(index=False, name=None)
             )
-            
-            # 2. sp_artists (table parente, IDENTITY)
-            print("\n2️⃣  Insertion des ARTISTES (IDENTITY)...")
-            artists_map = self._insert_with_identity(
-                'sp_artists',
-                data_dict['sp_artists'],
-                ['nom_artist'],
-                'id_artist'
+        return df[mask]
+
+    def _written_keys(self, table_name, keys, state):
+        """Retourne les clés (colonne simple) dont la ligne n'a pas été rejetée."""
+        rejected = state['rejected'].get(table_name, set())
+        return [key for key in keys if (key,) not in rejected]
+
+    def _execute_tracked(self, sql_query, df, columns, table_name, state, commit=True):
+        """
+        executemany des lignes de df liées selon columns ; les clés des lignes
+        mises en quarantaine sont notées dans state['rejected'].
+        """
+        rejected = []
+        rows_processed = self._execute_many(sql_query, self._rows_for_binding(df, columns),
+                                            commit=commit, rejected_rows=rejected)
+        self._note_rejected(state, table_name, columns, rejected)
+        return rows_processed
+
+    def _store_identity(self, table_name, df, columns, id_col, state, connection):
+        """
+        Écrit des lignes dans une table avec IDENTITY et retourne la
+        correspondance clé naturelle → ID (INSERT ... RETURNING, ou MERGE puis
+        relecture des IDs en mode upsert).
+        """
+        if not state['upsert']:
+            return self._insert_with_identity(table_name, df, columns, id_col,
+                                              connection=connection, commit=state['commit'])
+
+        if df.empty:
+            return {}
+
+        rows = self._rows_for_binding(df, columns)
+        merged = self._merge_rows(table_name, columns, rows, connection)
+
+        # IDs des clés préparées, qu'elles viennent d'être insérées ou existaient déjà
+        key = columns[0]
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT t.{key}, t.{id_col} FROM {table_name} t "
+                f"JOIN {STAGING_TABLES[table_name]} s ON t.{key} = s.{key}"
             )
-            
-            # ========================================
-            # PHASE 2 : TABLES ENFANTS AVEC FK
-            # ========================================
-            
-            # 3. sp_subgenres (IDENTITY + FK vers genres)
-            print("\n3️⃣  Insertion des SOUS-GENRES (IDENTITY + FK genre)...")
-            subgenres_df = data_dict['sp_subgenres'].copy()
-            
-            # Mapper les noms de genres vers leurs IDs
-            subgenres_df['id_genre'] = subgenres_df['nom_genre'].map(genres_map)
-            
-            # Filtrer les lignes sans ID de genre valide
-            subgenres_df = subgenres_df.dropna(subset=['id_genre'])
-            subgenres_df['id_genre'] = subgenres_df['id_genre'].astype(int)
-            
-            subgenres_map = self._insert_with_identity(
-                'sp_subgenres',
-                subgenres_df,
-                ['nom_subgenre', 'id_genre'],
-                'id_subgenre'
+            id_map = {name: int(new_id) for name, new_id in cursor}
+        finally:
+            cursor.close()
+
+        print(f"   → {merged} lignes fusionnées, {len(id_map)} IDs récupérés")
+        return id_map
+
+    def _merge_rows(self, table_name, columns, rows, connection):
+        """
+        Upsert ensembliste : charge les lignes en masse dans la table
+        temporaire de préparation, puis applique un seul MERGE sur la table
+        cible. Seules les lignes nouvelles ou dont une colonne a changé sont
+        écrites.
+
+        Une erreur de préparation ou du MERGE annule toute la transaction et
+        est propagée : insert_data signale alors l'échec du chargement.
+
+        Args:
+            table_name: Table cible
+            columns: Colonnes des lignes (clés MERGE_KEYS incluses)
+            rows: Lignes à fusionner
+            connection: Connexion à utiliser
+
+        Returns:
+            int: Nombre de lignes insérées ou mises à jour par le MERGE
+        """
+        if not rows:
+            return 0
+
+        staging = STAGING_TABLES[table_name]
+        keys = MERGE_KEYS[table_name]
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute(f"TRUNCATE TABLE {staging}")
+
+            placeholders = ', '.join([f':{i+1}' for i in range(len(columns))])
+            # Préparation et MERGE dans une même transaction : un lot en erreur
+            # annule tout, le MERGE ne part jamais d'une préparation partielle
+            self._execute_many(
+                f"INSERT INTO {staging} ({', '.join(columns)}) VALUES ({placeholders})",
+                rows, connection=connection, commit=False
             )
-            
-            # 4. sp_albums (FK vers artists)
-            print("\n4️⃣  Insertion des ALBUMS (FK artiste)...")
-            albums_df = data_dict['sp_albums'].copy()
-            
-            # Mapper les noms d'artistes vers leurs IDs
-            albums_df['id_artist'] = albums_df['artiste_principal'].map(artists_map)
-            
-            # Filtrer les albums sans artiste valide
-            albums_df = albums_df.dropna(subset=['id_artist', 'id_album'])
-            albums_df['id_artist'] = albums_df['id_artist'].astype(int)
-            
-            # Convertir les dates
-            albums_df['date_sortie_oracle'] = albums_df['date_sortie'].apply(self._parse_date_for_oracle)
-            
-            # Préparer les données pour l'insertion
-            sql_album = "INSERT INTO sp_albums (id_album, nom_album, date_sortie, id_artist) VALUES (:1, :2, :3, :4)"
-            albums_data = albums_df[['id_album', 'nom_album', 'date_sortie_oracle', 'id_artist']].values.tolist()
-            
-            rows_inserted = self._execute_many(sql_album, albums_data)
-            print(f"   → {rows_inserted} albums insérés")
-            
-            # Garder seulement les albums insérés pour les FK suivantes
-            valid_albums = set(albums_df['id_album'])
-            
-            # 5. sp_tracks (FK vers albums)
-            print("\n5️⃣  Insertion des PISTES (FK album)...")
-            tracks_df = data_dict['sp_tracks'].copy()
-            
-            # Filtrer les tracks dont l'album existe
-            tracks_df = tracks_df[tracks_df['id_album'].isin(valid_albums)]
-            tracks_df = tracks_df.dropna(subset=['id_track', 'id_album'])
-            
-            sql_track = "INSERT INTO sp_tracks (id_track, track_name, duration_ms, track_popularity, id_album) VALUES (:1, :2, :3, :4, :5)"
-            tracks_data = tracks_df[['id_track', 'nom_track', 'duration_ms', 'track_popularity', 'id_album']].values.tolist()
-            
-            rows_inserted = self._execute_many(sql_track, tracks_data)
-            print(f"   → {rows_inserted} pistes insérées")
-            
-            # Garder les tracks valides pour les FK suivantes
-            valid_tracks = set(tracks_df['id_track'])
-            
-            # 6. sp_audio_features (FK vers tracks)
-            print("\n6️⃣  Insertion des CARACTÉRISTIQUES AUDIO (FK piste)...")
-            audio_df = data_dict['sp_audio_features'].copy()
-            
-            # Filtrer les features dont la track existe
-            audio_df = audio_df[audio_df['id_track'].isin(valid_tracks)]
-            audio_df = audio_df.dropna(subset=['id_track'])
-            
-            # Colonnes à insérer
-            audio_cols = ['id_track', 'energy', 'tempo', 'danceability', 'loudness', 
-                         'liveness', 'valence', 'speechiness', 'acousticness', 
-                         'instrumentalness', 'key_musical', 'mode_musical', 'time_signature']
-            
-            # Vérifier si analysis_url existe
-            if 'analysis_url' in audio_df.columns:
-                audio_cols.append('analysis_url')
-            
-            sql_audio = f"INSERT INTO sp_audio_features ({', '.join(audio_cols)}) VALUES ({', '.join([f':{i+1}' for i in range(len(audio_cols))])})"
-            audio_data = audio_df[audio_cols].values.tolist()
-            
-            rows_inserted = self._execute_many(sql_audio, audio_data)
-            print(f"   → {rows_inserted} caractéristiques audio insérées")
-            
-            # 7. sp_playlists (FK vers subgenres)
-            print("\n7️⃣  Insertion des PLAYLISTS (FK sous-genre)...")
-            playlists_df = data_dict['sp_playlists'].copy()
-            
-            # Mapper les noms de sous-genres vers leurs IDs
-            playlists_df['id_subgenre'] = playlists_df['nom_subgenre'].map(subgenres_map)
-            
-            # Filtrer les playlists sans sous-genre valide
-            playlists_df = playlists_df.dropna(subset=['id_subgenre', 'id_playlist'])
-            playlists_df['id_subgenre'] = playlists_df['id_subgenre'].astype(int)
-            
-            sql_playlist = "INSERT INTO sp_playlists (id_playlist, nom_playlist, id_subgenre) VALUES (:1, :2, :3)"
-            playlists_data = playlists_df[['id_playlist', 'nom_playlist', 'id_subgenre']].values.tolist()
-            
-            rows_inserted = self._execute_many(sql_playlist, playlists_data)
-            print(f"   → {rows_inserted} playlists insérées")
-            
-            # Garder les playlists valides
-            valid_playlists = set(playlists_df['id_playlist'])
-            
-            # 8. sp_playlist_tracks (table de liaison, FK vers playlists et tracks)
-            print("\n8️⃣  Insertion des LIAISONS PLAYLIST-TRACK...")
-            pt_df = data_dict['sp_playlist_tracks'].copy()
-            
-            # Filtrer pour ne garder que les liaisons valides
-            pt_df = pt_df[
-                pt_df['id_playlist'].isin(valid_playlists) &
-                pt_df['id_track'].isin(valid_tracks)
-            ]
-            
-            sql_pt = "INSERT INTO sp_playlist_tracks (id_playlist, id_track) VALUES (:1, :2)"
-            pt_data = pt_df[['id_playlist', 'id_track']].values.tolist()
-            
-            rows_inserted = self._execute_many(sql_pt, pt_data)
-            print(f"   → {rows_inserted} liaisons insérées")
-            
-            print("\n" + "="*60)
-            print("✅ INSERTION DE TOUTES LES DONNÉES TERMINÉE AVEC SUCCÈS")
-            print("="*60 + "\n")
-            
-            return True
-        
-        except Exception as e:
-            print(f"\n❌ ERREUR CRITIQUE lors de l'insertion : {e}")
-            import traceback
-            traceback.print_exc()
-            if self.connection:
-                self.connection.rollback()
-            return False
 
-    def fetch_data_for_xml(self):
+            cursor.execute(self._build_merge_sql(table_name, staging, columns, keys))
+            merged = cursor.rowcount
+            connection.commit()
+            return merged
+
+        except self.Error as e:
+            print(f"❌ Erreur lors du MERGE dans {table_name}: {e}")
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _build_merge_sql(self, table_name, staging, columns, keys):
+        """Construit le MERGE de la table de préparation vers la table cible."""
+        on_clause = ' AND '.join(f"t.{key} = s.{key}" for key in keys)
+        updated = [col for col in columns if col not in keys]
+
+        sql = f"MERGE INTO {table_name} t USING {staging} s ON ({on_clause})"
+        if updated:
+            # DECODE compare aussi les NULL : seules les lignes modifiées sont réécrites
+            set_clause = ', '.join(f"t.{col} = s.{col}" for col in updated)
+            changed = ' OR '.join(f"DECODE(t.{col}, s.{col}, 0, 1) = 1" for col in updated)
+            sql += f" WHEN MATCHED THEN UPDATE SET {set_clause} WHERE {changed}"
+        sql += (f" WHEN NOT MATCHED THEN INSERT ({', '.join(columns)})"
+                f" VALUES ({', '.join(f's.{col}' for col in columns)})")
+        return sql
+
+    def _secondary_indexes(self, cursor):
         """
-        Extrait les données complètes de la BD pour la génération XML.
-        Joint toutes les tables nécessaires.
-        
+        Liste les index non uniques des tables du schéma.
+
         Returns:
-            Liste de dictionnaires contenant toutes les données jointes
+            list: Tuples (nom de l'index, partitionné 'YES'/'NO')
         """
-        if not self.connection:
-            print("❌ Pas de connexion active.")
-            return []
-        
-        print("\n🔍 Extraction des données pour export XML...")
-        
-        # Requête complexe avec toutes les jointures
-        SQL_QUERY = """
-            SELECT
-                p.id_playlist,
-                p.nom_playlist,
-                sg.nom_subgenre,
-                g.nom_genre,
-                t.id_track,
-                t.track_name,
-                t.duration_ms,
-                t.track_popularity,
-                a.id_album,
-                a.nom_album,
-                TO_CHAR(a.date_sortie, 'YYYY-MM-DD') as date_sortie,
-                ar.nom_artist as artiste_principal,
-                af.energy,
-                af.tempo,
-                af.danceability,
-                af.loudness,
-                af.valence,
-                af.liveness,
-                af.speechiness,
-                af.acousticness,
-                af.instrumentalness
-            FROM sp_playlists p
-            INNER JOIN sp_subgenres sg ON p.id_subgenre = sg.id_subgenre
-            INNER JOIN sp_genres g ON sg.id_genre = g.id_genre
-            INNER JOIN sp_playlist_tracks pt ON p.id_playlist = pt.id_playlist
-            INNER JOIN sp_tracks t ON pt.id_track = t.id_track
-            INNER JOIN sp_albums a ON t.id_album = a.id_album
-            INNER JOIN sp_artists ar ON a.id_artist = ar.id_artist
-            LEFT JOIN sp_audio_features af ON t.id_track = af.id_track
-            ORDER BY p.id_playlist, t.track_name
+        tables = ', '.join(f"'{table.upper()}'" for table in TABLE_DEPENDENCIES)
+        cursor.execute(
+            "SELECT index_name, partitioned FROM user_indexes "
+            f"WHERE table_name IN ({tables}) AND uniqueness = 'NONUNIQUE' AND index_type = 'NORMAL'"
+        )
+        return cursor.fetchall()
+
+    def _prepare_bulk_load(self):
         """
-        
+        Prépare un chargement direct : désactive les contraintes FK et rend
+        inutilisables les index secondaires (ignorés pendant l'insertion,
+        skip_unusable_indexes étant actif par défaut).
+
+        Seuls les index non uniques déjà présents sont concernés. Sur un
+        rechargement --full-reset, le schéma vient d'être recréé et les index
+        secondaires gérés n'existent pas encore (build_secondary_indexes les
+        crée après le chargement) : cette étape est alors sans effet, et seuls
+        les index des clés primaires sont maintenus pendant l'insertion.
+
+        Returns:
+            list: Index rendus inutilisables, à reconstruire par _finish_bulk_load
+        """
+        print("🚚 Mode bulk : désactivation des FK et des index secondaires...")
         cursor = self.connection.cursor()
+        indexes = []
         try:
-            cursor.execute(SQL_QUERY)
-            
-            # Récupérer les noms de colonnes
-            cols = [col[0].lower() for col in cursor.description]
-            
-            # Construire la liste de dictionnaires
-            results = []
-            for row in cursor.fetchall():
-                row_dict = {}
-                for col, val in zip(cols, row):
-                    # Convertir les valeurs None en chaînes vides pour XML
-                    row_dict[col] = val if val is not None else ''
-                results.append(row_dict)
-            
-            print(f"✅ Extraction terminée : {len(results)} lignes récupérées\n")
-            return results
-        
-        except oracledb.Error as e:
-            print(f"❌ Erreur SQL lors de l'extraction : {e}")
-            return []
+            for table, constraints in FOREIGN_KEYS.items():
+                for constraint in constraints:
+                    cursor.execute(f"ALTER TABLE {table} DISABLE CONSTRAINT {constraint}")
+
+            indexes = self._secondary_indexes(cursor)
+            for index_name, _ in indexes:
+                cursor.execute(f"ALTER INDEX {index_name} UNUSABLE")
+
+            print(f"   → {sum(len(c) for c in FOREIGN_KEYS.values())} contraintes FK désactivées, "
+                  f"{len(indexes)} index secondaires suspendus")
+        except self.Error as e:
+            print(f"   ⚠️ Préparation du mode bulk incomplète : {e}")
         finally:
             cursor.close()
+        return indexes
 
-    def get_statistics(self):
+    def _finish_bulk_load(self, indexes):
         """
-        Retourne des statistiques sur les données en base.
+        Termine un chargement direct : reconstruit les index suspendus puis
+        réactive les contraintes FK en validant les données chargées.
+
+        Returns:
+            bool: True si tous les index et contraintes ont été rétablis
         """
-        if not self.connection:
-            return None
-        
-        stats = {}
-        tables = [
-            'sp_genres', 'sp_subgenres', 'sp_artists', 'sp_albums',
-            'sp_tracks', 'sp_audio_features', 'sp_playlists', 'sp_playlist_tracks'
-        ]
-        
+        print("\n🔧 Mode bulk : reconstruction des index et validation des FK...")
+        start = time.perf_counter()
+        success = True
         cursor = self.connection.cursor()
         try:
-            for table in tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                stats[table] = count
-            
-            return stats
-        except Exception as e:
-            print(f"❌ Erreur lors de la récupération des statistiques : {e}")
-            return None
+            for index_name, partitioned in indexes:
+                try:
+                    if partitioned == 'YES':
+                        cursor.execute(
+                            "SELECT partition_name FROM user_ind_partitions WHERE index_name = :1",
+                            [index_name]
+                        )
+                        for (partition,) in cursor.fetchall():
+                            cursor.execute(f"ALTER INDEX {index_name} REBUILD PARTITION {partition}")
+                    else:
+                        cursor.execute(f"ALTER INDEX {index_name} REBUILD")
+                except self.Error as e:
+                    success = False
+                    print(f"   ⚠️ Reconstruction de {index_name} impossible : {e}")
+
+            for table, constraints in FOREIGN_KEYS.items():
+                for constraint in constraints:
+                    try:
+                        cursor.execute(f"ALTER TABLE {table} ENABLE VALIDATE CONSTRAINT {constraint}")
+                    except self.Error as e:
+                        success = False
+                        print(f"   ⚠️ Validation de {constraint} ({table}) impossible : {e}")
         finally:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
+
+        print(f"   → {len(indexes)} index reconstruits, contraintes FK réactivées "
+              f"({time.perf_counter() - start:.2f} s)")
+        return success
+
+    def _existing_indexes(self, cursor):
+        """Retourne les noms (minuscules) des index gérés déjà créés."""
+        names = ', '.join(f"'{name.upper()}'" for name in SECONDARY_INDEXES)
+        cursor.execute(f"SELECT LOWER(index_name) FROM user_indexes WHERE index_name IN ({names})")
+        return {row[0] for row in cursor.fetchall()}
+
+    def build_secondary_indexes(self):
+        """
+        Crée les index secondaires gérés (SECONDARY_INDEXES) qui n'existent
+        pas encore. Appelée en fin de chargement : construire un index sur
+        une table remplie est bien plus rapide que le maintenir ligne à ligne
+        pendant l'insertion.
+
+        Returns:
+            bool: True si tous les index gérés existent
+        """
+        cursor = self.connection.cursor()
+        success = True
+        try:
+            existing = self._existing_indexes(cursor)
+            missing = [name for name in SECONDARY_INDEXES if name not in existing]
+            if not missing:
+                return True
+
+            print(f"\n🗂️  Création de {len(missing)} index secondaires (clés étrangères)...")
+            for name in missing:
+                start = time.perf_counter()
+                try:
+                    cursor.execute(CREATE_INDEXES_SQL[name])
+                    table, columns = SECONDARY_INDEXES[name]
+                    print(f"   ✓ {name} sur {table}({', '.join(columns)}) "
+                          f"({time.perf_counter() - start:.2f} s)")
+                except self.Error as e:
+                    success = False
+                    print(f"   ⚠️ Création de {name} impossible : {e}")
+        except self.Error as e:
+            print(f"   ⚠️ Liste des index indisponible : {e}")
+            success = False
+        finally:
+            cursor.close()
+        return success
+
+    def measure_index_effect(self, repeat=1):
+        """
+        Mesure l'effet des index secondaires sur l'extraction XML : la
+        requête complète est lue avec les index gérés rendus invisibles à
+        l'optimiseur, puis visibles. Les index restent maintenus pendant la
+        mesure et sont toujours rendus visibles à la fin.
+
+        L'invisibilité s'applique à toutes les sessions : à lancer hors
+        période d'activité.
+
+        Args:
+            repeat: Nombre d'extractions par configuration (meilleure durée retenue)
+
+        Returns:
+            dict: {'sans index': secondes, 'avec index': secondes, 'lignes': n} ou None
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return None
+
+        self.build_secondary_indexes()
+        results = {}
+        cursor = self.connection.cursor()
+        try:
+            for label, visibility in (('sans index', 'INVISIBLE'), ('avec index', 'VISIBLE')):
+                for name in SECONDARY_INDEXES:
+                    cursor.execute(f"ALTER INDEX {name} {visibility}")
+
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    results['lignes'] = sum(1 for _ in self.iter_data_for_xml(use_view=False))
+                    timings.append(time.perf_counter() - start)
+                results[label] = min(timings)
+
+        except self.Error as e:
+            print(f"❌ Erreur lors de la mesure : {e}")
+            return None
+        finally:
+            for name in SECONDARY_INDEXES:
+                try:
+                    cursor.execute(f"ALTER INDEX {name} VISIBLE")
+                except self.Error:
+                    pass
+            cursor.close()
+
+        print(f"\n⏱️  Extraction XML ({results['lignes']} lignes) : "
+              f"{results['sans index']:.2f} s sans index secondaires, "
+              f"{results['avec index']:.2f} s avec "
+              f"({results['sans index'] / max(results['avec index'], 1e-9):.1f}x)")
+        return results
+
+    def _extract_view_staleness(self, cursor):
+        """Retourne l'état de la vue d'extraction (FRESH, NEEDS_COMPILE...), None si absente."""
+        cursor.execute("SELECT staleness FROM user_mviews WHERE mview_name = :1", [EXTRACT_VIEW.upper()])
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _create_extract_view(self, cursor):
+        """Crée la vue d'extraction (vide, BUILD DEFERRED) et son index."""
+        cursor.execute(CREATE_EXTRACT_VIEW_SQL)
+        cursor.execute(CREATE_EXTRACT_VIEW_INDEX_SQL)
+
+    def _complete_refresh(self, cursor):
+        """Rafraîchissement complet non atomique : TRUNCATE puis insertion en chemin direct."""
+        cursor.callproc("DBMS_MVIEW.REFRESH", [EXTRACT_VIEW.upper()],
+                        {'method': 'C', 'atomic_refresh': False})
+
+    def refresh_extract_view(self):
+        """
+        Recalcule la vue matérialisée de l'extraction XML (EXTRACT_VIEW), en
+        la créant au premier appel. Appelée une fois en fin de chargement si
+        DB_EXTRACT_VIEW est actif : les exports suivants lisent la vue au lieu
+        de refaire la jointure des huit tables.
+
+        Returns:
+            bool: True si la vue est à jour
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return False
+
+        print(f"\n🧊 Rafraîchissement de la vue d'extraction {EXTRACT_VIEW}...")
+        start = time.perf_counter()
+        cursor = self.connection.cursor()
+        try:
+            if self._extract_view_staleness(cursor) is None:
+                self._create_extract_view(cursor)
+            self._complete_refresh(cursor)
+            print(f"   → Vue rafraîchie ({time.perf_counter() - start:.2f} s)")
+            return True
+        except self.Error as e:
+            print(f"   ⚠️ Rafraîchissement impossible, les exports referont la jointure : {e}")
+            return False
+        finally:
+            cursor.close()
+
+    def _use_extract_view(self):
+        """
+        Indique si les lectures peuvent passer par la vue d'extraction : elle
+        doit exister et être à jour (aucune écriture depuis le dernier
+        rafraîchissement), sinon la jointure est refaite.
+        """
+        if not DB_EXTRACT_VIEW:
+            return False
+
+        cursor = self.connection.cursor()
+        try:
+            return self._extract_view_staleness(cursor) == 'FRESH'
+        except self.Error:
+            return False
+        finally:
+            cursor.close()
+
+    def insert_data(self, data, workers=None, upsert=False, bulk=False):
+        """
+        Insère les données normalisées dans les tables dans l'ordre de dépendance.
+        Gère les clés étrangères et les tables IDENTITY.
+
+        En mode upsert, chaque table est chargée dans une table temporaire de
+        préparation puis fusionnée (MERGE) : le chargement est rejouable sur un
+        schéma déjà rempli, et seules les lignes nouvelles ou modifiées sont
+        écrites.
+
+        Args:
+            data: Dictionnaire {nom_table: DataFrame} produit par preprocess_csv,
+                  ou itérable de tels dictionnaires (lots produits par
+                  preprocess_csv_chunks). Les correspondances d'IDs et les clés
+                  valides sont conservées d'un lot à l'autre.
+            workers: Nombre de tables chargées en parallèle (défaut : DB_LOAD_WORKERS)
+            upsert: Si True, fusionne (MERGE) au lieu d'insérer
+            bulk: Si True, chargement direct (réservé aux rechargements complets)
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return False
+
+        if workers is None:
+            workers = DB_LOAD_WORKERS
+
+        self._stats_cache.clear()
+
+        if upsert and not self._ensure_staging_tables():
+            print("❌ Tables de préparation indisponibles : mode upsert impossible.")
+            return False
+
+        print("\n" + "="*60)
+        print("🚀 DÉMARRAGE DE L'INSERTION DES DONNÉES NORMALISÉES")
+        print("="*60 + "\n")
+        
+        streaming = not isinstance(data, dict)
+        batches = data if streaming else [data]
+        state = self._new_load_state(upsert=upsert, bulk=bulk and not upsert)
+        bulk_indexes = self._prepare_bulk_load() if state['bulk'] else None
+
+        try:
+            for batch_number, batch in enumerate(batches, 1):
+                if streaming:
+                    print(f"\n📦 Lot n°{batch_number}")
+                self._insert_batch(batch, state, workers=workers)
+
+            if bulk_indexes is not None:
+                restored = self._finish_bulk_load(bulk_indexes)
+                bulk_indexes = None
+                if not restored:
+                    print("\n❌ Chargement bulk incomplet : index ou contraintes FK non rétablis "
+                          "(voir les avertissements ci-dessus).")
+                    return False
+
+            # Index secondaires créés une fois les données chargées
+            self.build_secondary_indexes()
+
+            # Jointure de l'extraction précalculée une seule fois, en fin de chargement
+            if DB_EXTRACT_VIEW:
+                self.refresh_extract_view()
+
+            if state['failed_chunks']:
+                lost = sum(size for _, size, _ in state['failed_chunks'])
+                print(f"\n❌ Chargement incomplet : {len(state['failed_chunks'])} lots annulés "
+                      f"({lost} lignes non insérées, voir les erreurs ci-dessus).")
+                return False
+
+            print("\n" + "="*60)
+            print("✅ INSERTION DE TOUTES LES DONNÉES TERMINÉE AVEC SUCCÈS")
+            print("="*60 + "\n")
+            
+            return True
+        
+        except Exception as e:
+            print(f"\n❌ ERREUR CRITIQUE lors de l'insertion : {e}")
+            import traceback
+            traceback.print_exc()
+            if self.connection:
+                self.connection.rollback()
+                if bulk_indexes is not None:
+                    self._finish_bulk_load(bulk_indexes)
+            return False
+
+    def _new_load_state(self, upsert=False, bulk=False, commit=True):
+        """
+        Crée l'état partagé entre les lots d'une même insertion :
+        correspondances nom → ID des tables IDENTITY, clés déjà insérées,
+        mode d'écriture (INSERT, INSERT direct ou MERGE) et validation des
+        lots (commit=False : une seule transaction, validée par l'appelant).
+        """
+        return {
+            'upsert': upsert,
+            'bulk': bulk,
+            'commit': commit,
+            # Lots annulés (chargement incomplet), alimenté par _execute_many
+            'failed_chunks': [],
+            # Clés naturelles des lignes non écrites (quarantaine, parent absent)
+            'rejected': {},
+            'genres_map': {},
+            'artists_map': {},
+            'subgenres_map': {},
+            'valid_albums': set(),
+            'valid_tracks': set(),
+            'valid_playlists': set()
+        }
+
+    def _insert_batch(self, data_dict, state, workers=1):
+        """
+        Insère un lot de DataFrames normalisés dans l'ordre de dépendance.
+
+        Avec workers > 1, les tables indépendantes (ex. genres et artistes,
+        sous-genres et albums) sont chargées en même temps, chacune sur sa
+        propre connexion (empruntée au pool si DB_POOL_ENABLED) : une table
+        démarre dès que toutes les tables qu'elle référence (TABLE_DEPENDENCIES)
+        sont chargées. Les temps par table et le chemin critique sont affichés.
+
+        Args:
+            data_dict: Dictionnaire {nom_table: DataFrame}
+            state: État de chargement créé par _new_load_state (mis à jour)
+            workers: Nombre de tables chargées simultanément (1 = séquentiel)
+        """
+        load_start = time.perf_counter()
+
+        if workers > 1:
+            timings = self._run_load_graph(data_dict, state, workers, load_start)
+        else:
+            timings = {
+                table: self._timed_load(table, data_dict, state, load_start, self.connection)
+                for table in TABLE_LOADERS
+            }
+
+        self._print_load_timings(timings, time.perf_counter() - load_start)
+
+    def _timed_load(self, table, data_dict, state, load_start, connection=None):
+        """
+        Charge une table et retourne ses instants (début, fin) relatifs à
+        load_start. Sans connexion fournie, une connexion dédiée au thread
+        est empruntée (acquire_connection).
+        """
+        loader = getattr(self, TABLE_LOADERS[table])
+        if connection is None:
+            with self.acquire_connection() as thread_connection:
+                return self._timed_load(table, data_dict, state, load_start, thread_connection)
+
+        start = time.perf_counter() - load_start
+        loader(data_dict, state, connection)
+        return start, time.perf_counter() - load_start
+
+    def _run_load_graph(self, data_dict, state, workers, load_start):
+        """
+        Ordonnance le chargement selon le graphe des clés étrangères : chaque
+        table est soumise au pool de threads dès que ses parentes sont chargées.
+
+        Returns:
+            dict: {table: (début, fin)} en secondes depuis load_start
+        """
+        dependencies = {
+            table: [parent for parent in TABLE_DEPENDENCIES.get(table, []) if parent in TABLE_LOADERS]
+            for table in TABLE_LOADERS
+        }
+        pending = dict(dependencies)
+        timings = {}
+        running = {}
+
+        print(f"⚡ Chargement parallèle des tables ({workers} connexions)...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                ready = [table for table, parents in pending.items()
+                         if all(parent in timings for parent in parents)]
+                for table in ready:
+                    del pending[table]
+                    future = executor.submit(self._timed_load, table, data_dict, state, load_start)
+                    running[future] = table
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    timings[running.pop(future)] = future.result()
+
+        return timings
+
+    def _print_load_timings(self, timings, total_time):
+        """Affiche la durée de chargement de chaque table et le chemin critique."""
+        durations = {table: end - start for table, (start, end) in timings.items()}
+
+        # Chemin critique : plus longue chaîne de dépendances, pondérée par les durées
+        finish = {}
+        previous = {}
+        for table in TABLE_LOADERS:
+            parents = [p for p in TABLE_DEPENDENCIES.get(table, []) if p in finish]
+            slowest = max(parents, key=finish.get, default=None)
+            previous[table] = slowest
+            finish[table] = durations[table] + (finish[slowest] if slowest else 0)
+
+        table = max(finish, key=finish.get)
+        critical_path = []
+        while table:
+            critical_path.insert(0, table)
+            table = previous[table]
+
+        print("\n⏱️  Temps de chargement par table :")
+        for table, (start, end) in timings.items():
+            print(f"   • {table:<20} : début {start:>7.2f} s | durée {end - start:>7.2f} s")
+        print(f"   Temps total        : {total_time:.2f} s")
+        print(f"   Chemin critique    : {' → '.join(critical_path)} ({finish[critical_path[-1]]:.2f} s)")
+
+    # ========================================
+    # PHASE 1 : TABLES PARENTES AVEC IDENTITY
+    # ========================================
+
+    def _load_genres(self, data_dict, state, connection):
+        """1. sp_genres (table parente, IDENTITY)."""
+        print("1️⃣  Insertion des GENRES (IDENTITY)...")
+        state['genres_map'].update(self._store_identity(
+            'sp_genres',
+            data_dict['sp_genres'],
+            ['nom_genre'],
+            'id_genre',
+            state,
+            connection
+        ))
+
+    def _load_artists(self, data_dict, state, connection):
+        """2. sp_artists (table parente, IDENTITY)."""
+        print("\n2️⃣  Insertion des ARTISTES (IDENTITY)...")
+        state['artists_map'].update(self._store_identity(
+            'sp_artists',
+            data_dict['sp_artists'],
+            ['nom_artist'],
+            'id_artist',
+            state,
+            connection
+        ))
+
+    # ========================================
+    # PHASE 2 : TABLES ENFANTS AVEC FK
+    # ========================================
+
+    def _load_subgenres(self, data_dict, state, connection):
+        """3. sp_subgenres (IDENTITY + FK vers genres)."""
+        print("\n3️⃣  Insertion des SOUS-GENRES (IDENTITY + FK genre)...")
+        subgenres_df = data_dict['sp_subgenres'].copy()
+        
+        # Mapper les noms de genres vers leurs IDs
+        subgenres_df['id_genre'] = subgenres_df['nom_genre'].map(state['genres_map'])
+        
+        # Filtrer les lignes sans ID de genre valide
+        subgenres_df = self._keep_resolved('sp_subgenres', subgenres_df,
+                                           subgenres_df['id_genre'].notna(), state)
+        subgenres_df['id_genre'] = subgenres_df['id_genre'].astype(int)
+        
+        state['subgenres_map'].update(self._store_identity(
+            'sp_subgenres',
+            subgenres_df,
+            ['nom_subgenre', 'id_genre'],
+            'id_subgenre',
+            state,
+            connection
+        ))
+
+    def _load_albums(self, data_dict, state, connection):
+        """4. sp_albums (FK vers artists)."""
+        print("\n4️⃣  Insertion des ALBUMS (FK artiste)...")
+        albums_df = data_dict['sp_albums'].copy()
+        
+        # Mapper les noms d'artistes vers leurs IDs
+        albums_df['id_artist'] = albums_df['artiste_principal'].map(state['artists_map'])
+        
+        # Filtrer les albums sans artiste valide
+        albums_df = self._keep_resolved('sp_albums', albums_df,
+                                        albums_df[['id_artist', 'id_album']].notna().all(axis=1), state)
+        albums_df['id_artist'] = albums_df['id_artist'].astype(int)
+        
+        # Dates normalisées en datetime64 par le prétraitement (sans effet si déjà fait)
+        albums_df['date_sortie'] = normalize_release_dates(albums_df['date_sortie'])
+        
+        # Préparer les données pour l'insertion
+        album_cols = ['id_album', 'nom_album', 'date_sortie', 'id_artist']
+        albums_data = self._rows_for_binding(albums_df, album_cols)
+        
+        rows_inserted = self._store_rows('sp_albums', album_cols, albums_data, state, connection)
+        print(f"   → {rows_inserted} albums insérés")
+        
+        # Garder seulement les albums insérés pour les FK suivantes
+        state['valid_albums'].update(self._written_keys('sp_albums', albums_df['id_album'], state))
+
+    def _load_tracks(self, data_dict, state, connection):
+        """5. sp_tracks (FK vers albums)."""
+        print("\n5️⃣  Insertion des PISTES (FK album)...")
+        tracks_df = data_dict['sp_tracks'].copy()
+        
+        # Filtrer les tracks dont l'album existe
+        tracks_df = self._keep_resolved('sp_tracks', tracks_df,
+                                        tracks_df['id_album'].isin(state['valid_albums'])
+                                        & tracks_df['id_track'].notna(), state)
+        
+        track_cols = ['id_track', 'track_name', 'duration_ms', 'track_popularity', 'id_album']
+        tracks_data = self._rows_for_binding(tracks_df, ['id_track', 'nom_track', 'duration_ms', 'track_popularity', 'id_album'])
+        
+        rows_inserted = self._store_rows('sp_tracks', track_cols, tracks_data, state, connection)
+        print(f"   → {rows_inserted} pistes insérées")
+        
+        # Garder les tracks valides pour les FK suivantes
+        state['valid_tracks'].update(self._written_keys('sp_tracks', tracks_df['id_track'], state))
+
+    def _load_audio_features(self, data_dict, state, connection):
+        """6. sp_audio_features (FK vers tracks)."""
+        print("\n6️⃣  Insertion des CARACTÉRISTIQUES AUDIO (FK piste)...")
+        audio_df = data_dict['sp_audio_features'].copy()
+        
+        # Filtrer les features dont la track existe
+        audio_df = self._keep_resolved('sp_audio_features', audio_df,
+                                       audio_df['id_track'].isin(state['valid_tracks']), state)
+        
+        # Colonnes à insérer
+        audio_cols = ['id_track', 'energy', 'tempo', 'danceability', 'loudness', 
+                     'liveness', 'valence', 'speechiness', 'acousticness', 
+                     'instrumentalness', 'key_musical', 'mode_musical', 'time_signature']
+        
+        # Vérifier si analysis_url existe
+        if 'analysis_url' in audio_df.columns:
+            audio_cols.append('analysis_url')
+        
+        audio_data = self._rows_for_binding(audio_df, audio_cols)
+        
+        rows_inserted = self._store_rows('sp_audio_features', audio_cols, audio_data, state, connection)
+        print(f"   → {rows_inserted} caractéristiques audio insérées")
+
+    def _load_playlists(self, data_dict, state, connection):
+        """7. sp_playlists (FK vers subgenres)."""
+        print("\n7️⃣  Insertion des PLAYLISTS (FK sous-genre)...")
+        playlists_df = data_dict['sp_playlists'].copy()
+        
+        # Mapper les noms de sous-genres vers leurs IDs
+        playlists_df['id_subgenre'] = playlists_df['nom_subgenre'].map(state['subgenres_map'])
+        
+        # Filtrer les playlists sans sous-genre valide
+        playlists_df = self._keep_resolved('sp_playlists', playlists_df,
+                                           playlists_df[['id_subgenre', 'id_playlist']].notna().all(axis=1),
+                                           state)
+        playlists_df['id_subgenre'] = playlists_df['id_subgenre'].astype(int)
+        
+        playlist_cols = ['id_playlist', 'nom_playlist', 'id_subgenre']
+        playlists_data = self._rows_for_binding(playlists_df, playlist_cols)
+        
+        rows_inserted = self._store_rows('sp_playlists', playlist_cols, playlists_data, state, connection)
+        print(f"   → {rows_inserted} playlists insérées")
+        
+        # Garder les playlists valides
+        state['valid_playlists'].update(self._written_keys('sp_playlists', playlists_df['id_playlist'], state))
+
+    def _load_playlist_tracks(self, data_dict, state, connection):
+        """8. sp_playlist_tracks (table de liaison, FK vers playlists et tracks)."""
+        print("\n8️⃣  Insertion des LIAISONS PLAYLIST-TRACK...")
+        pt_df = data_dict['sp_playlist_tracks'].copy()
+        
+        # Filtrer pour ne garder que les liaisons valides
+        pt_df = self._keep_resolved('sp_playlist_tracks', pt_df,
+                                    pt_df['id_playlist'].isin(state['valid_playlists']) &
+                                    pt_df['id_track'].isin(state['valid_tracks']), state)
+        
+        pt_cols = ['id_playlist', 'id_track']
+        pt_data = self._rows_for_binding(pt_df, pt_cols)
+        
+        rows_inserted = self._store_rows('sp_playlist_tracks', pt_cols, pt_data, state, connection)
+        print(f"   → {rows_inserted} liaisons insérées")
+
+    def _load_existing_state(self, commit=True):
+        """
+        Reconstruit l'état de chargement à partir des données déjà en base :
+        correspondances nom → ID des tables IDENTITY et clés existantes.
+        """
+        state = self._new_load_state(commit=commit)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT nom_genre, id_genre FROM sp_genres")
+            state['genres_map'].update(cursor.fetchall())
+            cursor.execute("SELECT nom_artist, id_artist FROM sp_artists")
+            state['artists_map'].update(cursor.fetchall())
+            cursor.execute("SELECT nom_subgenre, id_subgenre FROM sp_subgenres")
+            state['subgenres_map'].update(cursor.fetchall())
+
+            cursor.execute("SELECT id_album FROM sp_albums")
+            state['valid_albums'].update(row[0] for row in cursor)
+            cursor.execute("SELECT id_track FROM sp_tracks")
+            state['valid_tracks'].update(row[0] for row in cursor)
+            cursor.execute("SELECT id_playlist FROM sp_playlists")
+            state['valid_playlists'].update(row[0] for row in cursor)
+        finally:
+            cursor.close()
+        return state
+
+    def apply_delta(self, delta, rejected=None):
+        """
+        Applique un delta incrémental (voir services.delta_snapshot.compute_delta)
+        au lieu d'un rechargement complet.
+
+        Ordre : insertions (parents avant enfants), mises à jour, puis
+        suppressions (enfants avant parents). Les suppressions ne concernent
+        que les albums, pistes, caractéristiques audio, playlists et liaisons :
+        les genres, sous-genres et artistes disparus sont conservés, leur
+        suppression déclencherait les ON DELETE CASCADE.
+
+        Le delta est appliqué en une seule transaction, validée à la fin : en
+        cas d'erreur, le rollback laisse la base dans l'état du dernier
+        instantané. Les index secondaires (DDL, qui valide implicitement sous
+        Oracle) sont donc créés avant la première écriture.
+
+        Les lignes mises en quarantaine, et celles dont le parent n'a pas été
+        écrit, ne sont pas appliquées : leurs clés sont reportées dans
+        rejected pour que le snapshot ne les compte pas comme chargées
+        (services.delta_snapshot.restore_rejected_rows).
+
+        Args:
+            delta: Dictionnaire {'inserted', 'updated', 'deleted'} de DataFrames par table
+            rejected: Dictionnaire complété par {nom_table: clés naturelles des
+                      lignes non appliquées}
+
+        Returns:
+            bool: True si le delta a été appliqué
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return False
+
+        self._stats_cache.clear()
+
+        print("\n" + "="*60)
+        print("🔁 APPLICATION DU DELTA INCRÉMENTAL")
+        print("="*60 + "\n")
+
+        try:
+            # Les suppressions en cascade s'appuient sur les index des FK
+            self.build_secondary_indexes()
+
+            state = self._load_existing_state(commit=False)
+
+            print("➕ Insertion des nouveaux enregistrements...\n")
+            self._insert_batch(delta['inserted'], state)
+
+            print("\n✏️  Mise à jour des enregistrements modifiés...")
+            self._update_rows(delta['updated'], state, commit=False)
+
+            print("\n🗑️  Suppression des enregistrements disparus...")
+            self._delete_rows(delta['deleted'], state, commit=False)
+
+            self.connection.commit()
+
+            if state['rejected']:
+                skipped = sum(len(keys) for keys in state['rejected'].values())
+                print(f"\n⚠️  {skipped} lignes non appliquées (quarantaine ou parent absent) : "
+                      "reprises au prochain delta.")
+                if rejected is not None:
+                    rejected.update(state['rejected'])
+
+            if DB_EXTRACT_VIEW:
+                self.refresh_extract_view()
+
+            print("\n" + "="*60)
+            print("✅ DELTA APPLIQUÉ AVEC SUCCÈS")
+            print("="*60 + "\n")
+            return True
+
+        except Exception as e:
+            print(f"\n❌ ERREUR CRITIQUE lors de l'application du delta : {e}")
+            import traceback
+            traceback.print_exc()
+            if self.connection:
+                self.connection.rollback()
+            return False
+
+    def _update_rows(self, updated, state, commit=True):
+        """
+        Met à jour les lignes dont le contenu a changé (executemany UPDATE).
+
+        Args:
+            updated: Dictionnaire {nom_table: DataFrame des lignes modifiées}
+            state: État de chargement (correspondances d'IDs et clés valides)
+            commit: Si False, les mises à jour ne sont pas validées
+        """
+        # sp_subgenres : rattachement à un autre genre
+        subgenres_df = updated['sp_subgenres'].copy()
+        subgenres_df['id_genre'] = subgenres_df['nom_genre'].map(state['genres_map'])
+        subgenres_df = self._keep_resolved('sp_subgenres', subgenres_df,
+                                           subgenres_df['id_genre'].notna(), state)
+        subgenres_df['id_genre'] = subgenres_df['id_genre'].astype(int)
+        rows_updated = self._execute_tracked(
+            "UPDATE sp_subgenres SET id_genre = :1 WHERE nom_subgenre = :2",
+            subgenres_df, ['id_genre', 'nom_subgenre'], 'sp_subgenres', state, commit=commit
+        )
+        print(f"   → {rows_updated} sous-genres mis à jour")
+
+        # sp_albums
+        albums_df = updated['sp_albums'].copy()
+        albums_df['id_artist'] = albums_df['artiste_principal'].map(state['artists_map'])
+        albums_df = self._keep_resolved('sp_albums', albums_df, albums_df['id_artist'].notna(), state)
+        albums_df['id_artist'] = albums_df['id_artist'].astype(int)
+        albums_df['date_sortie'] = normalize_release_dates(albums_df['date_sortie'])
+        rows_updated = self._execute_tracked(
+            "UPDATE sp_albums SET nom_album = :1, date_sortie = :2, id_artist = :3 WHERE id_album = :4",
+            albums_df, ['nom_album', 'date_sortie', 'id_artist', 'id_album'], 'sp_albums', state,
+            commit=commit
+        )
+        print(f"   → {rows_updated} albums mis à jour")
+
+        # sp_tracks (l'album cible doit exister)
+        tracks_df = updated['sp_tracks']
+        tracks_df = self._keep_resolved('sp_tracks', tracks_df,
+                                        tracks_df['id_album'].isin(state['valid_albums']), state)
+        rows_updated = self._execute_tracked(
+            "UPDATE sp_tracks SET track_name = :1, duration_ms = :2, track_popularity = :3, id_album = :4 WHERE id_track = :5",
+            tracks_df, ['nom_track', 'duration_ms', 'track_popularity', 'id_album', 'id_track'],
+            'sp_tracks', state, commit=commit
+        )
+        print(f"   → {rows_updated} pistes mises à jour")
+
+        # sp_audio_features
+        audio_df = updated['sp_audio_features']
+        # Les codes de substitution (code_track) ne sont pas des colonnes de la table
+        feature_cols = [col for col in audio_df.columns
+                        if col != 'id_track' and not col.startswith(CODE_PREFIX)]
+        set_clause = ', '.join(f"{col} = :{i+1}" for i, col in enumerate(feature_cols))
+        rows_updated = self._execute_tracked(
+            f"UPDATE sp_audio_features SET {set_clause} WHERE id_track = :{len(feature_cols)+1}",
+            audio_df, feature_cols + ['id_track'], 'sp_audio_features', state, commit=commit
+        )
+        print(f"   → {rows_updated} caractéristiques audio mises à jour")
+
+        # sp_playlists
+        playlists_df = updated['sp_playlists'].copy()
+        playlists_df['id_subgenre'] = playlists_df['nom_subgenre'].map(state['subgenres_map'])
+        playlists_df = self._keep_resolved('sp_playlists', playlists_df,
+                                           playlists_df['id_subgenre'].notna(), state)
+        playlists_df['id_subgenre'] = playlists_df['id_subgenre'].astype(int)
+        rows_updated = self._execute_tracked(
+            "UPDATE sp_playlists SET nom_playlist = :1, id_subgenre = :2 WHERE id_playlist = :3",
+            playlists_df, ['nom_playlist', 'id_subgenre', 'id_playlist'], 'sp_playlists', state,
+            commit=commit
+        )
+        print(f"   → {rows_updated} playlists mises à jour")
+
+    def _delete_rows(self, deleted, state, commit=True):
+        """
+        Supprime les lignes disparues du CSV, des tables enfants vers les parents.
+
+        Args:
+            deleted: Dictionnaire {nom_table: DataFrame des clés supprimées}
+            state: État de chargement (clés des lignes non supprimées)
+            commit: Si False, les suppressions ne sont pas validées
+        """
+        deletions = [
+            ('sp_playlist_tracks', ['id_playlist', 'id_track'], "liaisons"),
+            ('sp_audio_features', ['id_track'], "caractéristiques audio"),
+            ('sp_playlists', ['id_playlist'], "playlists"),
+            ('sp_tracks', ['id_track'], "pistes"),
+            ('sp_albums', ['id_album'], "albums"),
+        ]
+        for table, key_cols, label in deletions:
+            where_clause = ' AND '.join(f"{col} = :{i+1}" for i, col in enumerate(key_cols))
+            rows_deleted = self._execute_tracked(
+                f"DELETE FROM {table} WHERE {where_clause}",
+                deleted[table], key_cols, table, state, commit=commit
+            )
+            print(f"   → {rows_deleted} {label} supprimé(e)s")
+
+    def fetch_data_for_xml(self):
+        """
+        Extrait les données complètes de la BD pour la génération XML.
+        Joint toutes les tables nécessaires.
+
+        Charge tout le résultat en mémoire : pour un export en flux, utiliser
+        iter_data_for_xml.
+        
+        Returns:
+            Liste de dictionnaires contenant toutes les données jointes
+        """
+        try:
+            results = list(self.iter_data_for_xml())
+        except self.Error:
+            return []
+        if results:
+            print(f"✅ Extraction terminée : {len(results)} lignes récupérées\n")
+        return results
+
+    def _extract_sql(self, use_view=True, ranged=False):
+        """
+        Requête d'extraction : la vue matérialisée si elle est à jour, la
+        jointure sinon (limitée à une tranche de playlists si ranged).
+        """
+        if use_view and self._use_extract_view():
+            print(f"   Source : vue matérialisée {EXTRACT_VIEW}")
+            return EXTRACT_VIEW_RANGE_SQL if ranged else EXTRACT_VIEW_SQL
+        return XML_EXTRACT_RANGE_SQL if ranged else XML_EXTRACT_SQL
+
+    def _iter_extract_rows(self, connection, sql, parameters=None, arraysize=None):
+        """
+        Exécute une requête d'extraction et produit ses lignes une à une,
+        rapatriées par paquets de arraysize, sous forme de dictionnaires
+        (NULL convertis en '' par le gestionnaire de types de sortie pour les
+        colonnes texte, à la construction de la ligne pour les autres).
+        """
+        cursor = connection.cursor()
+        cursor.arraysize = arraysize or DB_FETCH_ARRAYSIZE
+        cursor.prefetchrows = cursor.arraysize
+        cursor.outputtypehandler = _empty_string_for_nulls
+        try:
+            cursor.execute(sql, parameters or [])
+            cols = [col[0].lower() for col in cursor.description]
+            others = [i for i, col in enumerate(cursor.description)
+                      if col.type_code not in _STRING_TYPES]
+
+            def build_row(*row):
+                row = list(row)
+                for i in others:
+                    if row[i] is None:
+                        row[i] = ''
+                return dict(zip(cols, row))
+
+            cursor.rowfactory = build_row
+
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def iter_data_for_xml(self, arraysize=None, use_view=True):
+        """
+        Extrait en flux les données jointes pour la génération XML.
+
+        Les lignes sont rapatriées par paquets de arraysize (arraysize et
+        prefetchrows du curseur) et produites une à une, triées par playlist :
+        la mémoire consommée ne dépend pas du volume extrait. Les NULL sont
+        convertis en '' (voir _iter_extract_rows).
+
+        Si la vue matérialisée de l'extraction est à jour, elle est lue à la
+        place de la jointure des huit tables.
+
+        Args:
+            arraysize: Lignes par aller-retour (défaut : DB_FETCH_ARRAYSIZE)
+            use_view: Si False, refait toujours la jointure
+
+        Yields:
+            dict: Une ligne jointe {colonne: valeur}
+
+        Raises:
+            self.Error: Erreur SQL en cours d'extraction, propagée pour que
+                        l'export n'écrive pas un fichier tronqué
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return
+
+        print("\n🔍 Extraction des données pour export XML...")
+        sql = self._extract_sql(use_view)
+
+        try:
+            yield from self._iter_extract_rows(self.connection, sql, arraysize=arraysize)
+        except self.Error as e:
+            print(f"❌ Erreur SQL lors de l'extraction : {e}")
+            raise
+
+    def extract_partitioned(self, consumer, partitions=None, arraysize=None):
+        """
+        Extraction parallèle pour les gros exports : les playlists sont
+        découpées en tranches contiguës de clés (NTILE sur id_playlist), lues
+        chacune sur sa propre connexion (empruntée au pool si DB_POOL_ENABLED)
+        dans un thread. Les lignes d'une tranche, triées comme celles de
+        iter_data_for_xml, sont passées directement à consumer(index, lignes)
+        dans le thread qui les lit.
+
+        Les tranches se suivent dans l'ordre des clés : mis bout à bout dans
+        l'ordre des index, les résultats des consommateurs respectent l'ordre
+        de l'extraction en série.
+
+        Args:
+            consumer: Fonction (index de la tranche, itérateur de lignes) → résultat
+            partitions: Nombre de tranches et de connexions (défaut : DB_EXTRACT_PARTITIONS)
+            arraysize: Lignes par aller-retour (défaut : DB_FETCH_ARRAYSIZE)
+
+        Returns:
+            list: Résultats des consommateurs dans l'ordre des tranches, None en cas d'erreur
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return None
+
+        partitions = partitions or DB_EXTRACT_PARTITIONS
+        sql = self._extract_sql(ranged=True)
+
+        try:
+            bounds = self._partition_bounds(partitions)
+        except self.Error as e:
+            print(f"❌ Erreur SQL lors du découpage en tranches : {e}")
+            return None
+
+        print(f"\n🔍 Extraction parallèle : {len(bounds)} tranches de playlists "
+              f"sur {len(bounds)} connexions...")
+        start = time.perf_counter()
+
+        def extract_range(index, low, high):
+            with self.acquire_connection() as connection:
+                rows = self._iter_extract_rows(connection, sql, [low, high], arraysize)
+                return consumer(index, rows)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(len(bounds), 1)) as executor:
+                futures = [executor.submit(extract_range, index, low, high)
+                           for index, (low, high) in enumerate(bounds)]
+                results = [future.result() for future in futures]
+        except self.Error as e:
+            print(f"❌ Erreur SQL lors de l'extraction parallèle : {e}")
+            return None
+
+        print(f"   → {len(bounds)} tranches extraites ({time.perf_counter() - start:.2f} s)")
+        return results
+
+    def _partition_bounds(self, partitions):
+        """
+        Retourne les bornes (id_playlist min, max) de partitions tranches
+        contiguës de playlists, dans l'ordre des clés.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(PARTITION_BOUNDS_SQL, [partitions])
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def iter_playlist_documents(self, doc_format='xml', chunk_size=None):
+        """
+        Extrait en flux les playlists sous forme de documents construits par
+        Oracle (XMLAGG/XMLELEMENT ou JSON_OBJECT/JSON_ARRAYAGG).
+
+        Oracle renvoie une ligne par playlist au lieu d'une ligne par piste :
+        les colonnes de la playlist ne sont plus répétées et le regroupement
+        (group_data_by_playlist) n'a plus lieu côté Python.
+
+        Args:
+            doc_format: 'xml' (élément <playlist> sérialisé) ou 'json'
+            chunk_size: Documents par paquet (défaut : DB_DOCUMENT_CHUNK_SIZE)
+
+        Yields:
+            list: Paquet de documents (chaînes), triés par id_playlist
+
+        Raises:
+            self.Error: Erreur SQL en cours de génération, propagée pour que
+                        l'export ou l'insertion en cours échoue
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return
+
+        print(f"\n🔍 Génération des documents {doc_format.upper()} par Oracle...")
+
+        cursor = self.connection.cursor()
+        cursor.arraysize = chunk_size or DB_DOCUMENT_CHUNK_SIZE
+        cursor.prefetchrows = cursor.arraysize
+        cursor.outputtypehandler = _lobs_as_strings
+        try:
+            cursor.execute(DOCUMENT_QUERIES[doc_format])
+
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield [row[0] for row in rows]
+
+        except self.Error as e:
+            print(f"❌ Erreur SQL lors de la génération des documents : {e}")
+            raise
+        finally:
+            cursor.close()
+
+    def fetch_extract_frame(self, as_arrow=False, arraysize=None):
+        """
+        Extrait les données jointes (même requête que l'export XML) sous forme
+        colonnaire, sans construire d'objet Python par ligne.
+
+        Avec python-oracledb >= 3 et pyarrow, le pilote remplit directement des
+        tableaux Arrow typés (Connection.fetch_df_all). Sinon, chaque paquet
+        fetchmany est transposé en tableaux NumPy par colonne (float64 pour
+        les NUMBER, objets pour le texte), concaténés à la fin.
+
+        Contrairement à fetch_data_for_xml, les NULL restent des valeurs
+        manquantes (NaN/None) et ne sont pas remplacés par ''.
+
+        Args:
+            as_arrow: Retourner un pyarrow.Table plutôt qu'un DataFrame
+            arraysize: Lignes par aller-retour (défaut : DB_FETCH_ARRAYSIZE)
+
+        Returns:
+            pandas.DataFrame ou pyarrow.Table (colonnes en minuscules), None en cas d'erreur
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return None
+        if as_arrow and not ARROW_AVAILABLE:
+            print("❌ pyarrow n'est pas installé : extraction Arrow impossible.")
+            return None
+
+        arraysize = arraysize or DB_FETCH_ARRAYSIZE
+        print("\n🔍 Extraction colonnaire des données...")
+
+        try:
+            sql = self._extract_sql()
+            if ARROW_AVAILABLE and hasattr(self.connection, 'fetch_df_all'):
+                table = pyarrow.table(self.connection.fetch_df_all(sql, arraysize=arraysize))
+                table = table.rename_columns([name.lower() for name in table.column_names])
+                result = table if as_arrow else table.to_pandas()
+            else:
+                frame = self._fetch_frame_by_batches(sql, arraysize)
+                result = pyarrow.Table.from_pandas(frame, preserve_index=False) if as_arrow else frame
+
+        except self.Error as e:
+            print(f"❌ Erreur SQL lors de l'extraction : {e}")
+            return None
+
+        print(f"✅ Extraction terminée : {result.shape[0]} lignes, {result.shape[1]} colonnes\n")
+        return result
+
+    def _fetch_frame_by_batches(self, sql, arraysize):
+        """
+        Construit un DataFrame à partir de paquets fetchmany, colonne par
+        colonne : chaque paquet est transposé en un tableau NumPy par colonne,
+        les tableaux étant concaténés une seule fois à la fin.
+        """
+        cursor = self.connection.cursor()
+        cursor.arraysize = arraysize
+        cursor.prefetchrows = arraysize
+        try:
+            cursor.execute(sql)
+            names = [col[0].lower() for col in cursor.description]
+            dtypes = ['float64' if col[1] is oracledb.DB_TYPE_NUMBER else object
+                      for col in cursor.description]
+            chunks = [[] for _ in names]
+
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for chunk, values, dtype in zip(chunks, zip(*rows), dtypes):
+                    # None devient NaN dans les colonnes numériques
+                    chunk.append(np.array(values, dtype=dtype))
+
+            return pd.DataFrame({
+                name: np.concatenate(chunk) if chunk else np.empty(0, dtype=dtype)
+                for name, chunk, dtype in zip(names, chunks, dtypes)
+            })
+        finally:
+            cursor.close()
+
+    def count_data_for_xml(self):
+        """
+        Compte les playlists et les lignes de l'extraction XML, pour écrire
+        les totaux de l'en-tête avant de parcourir les données en flux.
+
+        Returns:
+            tuple: (nombre de playlists, nombre de lignes) ou None en cas d'erreur
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return None
+
+        if self._use_extract_view():
+            count_sql = f"SELECT COUNT(DISTINCT id_playlist), COUNT(*) FROM {EXTRACT_VIEW}"
+        else:
+            count_sql = f"SELECT COUNT(DISTINCT p.id_playlist), COUNT(*) {XML_EXTRACT_FROM}"
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(count_sql)
+            return tuple(cursor.fetchone())
+        except self.Error as e:
+            print(f"❌ Erreur SQL lors du comptage : {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def get_statistics(self, estimate=False, refresh=False):
+        """
+        Retourne des statistiques sur les données en base.
+
+        Les huit comptages sont faits en un seul aller-retour (UNION ALL). En
+        mode estimate, les nombres de lignes sont lus dans le dictionnaire
+        (user_tables.num_rows, à jour au dernier calcul des statistiques de
+        l'optimiseur) sans parcourir les tables ; si une table n'a pas de
+        statistiques, le comptage exact est utilisé.
+
+        Le résultat est conservé sur le gestionnaire jusqu'à la prochaine
+        écriture (initialize_db, insert_data, apply_delta).
+
+        Args:
+            estimate: Si True, lit les estimations du dictionnaire
+            refresh: Si True, ignore le cache
+
+        Returns:
+            dict: {nom_table: nombre de lignes} ou None en cas d'erreur
+        """
+        if not self.connection:
+            return None
+
+        mode = 'estimate' if estimate else 'exact'
+        if not refresh and mode in self._stats_cache:
+            return dict(self._stats_cache[mode])
+
+        cursor = self.connection.cursor()
+        try:
+            if estimate:
+                cursor.execute(
+                    "SELECT LOWER(table_name), num_rows FROM user_tables "
+                    "WHERE table_name IN (" + ", ".join(f"'{t.upper()}'" for t in STATISTICS_TABLES) + ")"
+                )
+                counts = dict(cursor.fetchall())
+                if any(counts.get(table) is None for table in STATISTICS_TABLES):
+                    print("ℹ️  Statistiques de l'optimiseur absentes : comptage exact.")
+                    counts = self.get_statistics(estimate=False, refresh=refresh)
+                    if counts is None:
+                        return None
+            else:
+                cursor.execute(" UNION ALL ".join(
+                    f"SELECT '{table}', COUNT(*) FROM {table}" for table in STATISTICS_TABLES
+                ))
+                counts = dict(cursor.fetchall())
+
+            stats = {table: counts[table] for table in STATISTICS_TABLES}
+            self._stats_cache[mode] = stats
+            return dict(stats)
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des statistiques : {e}")
+            return None
+        finally:
+            cursor.close()
@@ -1,5 +1,7 @@
 # Fichier : db_schema.py
 
+import re
+
 # Liste des tables à supprimer dans l'ordre inverse des dépendances (enfants avant parents)
 DROP_TABLES_SQL = [
     "DROP TABLE sp_playlist_tracks",
@@ -12,6 +14,32 @@ DROP_TABLES_SQL = [
     "DROP TABLE sp_genres",
 ]
 
+# Tables de préparation du mode upsert (une par table cible)
+STAGING_TABLES = {
+    'sp_genres': 'sp_stg_genres',
+    'sp_artists': 'sp_stg_artists',
+    'sp_subgenres': 'sp_stg_subgenres',
+    'sp_albums': 'sp_stg_albums',
+    'sp_tracks': 'sp_stg_tracks',
+    'sp_audio_features': 'sp_stg_audio_features',
+    'sp_playlists': 'sp_stg_playlists',
+    'sp_playlist_tracks': 'sp_stg_playlist_tracks'
+}
+
+DROP_STAGING_TABLES_SQL = [f"DROP TABLE {staging}" for staging in STAGING_TABLES.values()]
+
+# Clés de rapprochement (MERGE ... ON) de chaque table en mode upsert
+MERGE_KEYS = {
+    'sp_genres': ['nom_genre'],
+    'sp_artists': ['nom_artist'],
+    'sp_subgenres': ['nom_subgenre'],
+    'sp_albums': ['id_album'],
+    'sp_tracks': ['id_track'],
+    'sp_audio_features': ['id_track'],
+    'sp_playlists': ['id_playlist'],
+    'sp_playlist_tracks': ['id_playlist', 'id_track']
+}
+
 # Script de création des tables (DDL)
 CREATE_TABLES_SQL = """
 -- 1. Table GENRES
@@ -111,4 +139,250 @@ CREATE TABLE sp_playlist_tracks (
         REFERENCES sp_tracks(id_track)
         ON DELETE CASCADE
 );
-"""
\ No newline at end of file
+"""
+
+
+# Nombre de partitions de hachage de sp_playlist_tracks (profil compact)
+PLAYLIST_TRACKS_PARTITIONS = 8
+
+# Profils de stockage physique : clause ajoutée à la fin du CREATE TABLE de
+# chaque table. Profil compact :
+#   - sp_playlist_tracks : table organisée en index (la clé est toute la
+#     ligne), préfixe id_playlist compressé, partitionnée par hachage de la
+#     playlist ;
+#   - sp_audio_features : table organisée en index (toujours lue par clé) ;
+#   - tables de dimension : compression de base, appliquée aux lignes
+#     chargées en chemin direct (mode --bulk).
+STORAGE_PROFILES = {
+    'standard': {},
+    'compact': {
+        'sp_genres': "COMPRESS BASIC",
+        'sp_subgenres': "COMPRESS BASIC",
+        'sp_artists': "COMPRESS BASIC",
+        'sp_albums': "COMPRESS BASIC",
+        'sp_tracks': "COMPRESS BASIC",
+        'sp_playlists': "COMPRESS BASIC",
+        'sp_audio_features': "ORGANIZATION INDEX",
+        'sp_playlist_tracks': (
+            "ORGANIZATION INDEX COMPRESS 1\n"
+            f"PARTITION BY HASH (id_playlist) PARTITIONS {PLAYLIST_TRACKS_PARTITIONS}"
+        )
+    }
+}
+
+# Index secondaires gérés : un par clé étrangère non couverte par une clé
+# primaire, pour les jointures de l'extraction XML et les ON DELETE CASCADE /
+# SET NULL. Ils ne sont pas créés avec les tables mais après le chargement
+# (DatabaseManager.build_secondary_indexes).
+SECONDARY_INDEXES = {
+    'ix_sp_subgenres_genre': ('sp_subgenres', ['id_genre']),
+    'ix_sp_albums_artist': ('sp_albums', ['id_artist']),
+    'ix_sp_tracks_album': ('sp_tracks', ['id_album']),
+    'ix_sp_playlists_subgenre': ('sp_playlists', ['id_subgenre']),
+    'ix_sp_playlist_tracks_track': ('sp_playlist_tracks', ['id_track'])
+}
+
+CREATE_INDEXES_SQL = {
+    name: f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"
+    for name, (table, columns) in SECONDARY_INDEXES.items()
+}
+
+# Tables temporaires globales de préparation (mode upsert) : mêmes colonnes et
+# contraintes de valeur que les tables cibles, sans clés ni IDENTITY. Leur
+# contenu est propre à chaque session et conservé jusqu'au TRUNCATE suivant.
+STAGING_TABLES_SQL = """
+CREATE GLOBAL TEMPORARY TABLE sp_stg_genres (
+    nom_genre VARCHAR2(100) NOT NULL
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_subgenres (
+    nom_subgenre VARCHAR2(100) NOT NULL,
+    id_genre NUMBER NOT NULL
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_artists (
+    nom_artist VARCHAR2(255) NOT NULL
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_albums (
+    id_album VARCHAR2(50) NOT NULL,
+    nom_album VARCHAR2(255) NOT NULL,
+    date_sortie DATE,
+    id_artist NUMBER NOT NULL
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_tracks (
+    id_track VARCHAR2(50) NOT NULL,
+    track_name VARCHAR2(255) NOT NULL,
+    duration_ms NUMBER,
+    track_popularity NUMBER,
+    id_album VARCHAR2(50) NOT NULL
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_audio_features (
+    id_track VARCHAR2(50) NOT NULL,
+    energy NUMBER(5,4),
+    tempo NUMBER(7,3),
+    danceability NUMBER(5,4),
+    loudness NUMBER(6,3),
+    liveness NUMBER(5,4),
+    valence NUMBER(5,4),
+    speechiness NUMBER(5,4),
+    acousticness NUMBER(5,4),
+    instrumentalness NUMBER(5,4),
+    key_musical NUMBER,
+    mode_musical NUMBER,
+    time_signature NUMBER,
+    analysis_url VARCHAR2(500)
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_playlists (
+    id_playlist VARCHAR2(50) NOT NULL,
+    nom_playlist VARCHAR2(255) NOT NULL,
+    id_subgenre NUMBER
+) ON COMMIT PRESERVE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE sp_stg_playlist_tracks (
+    id_playlist VARCHAR2(50) NOT NULL,
+    id_track VARCHAR2(50) NOT NULL
+) ON COMMIT PRESERVE ROWS
+"""
+
+# --- Extraction dénormalisée (export XML) ---
+
+# Jointures de l'extraction XML (une ligne par piste de playlist)
+XML_EXTRACT_FROM = """
+    FROM sp_playlists p
+    INNER JOIN sp_subgenres sg ON p.id_subgenre = sg.id_subgenre
+    INNER JOIN sp_genres g ON sg.id_genre = g.id_genre
+    INNER JOIN sp_playlist_tracks pt ON p.id_playlist = pt.id_playlist
+    INNER JOIN sp_tracks t ON pt.id_track = t.id_track
+    INNER JOIN sp_albums a ON t.id_album = a.id_album
+    INNER JOIN sp_artists ar ON a.id_artist = ar.id_artist
+    LEFT JOIN sp_audio_features af ON t.id_track = af.id_track
+"""
+
+XML_EXTRACT_COLUMNS = """
+        p.id_playlist,
+        p.nom_playlist,
+        sg.nom_subgenre,
+        g.nom_genre,
+        t.id_track,
+        t.track_name,
+        t.duration_ms,
+        t.track_popularity,
+        a.id_album,
+        a.nom_album,
+        TO_CHAR(a.date_sortie, 'YYYY-MM-DD') as date_sortie,
+        ar.nom_artist as artiste_principal,
+        af.energy,
+        af.tempo,
+        af.danceability,
+        af.loudness,
+        af.valence,
+        af.liveness,
+        af.speechiness,
+        af.acousticness,
+        af.instrumentalness
+"""
+
+# Vue matérialisée de l'extraction : la jointure des huit tables est calculée
+# une fois, en fin de chargement (rafraîchissement complet à la demande), et
+# les exports lisent une seule structure. Ses lignes ne sont pas stockées dans
+# l'ordre de l'export : les lectures gardent leur ORDER BY, que l'optimiseur
+# peut servir par l'index sur (playlist, titre, piste) au lieu d'un tri.
+EXTRACT_VIEW = 'mv_sp_xml_extract'
+
+CREATE_EXTRACT_VIEW_SQL = f"""
+CREATE MATERIALIZED VIEW {EXTRACT_VIEW}
+BUILD DEFERRED
+REFRESH COMPLETE ON DEMAND
+AS SELECT {XML_EXTRACT_COLUMNS}
+{XML_EXTRACT_FROM}"""
+
+CREATE_EXTRACT_VIEW_INDEX_SQL = (
+    f"CREATE INDEX ix_{EXTRACT_VIEW}_order ON {EXTRACT_VIEW} (id_playlist, track_name, id_track)"
+)
+
+DROP_EXTRACT_VIEW_SQL = f"DROP MATERIALIZED VIEW {EXTRACT_VIEW}"
+
+
+def get_table_dependencies(create_sql=CREATE_TABLES_SQL):
+    """
+    Déduit le graphe des dépendances (clés étrangères) du script de création.
+
+    Args:
+        create_sql: Script DDL contenant les CREATE TABLE
+
+    Returns:
+        dict: {table: liste triée des tables référencées}, dans l'ordre du script
+    """
+    dependencies = {}
+    for block in re.split(r'\bCREATE\s+TABLE\s+', create_sql, flags=re.IGNORECASE)[1:]:
+        table = re.match(r'\w+', block).group(0).lower()
+        references = re.findall(r'\bREFERENCES\s+(\w+)', block, flags=re.IGNORECASE)
+        dependencies[table] = sorted({ref.lower() for ref in references} - {table})
+    return dependencies
+
+
+def get_foreign_keys(create_sql=CREATE_TABLES_SQL):
+    """
+    Liste les contraintes de clé étrangère nommées du script de création.
+
+    Args:
+        create_sql: Script DDL contenant les CREATE TABLE
+
+    Returns:
+        dict: {table: [noms des contraintes FK]}, dans l'ordre du script
+    """
+    foreign_keys = {}
+    for block in re.split(r'\bCREATE\s+TABLE\s+', create_sql, flags=re.IGNORECASE)[1:]:
+        table = re.match(r'\w+', block).group(0).lower()
+        constraints = re.findall(r'\bCONSTRAINT\s+(\w+)\s+FOREIGN\s+KEY', block, flags=re.IGNORECASE)
+        if constraints:
+            foreign_keys[table] = [name.lower() for name in constraints]
+    return foreign_keys
+
+
+def get_create_tables_sql(profile='standard', create_sql=CREATE_TABLES_SQL):
+    """
+    Retourne le script de création des tables pour un profil de stockage.
+
+    Args:
+        profile: Nom du profil (clé de STORAGE_PROFILES)
+        create_sql: Script DDL contenant les CREATE TABLE
+
+    Returns:
+        str: Script DDL avec les clauses de stockage du profil
+    """
+    clauses = STORAGE_PROFILES[profile]
+
+    def add_clause(match):
+        clause = clauses.get(match.group(2).lower())
+        return f"{match.group(1)}\n{clause};" if clause else match.group(0)
+
+    return re.sub(r'(CREATE\s+TABLE\s+(\w+)\s*\(.*?\n\));', add_clause, create_sql,
+                  flags=re.IGNORECASE | re.DOTALL)
+
+
+def get_sqlite_create_tables_sql(create_sql=CREATE_TABLES_SQL):
+    """
+    Adapte le script de création des tables à SQLite : mêmes tables,
+    colonnes et contraintes, les colonnes IDENTITY devenant des INTEGER
+    PRIMARY KEY (alias du rowid, numérotées automatiquement). Les autres
+    types Oracle (VARCHAR2, NUMBER, DATE) sont acceptés tels quels par SQLite.
+
+    Args:
+        create_sql: Script DDL Oracle
+
+    Returns:
+        str: Script DDL SQLite
+    """
+    return re.sub(r'NUMBER\s+GENERATED\s+ALWAYS\s+AS\s+IDENTITY\s+PRIMARY\s+KEY',
+                  'INTEGER PRIMARY KEY', create_sql, flags=re.IGNORECASE)
+
+# Graphe des dépendances FK : {table enfant: [tables parentes]}
+TABLE_DEPENDENCIES = get_table_dependencies()
+
+# Contraintes FK de chaque table : {table: [noms des contraintes]}
+FOREIGN_KEYS = get_foreign_keys()
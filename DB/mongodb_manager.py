@@ -6,6 +6,7 @@ Gère la connexion, l'insertion et les requêtes sur MongoDB.
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, DuplicateKeyError, BulkWriteError
 import json
+from datetime import datetime
 from pathlib import Path
 
 
@@ -278,6 +279,76 @@ class MongoDBManager:
             traceback.print_exc()
             return False, 0
 
+    def insert_playlist_documents(self, document_chunks, clear_first=True):
+        """
+        Insère les playlists construites en JSON par Oracle
+        (DatabaseManager.iter_playlist_documents(doc_format='json')).
+
+        Les documents arrivent par paquets : chaque paquet est décodé et
+        inséré avant la lecture du suivant, sans fichier JSON intermédiaire.
+
+        Args:
+            document_chunks: Itérable de paquets (listes) de documents JSON (chaînes)
+            clear_first: Si True, supprime la collection avant insertion
+
+        Returns:
+            tuple: (bool: succès, int: nombre de playlists insérées)
+        """
+        if self.db is None:
+            print("Pas de connexion active à MongoDB.")
+            return False, 0
+
+        print("\n" + "="*70)
+        print(" 💾 INSERTION DES PLAYLISTS SPOTIFY DANS MONGODB (DEPUIS ORACLE)")
+        print("="*70)
+
+        collection = self.db['playlists']
+        metadata = {
+            'generated_at': datetime.now().isoformat(),
+            'source': 'oracle_json_documents'
+        }
+
+        try:
+            if clear_first:
+                print(f"   Suppression de la collection existante...")
+                collection.drop()
+                collection = self.db['playlists']
+
+            inserted_count = 0
+            total_tracks = 0
+            for chunk in document_chunks:
+                playlists = [json.loads(document) for document in chunk]
+                for playlist in playlists:
+                    playlist['_metadata'] = metadata
+                    total_tracks += playlist.get('tracks_count', 0)
+
+                if playlists:
+                    result = collection.insert_many(playlists, ordered=False)
+                    inserted_count += len(result.inserted_ids)
+                    print(f"   ✅ {inserted_count} playlists insérées...")
+
+            print(f"\n Résumé :")
+            print(f"   • Collection : playlists")
+            print(f"   • Documents insérés : {inserted_count}")
+            print(f"   • Tracks totaux : {total_tracks}")
+
+            if inserted_count:
+                self.create_index('playlists', 'id', unique=True)
+
+            return inserted_count > 0, inserted_count
+
+        except BulkWriteError as e:
+            print(f"Erreur partielle lors de l'insertion en masse :")
+            print(f"   Insérés : {e.details.get('nInserted', 0)}")
+            print(f"   Erreurs : {len(e.details.get('writeErrors', []))}")
+            return False, e.details.get('nInserted', 0)
+
+        except Exception as e:
+            print(f"\nErreur lors de l'insertion des playlists : {e}")
+            import traceback
+            traceback.print_exc()
+            return False, 0
+
     def create_index(self, collection_name, field_name, unique=False):
         """
         Crée un index sur un champ.
@@ -0,0 +1,408 @@
+# Fichier : sqlite_manager.py
+
+import os
+import re
+import sqlite3
+
+import pandas as pd
+from configs.config import SQLITE_PATH, DB_BATCH_SIZE, DB_FETCH_ARRAYSIZE, DB_EXTRACT_PARTITIONS
+from .db_manager import PARTITION_BOUNDS_SQL, DatabaseManager
+from .db_schema import (DROP_TABLES_SQL, MERGE_KEYS, XML_EXTRACT_FROM, XML_EXTRACT_COLUMNS,
+                        EXTRACT_VIEW, CREATE_EXTRACT_VIEW_INDEX_SQL, get_sqlite_create_tables_sql)
+
+# Dates liées en texte ISO (les colonnes DATE n'existent pas en SQLite) :
+# l'ordre lexicographique reste l'ordre chronologique
+sqlite3.register_adapter(pd.Timestamp, lambda value: value.strftime('%Y-%m-%d'))
+
+# Nombre de clés par requête IN (...) : sous la limite historique de 999
+# paramètres liés de SQLite
+IDENTITY_LOOKUP_SIZE = 500
+
+
+def _sqlite_sql(sql):
+    """
+    Adapte une requête écrite pour Oracle à SQLite : paramètres positionnels
+    :1, :2... en ?1, ?2... et dates lues telles quelles (déjà au format
+    AAAA-MM-JJ, TO_CHAR n'existant pas).
+    """
+    sql = re.sub(r":(\d+)\b", r"?\1", sql)
+    return re.sub(r"TO_CHAR\((\w+\.\w+), 'YYYY-MM-DD'\)", r"\1", sql)
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """
+    Moteur de stockage local (SQLite) derrière l'interface de DatabaseManager.
+
+    Même schéma (identités en INTEGER PRIMARY KEY), mêmes chargements par
+    executemany avec correspondance clé naturelle → ID, même extraction pour
+    l'export XML : le pipeline complet tourne dans le processus, sans serveur
+    Oracle (tests, benchmarks à grande échelle sur un poste de travail).
+
+    Les fonctions propres à Oracle (pool de sessions, chargement direct,
+    chargement parallèle, index invisibles, documents générés par le serveur,
+    statistiques de l'optimiseur) sont remplacées par leur équivalent
+    séquentiel ou signalées comme indisponibles.
+    """
+    Error = sqlite3.Error
+    SERVER_SIDE_DOCUMENTS = False
+
+    def __init__(self, db_path=None):
+        super().__init__(use_pool=False)
+        self.db_path = db_path or SQLITE_PATH
+
+    def _open_connection(self):
+        """Ouvre la base SQLite (créée si besoin) avec les clés étrangères actives."""
+        if self.db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    def connect(self):
+        """Établit et retourne la connexion à la base SQLite."""
+        try:
+            self.connection = self._open_connection()
+            print(f"✅ Connexion à la base de données SQLite établie ({self.db_path}).")
+            print(f"   Version SQLite : {sqlite3.sqlite_version}")
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"❌ Erreur de connexion à SQLite : {e}")
+            self.connection = None
+            return False
+
+    def initialize_db(self, drop_first=False, storage_profile=None):
+        """
+        Crée toutes les tables si elles n'existent pas (option de suppression).
+        Les profils de stockage Oracle sont sans objet et ignorés.
+
+        Args:
+            drop_first: Si True, supprime d'abord les tables existantes
+            storage_profile: Ignoré (compatibilité avec DatabaseManager)
+        """
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return False
+
+        self._stats_cache.clear()
+
+        if drop_first:
+            print("\n⚠️  Suppression des tables existantes...")
+            self._drop_extract_view()
+            for drop_sql in DROP_TABLES_SQL:
+                self.connection.execute(drop_sql.replace("DROP TABLE", "DROP TABLE IF EXISTS"))
+            self.connection.commit()
+            print("✅ Suppression terminée.\n")
+
+        print("⚙️  Création des tables de la BD Spotify (SQLite)...")
+        create_sql = get_sqlite_create_tables_sql().replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS")
+        if self._execute_sql_script(create_sql, commit=True):
+            print("✅ Initialisation du schéma de base de données terminée.\n")
+            return True
+        else:
+            print("⚠️ Initialisation terminée avec des avertissements.\n")
+            return False
+
+    def insert_data(self, data, workers=None, upsert=False, bulk=False):
+        """
+        Insère les données normalisées (voir DatabaseManager.insert_data).
+        Une base SQLite n'accepte qu'un écrivain à la fois : les tables sont
+        chargées séquentiellement et le mode bulk est sans objet.
+        """
+        if workers and workers > 1:
+            print("ℹ️  SQLite : chargement séquentiel (un seul écrivain).")
+        if self.connection:
+            self._drop_extract_view()
+        return super().insert_data(data, workers=1, upsert=upsert, bulk=False)
+
+    def apply_delta(self, delta, rejected=None):
+        """Applique un delta incrémental (voir DatabaseManager.apply_delta)."""
+        if self.connection:
+            self._drop_extract_view()
+        return super().apply_delta(delta, rejected=rejected)
+
+    def _execute_many(self, sql_query, data_list, batch_size=None, connection=None,
+                      batch_errors=True, commit=True, failed_chunks=None, rejected_rows=None):
+        """
+        Exécute une écriture de masse (executemany) par lots validés séparément
+        (aucun si commit=False, voir DatabaseManager._execute_many).
+
+        SQLite n'a pas d'équivalent à batcherrors : un lot en erreur est
+        annulé (jusqu'au point de sauvegarde posé avant lui, sans toucher aux
+        écritures précédentes de la transaction) puis rejoué ligne par ligne,
+        les lignes rejetées étant écrites en quarantaine comme avec Oracle.
+        batch_errors est ignoré (pas de chargement direct avec SQLite), et
+        aucun lot n'étant annulé en entier, failed_chunks n'est jamais complété.
+
+        Returns:
+            int: Nombre de lignes traitées avec succès
+        """
+        connection = connection or self.connection
+        if not connection or not data_list:
+            return 0
+
+        batch_size = batch_size or DB_BATCH_SIZE
+        sql = _sqlite_sql(sql_query)
+        cursor = connection.cursor()
+        rows_processed = 0
+        rejected = []
+
+        try:
+            for start in range(0, len(data_list), batch_size):
+                chunk = data_list[start:start + batch_size]
+                # Le point de sauvegarde doit être imbriqué dans une transaction :
+                # libéré au niveau le plus externe, il la validerait
+                if not connection.in_transaction:
+                    cursor.execute("BEGIN")
+                cursor.execute("SAVEPOINT lot")
+                try:
+                    cursor.executemany(sql, chunk)
+                    rows_processed += cursor.rowcount
+                except self.Error:
+                    cursor.execute("ROLLBACK TO lot")
+                    for offset, row in enumerate(chunk):
+                        try:
+                            cursor.execute(sql, row)
+                            rows_processed += cursor.rowcount
+                        except self.Error as e:
+                            rejected.append((start + offset, row, str(e)))
+                cursor.execute("RELEASE lot")
+                if commit:
+                    connection.commit()
+        finally:
+            cursor.close()
+
+        if rejected:
+            self._quarantine_rows(sql_query, rejected)
+            if rejected_rows is not None:
+                rejected_rows.extend(row for _, row, _ in rejected)
+
+        return rows_processed
+
+    def _identity_map(self, table_name, key, id_col, keys, connection):
+        """
+        Relit les IDs générés des clés naturelles données, par paquets de
+        IDENTITY_LOOKUP_SIZE clés (WHERE clé IN (...), servi par l'index
+        unique de la clé) : le coût suit la taille du lot, pas celle de la table.
+        """
+        keys = list(dict.fromkeys(keys))
+        id_map = {}
+        cursor = connection.cursor()
+        try:
+            for start in range(0, len(keys), IDENTITY_LOOKUP_SIZE):
+                chunk = keys[start:start + IDENTITY_LOOKUP_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor.execute(f"SELECT {key}, {id_col} FROM {table_name} "
+                               f"WHERE {key} IN ({placeholders})", chunk)
+                id_map.update(cursor.fetchall())
+            return id_map
+        finally:
+            cursor.close()
+
+    def _insert_with_identity(self, table_name, df, columns, id_col, connection=None,
+                              commit=True):
+        """
+        Insère un lot dans une table avec identité et récupère les IDs générés.
+        SQLite n'accepte pas RETURNING avec executemany : les IDs sont relus
+        en une requête après l'insertion.
+        """
+        connection = connection or self.connection
+        if not connection or df.empty:
+            return {}
+
+        rows = self._rows_for_binding(df, columns)
+        placeholders = ', '.join(f'?{i+1}' for i in range(len(columns)))
+        try:
+            connection.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            )
+            if commit:
+                connection.commit()
+            id_map = self._identity_map(table_name, columns[0], id_col,
+                                        (row[0] for row in rows), connection)
+            print(f"   → {len(id_map)} lignes insérées avec mapping des IDs")
+            return id_map
+        except self.Error as e:
+            print(f"❌ Erreur lors de l'insertion dans {table_name}: {e}")
+            connection.rollback()
+            if not commit:
+                raise
+            return {}
+
+    def _rows_for_binding(self, df, columns):
+        """
+        Prépare les lignes pour executemany (voir DatabaseManager._rows_for_binding).
+        SQLite conserve les réels tels quels, sans l'arrondi des NUMBER(p,s)
+        Oracle : les colonnes float32 du prétraitement sont liées par leur
+        écriture décimale la plus courte (0.483 et non 0.4830000102519989).
+        """
+        df = df[columns].copy()
+        for col in df.columns[df.dtypes == 'float32']:
+            df[col] = pd.to_numeric(df[col].astype(str))
+        return super()._rows_for_binding(df, columns)
+
+    def _ensure_staging_tables(self):
+        """L'upsert SQLite (ON CONFLICT) n'a pas besoin de tables de préparation."""
+        return self.connection is not None
+
+    def _store_identity(self, table_name, df, columns, id_col, state, connection):
+        """
+        Écrit des lignes dans une table avec identité et retourne la
+        correspondance clé naturelle → ID (INSERT, ou upsert puis relecture).
+        """
+        if not state['upsert']:
+            return self._insert_with_identity(table_name, df, columns, id_col,
+                                              connection=connection, commit=state['commit'])
+
+        if df.empty:
+            return {}
+
+        rows = self._rows_for_binding(df, columns)
+        merged = self._merge_rows(table_name, columns, rows, connection)
+        id_map = self._identity_map(table_name, columns[0], id_col,
+                                    (row[0] for row in rows), connection)
+        print(f"   → {merged} lignes fusionnées, {len(id_map)} IDs récupérés")
+        return id_map
+
+    def _merge_rows(self, table_name, columns, rows, connection):
+        """
+        Upsert par INSERT ... ON CONFLICT : les lignes existantes ne sont
+        réécrites que si une colonne a changé (IS NOT compare aussi les NULL).
+
+        Returns:
+            int: Nombre de lignes insérées ou mises à jour
+        """
+        if not rows:
+            return 0
+
+        keys = MERGE_KEYS[table_name]
+        updated = [col for col in columns if col not in keys]
+        placeholders = ', '.join(f':{i+1}' for i in range(len(columns)))
+        sql = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+               f"ON CONFLICT ({', '.join(keys)}) DO ")
+        if updated:
+            set_clause = ', '.join(f"{col} = excluded.{col}" for col in updated)
+            changed = ' OR '.join(f"{col} IS NOT excluded.{col}" for col in updated)
+            sql += f"UPDATE SET {set_clause} WHERE {changed}"
+        else:
+            sql += "NOTHING"
+        return self._execute_many(sql, rows, connection=connection)
+
+    def _existing_indexes(self, cursor):
+        """Retourne les noms des index gérés déjà créés."""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row[0] for row in cursor.fetchall()}
+
+    # La table d'extraction remplace la vue matérialisée Oracle. SQLite ne
+    # suit pas les écritures des tables sources : la table est supprimée avant
+    # chaque chargement, son existence valant fraîcheur.
+
+    def _drop_extract_view(self):
+        """Supprime la table d'extraction (les lectures refont la jointure)."""
+        self.connection.execute(f"DROP TABLE IF EXISTS {EXTRACT_VIEW}")
+        self.connection.commit()
+
+    def _extract_view_staleness(self, cursor):
+        """Retourne 'FRESH' si la table d'extraction existe, None sinon."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [EXTRACT_VIEW])
+        return 'FRESH' if cursor.fetchone() else None
+
+    def _create_extract_view(self, cursor):
+        """Crée la table d'extraction (vide, colonnes de la jointure) et son index."""
+        cursor.execute(_sqlite_sql(
+            f"CREATE TABLE {EXTRACT_VIEW} AS SELECT {XML_EXTRACT_COLUMNS} {XML_EXTRACT_FROM} WHERE 0"
+        ))
+        cursor.execute(CREATE_EXTRACT_VIEW_INDEX_SQL)
+
+    def _complete_refresh(self, cursor):
+        """
+        Remplit la table d'extraction à partir de la jointure. L'ordre
+        d'insertion n'est pas celui des lectures : elles trient (ORDER BY).
+        """
+        cursor.execute(f"DELETE FROM {EXTRACT_VIEW}")
+        cursor.execute(_sqlite_sql(
+            f"INSERT INTO {EXTRACT_VIEW} SELECT {XML_EXTRACT_COLUMNS} {XML_EXTRACT_FROM}"
+        ))
+        self.connection.commit()
+
+    def measure_index_effect(self, repeat=1):
+        """Index invisibles propres à Oracle : mesure indisponible avec SQLite."""
+        print("⚠️ SQLite : mesure de l'effet des index indisponible (index invisibles Oracle).")
+        return None
+
+    def iter_playlist_documents(self, doc_format='xml', chunk_size=None):
+        """
+        Génération des documents par le serveur, propre à Oracle
+        (SERVER_SIDE_DOCUMENTS = False) : l'appel échoue au lieu de ne rien
+        produire, ce qui donnerait un export vide présenté comme réussi.
+        """
+        raise NotImplementedError("SQLite : génération des documents côté serveur indisponible")
+
+    def _iter_extract_rows(self, connection, sql, parameters=None, arraysize=None):
+        """
+        Exécute une requête d'extraction et produit ses lignes une à une :
+        mêmes colonnes, même ordre et mêmes NULL convertis en '' qu'avec Oracle.
+        """
+        cursor = connection.cursor()
+        cursor.arraysize = arraysize or DB_FETCH_ARRAYSIZE
+        try:
+            cursor.execute(_sqlite_sql(sql), parameters or [])
+            cols = [col[0].lower() for col in cursor.description]
+
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    yield {col: '' if value is None else value for col, value in zip(cols, row)}
+        finally:
+            cursor.close()
+
+    def extract_partitioned(self, consumer, partitions=None, arraysize=None):
+        """
+        Extraction parallèle (voir DatabaseManager.extract_partitioned).
+
+        Une base en mémoire n'est visible que de sa propre connexion : les
+        connexions des threads y verraient une base vide. Elle n'est donc lue
+        qu'en une seule tranche, sur la connexion principale ; plusieurs
+        tranches sont refusées.
+        """
+        if self.db_path != ':memory:':
+            return super().extract_partitioned(consumer, partitions, arraysize)
+
+        if not self.connection:
+            print("❌ Pas de connexion active.")
+            return None
+
+        partitions = partitions or DB_EXTRACT_PARTITIONS
+        if partitions > 1:
+            print(f"❌ SQLite : extraction en {partitions} tranches impossible avec une base "
+                  "en mémoire (non partagée entre connexions) : utiliser partitions=1 "
+                  "ou un fichier SQLITE_PATH.")
+            return None
+
+        rows = self._iter_extract_rows(self.connection, self._extract_sql(), arraysize=arraysize)
+        return [consumer(0, rows)]
+
+    def _partition_bounds(self, partitions):
+        """Bornes des tranches de playlists (NTILE, disponible depuis SQLite 3.25)."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(_sqlite_sql(PARTITION_BOUNDS_SQL), [partitions])
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _fetch_frame_by_batches(self, sql, arraysize):
+        """Construit le DataFrame de l'extraction par paquets de arraysize lignes."""
+        chunks = pd.read_sql_query(_sqlite_sql(sql), self.connection, chunksize=arraysize)
+        frame = pd.concat(list(chunks), ignore_index=True)
+        frame.columns = [name.lower() for name in frame.columns]
+        return frame
+
+    def get_statistics(self, estimate=False, refresh=False):
+        """
+        Retourne le nombre de lignes de chaque table (voir
+        DatabaseManager.get_statistics). SQLite ne tient pas de nombre de
+        lignes estimé : le comptage est toujours exact.
+        """
+        return super().get_statistics(estimate=False, refresh=refresh)
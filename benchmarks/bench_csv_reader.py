@@ -0,0 +1,76 @@
+# Fichier : bench_csv_reader.py
+
+"""
+Benchmark : lecture du CSV Spotify sans schéma (pd.read_csv de toutes les
+colonnes, types inférés) contre la lecture typée read_spotify_csv
+(usecols, float32/entiers, catégories), moteurs 'c' et 'pyarrow'.
+
+Usage :
+    python -m benchmarks.bench_csv_reader [facteur1 facteur2 ...]
+
+Chaque facteur duplique le CSV fourni dans un fichier temporaire. Chaque
+mesure est faite dans un processus neuf pour que le pic mémoire (RSS) ne
+soit pas pollué par les mesures précédentes.
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from configs import CSV_FILE_PATH
+
+
+def _measure(variant, path):
+    """Lit le fichier selon la variante et retourne (durée, pic RSS ajouté, mémoire du DataFrame)."""
+    from services.data_processor import read_spotify_csv
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    if variant == 'sans schéma':
+        df = pd.read_csv(path, encoding='utf-8')
+    elif variant == 'typé (c)':
+        df = read_spotify_csv(path, engine='c')
+    else:
+        df = read_spotify_csv(path, engine='pyarrow')
+
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    frame_mb = df.memory_usage(deep=True).sum() / 1024**2
+
+    # ru_maxrss est exprimé en Ko sous Linux
+    return elapsed, (rss_after - rss_before) / 1024, frame_mb
+
+
+def run(factors):
+    source = pd.read_csv(CSV_FILE_PATH, encoding='utf-8')
+    variants = ['sans schéma', 'typé (c)', 'typé (pyarrow)']
+    context = multiprocessing.get_context('spawn')
+
+    print("="*78)
+    print("BENCHMARK : LECTURE DU CSV".center(78))
+    print("="*78)
+    print(f"{'Lignes':>10} | {'Variante':<15} | {'Durée':>9} | {'Pic RSS':>10} | {'DataFrame':>10}")
+    print("-"*78)
+
+    for factor in factors:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'spotify_scaled.csv')
+            pd.concat([source] * factor, ignore_index=True).to_csv(path, index=False)
+
+            for variant in variants:
+                with context.Pool(1) as pool:
+                    elapsed, peak_mb, frame_mb = pool.apply(_measure, (variant, path))
+                print(f"{len(source) * factor:>10} | {variant:<15} | {elapsed:>7.3f} s | "
+                      f"{peak_mb:>7.1f} Mo | {frame_mb:>7.1f} Mo")
+        print("-"*78)
+
+
+if __name__ == "__main__":
+    factors = [int(arg) for arg in sys.argv[1:]] or [10, 100]
+    run(factors)
@@ -0,0 +1,76 @@
+# Fichier : bench_extract_artists.py
+
+"""
+Benchmark : extraction des artistes ligne par ligne (extract_artists + apply)
+contre la version vectorisée (extract_artists_vectorized).
+
+Usage :
+    python -m benchmarks.bench_extract_artists [facteur1 facteur2 ...]
+
+Chaque facteur duplique le CSV fourni pour simuler un fichier plus volumineux.
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from configs import CSV_FILE_PATH
+from services.data_processor import extract_artists, extract_artists_vectorized
+
+
+def legacy_extraction(artist_series, album_artist_series):
+    """Reproduit l'ancien chemin : apply par ligne, double appel pour les albums."""
+    all_artists = set()
+    for artists_list in artist_series.apply(extract_artists):
+        all_artists.update(artists_list)
+    all_artists.discard('')
+
+    main_artist = album_artist_series.apply(
+        lambda x: extract_artists(x)[0] if extract_artists(x) else None
+    )
+    return sorted(all_artists), main_artist
+
+
+def vectorized_extraction(artist_series, album_artist_series):
+    """Nouveau chemin : opérations de chaînes pandas vectorisées."""
+    unique_artists, _ = extract_artists_vectorized(artist_series)
+    _, main_artist = extract_artists_vectorized(album_artist_series)
+    return unique_artists, main_artist
+
+
+def timed(func, *args):
+    """Exécute func et retourne (résultat, durée en secondes)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(factors):
+    df = pd.read_csv(CSV_FILE_PATH, usecols=['track_artist', 'track_album_id'])
+
+    print("="*70)
+    print("BENCHMARK : EXTRACTION DES ARTISTES".center(70))
+    print("="*70)
+    print(f"{'Lignes':>10} | {'Ligne à ligne':>14} | {'Vectorisé':>10} | {'Gain':>6}")
+    print("-"*70)
+
+    for factor in factors:
+        big = pd.concat([df] * factor, ignore_index=True)
+        albums = big.drop_duplicates(subset=['track_album_id'])
+
+        legacy, legacy_time = timed(legacy_extraction, big['track_artist'], albums['track_artist'])
+        vector, vector_time = timed(vectorized_extraction, big['track_artist'], albums['track_artist'])
+
+        # Les deux chemins doivent produire exactement le même résultat
+        assert legacy[0] == vector[0], "Ensembles d'artistes différents"
+        assert legacy[1].tolist() == vector[1].tolist(), "Artistes principaux différents"
+
+        print(f"{len(big):>10} | {legacy_time:>12.3f} s | {vector_time:>8.3f} s | {legacy_time / vector_time:>5.1f}x")
+
+    print("="*70)
+
+
+if __name__ == "__main__":
+    factors = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    run(factors)
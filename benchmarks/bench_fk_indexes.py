@@ -0,0 +1,50 @@
+# Fichier : bench_fk_indexes.py
+
+"""
+Benchmark : durée de l'extraction XML (jointure des huit tables) sans puis
+avec les index secondaires des clés étrangères (SECONDARY_INDEXES).
+
+Usage :
+    python -m benchmarks.bench_fk_indexes [répétitions]
+
+Nécessite une base Oracle déjà chargée (python main.py --full-reset). Les
+index gérés sont rendus invisibles à l'optimiseur le temps de la première
+mesure, puis de nouveau visibles : à lancer hors période d'activité.
+"""
+
+import sys
+
+from DB.db_manager import DatabaseManager
+from DB.db_schema import SECONDARY_INDEXES
+
+
+def run(repeat):
+    db_manager = DatabaseManager()
+    if not db_manager.connect():
+        return
+
+    try:
+        results = db_manager.measure_index_effect(repeat=repeat)
+    finally:
+        db_manager.close()
+
+    if not results:
+        return
+
+    print("="*70)
+    print("BENCHMARK : INDEX DES CLÉS ÉTRANGÈRES".center(70))
+    print("="*70)
+    for name, (table, columns) in SECONDARY_INDEXES.items():
+        print(f"  • {name:<30} {table}({', '.join(columns)})")
+    print("-"*70)
+    print(f"{'Lignes':>10} | {'Sans index':>12} | {'Avec index':>12} | {'Gain':>6}")
+    print("-"*70)
+    print(f"{results['lignes']:>10} | {results['sans index']:>10.3f} s | "
+          f"{results['avec index']:>10.3f} s | "
+          f"{results['sans index'] / results['avec index']:>5.2f}x")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    run(repeat)
@@ -0,0 +1,72 @@
+# Fichier : bench_normalization.py
+
+"""
+Benchmark : normalisation du CSV brut en huit tables (normalize_dataframe).
+
+Usage :
+    python -m benchmarks.bench_normalization [facteur1 facteur2 ...]
+
+Chaque facteur réplique le CSV fourni en rendant les identifiants (pistes,
+albums, playlists) distincts d'une réplique à l'autre, pour que le volume
+des tables normalisées croisse avec le fichier. La durée et le pic
+d'allocations Python/NumPy (tracemalloc) sont mesurés sur la seule étape de
+normalisation, hors lecture du fichier (meilleure de trois exécutions).
+"""
+
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from services.data_processor import _prepare_raw, normalize_dataframe, read_spotify_csv
+
+
+def scaled_raw_frame(factor):
+    """Construit un DataFrame brut répliqué factor fois avec des identifiants distincts."""
+    source = read_spotify_csv()
+    big = pd.concat([source] * factor, ignore_index=True)
+    replica = pd.Series(np.repeat(np.arange(factor), len(source)).astype(str))
+    for col in ['track_id', 'track_album_id', 'playlist_id']:
+        big[col] = big[col] + '_' + replica
+    return _prepare_raw(big, verbose=False)
+
+
+def measure(df_raw, repeat=3, **options):
+    """
+    Retourne (meilleure durée en secondes, pic d'allocations en Mo) d'une
+    normalisation. Le pic est mesuré lors d'une exécution séparée, car
+    tracemalloc ralentit fortement le code mesuré.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        normalize_dataframe(df_raw, verbose=False, **options)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    normalize_dataframe(df_raw, verbose=False, **options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak / 1024**2
+
+
+def run(factors):
+    print("="*60)
+    print("BENCHMARK : NORMALISATION DES TABLES".center(60))
+    print("="*60)
+    print(f"{'Lignes':>10} | {'Durée':>10} | {'Pic allocations':>16}")
+    print("-"*60)
+
+    for factor in factors:
+        df_raw = scaled_raw_frame(factor)
+        elapsed, peak_mb = measure(df_raw)
+        print(f"{len(df_raw):>10} | {elapsed:>8.3f} s | {peak_mb:>13.1f} Mo")
+
+    print("="*60)
+
+
+if __name__ == "__main__":
+    factors = [int(arg) for arg in sys.argv[1:]] or [10, 100]
+    run(factors)
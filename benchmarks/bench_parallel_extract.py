@@ -0,0 +1,65 @@
+# Fichier : bench_parallel_extract.py
+
+"""
+Benchmark : durée de l'extraction XML en série (iter_data_for_xml) puis en
+N tranches de playlists lues en parallèle (extract_partitioned), une
+connexion par tranche.
+
+Usage :
+    python -m benchmarks.bench_parallel_extract [tranches...]
+
+Exemple :
+    DB_POOL_ENABLED=1 DB_POOL_MAX=8 python -m benchmarks.bench_parallel_extract 2 4 8
+
+Nécessite une base déjà chargée (python main.py --full-reset), Oracle ou
+SQLite selon DB_BACKEND.
+"""
+
+import sys
+import time
+
+from DB.db_manager import DatabaseManager
+from main import new_database_manager
+
+
+def count_rows(index, rows):
+    """Consommateur d'une tranche : parcourt les lignes et les compte."""
+    return sum(1 for _ in rows)
+
+
+def run(partition_counts):
+    db_manager = new_database_manager()
+    if not db_manager.connect():
+        return
+
+    results = []
+    try:
+        start = time.perf_counter()
+        rows = sum(1 for _ in db_manager.iter_data_for_xml())
+        results.append((1, rows, time.perf_counter() - start))
+
+        for partitions in partition_counts:
+            start = time.perf_counter()
+            counts = db_manager.extract_partitioned(count_rows, partitions=partitions)
+            if counts is None:
+                return
+            results.append((len(counts), sum(counts), time.perf_counter() - start))
+    finally:
+        db_manager.close()
+        DatabaseManager.close_pool()
+
+    serial_time = results[0][2]
+    print("="*70)
+    print("BENCHMARK : EXTRACTION PARALLÈLE PAR TRANCHES".center(70))
+    print("="*70)
+    print(f"{'Tranches':>10} | {'Lignes':>10} | {'Durée':>10} | {'Gain':>6}")
+    print("-"*70)
+    for partitions, rows, elapsed in results:
+        print(f"{partitions:>10} | {rows:>10} | {elapsed:>8.3f} s | "
+              f"{serial_time / max(elapsed, 1e-9):>5.2f}x")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    partition_counts = [int(arg) for arg in sys.argv[1:]] or [2, 4]
+    run(partition_counts)
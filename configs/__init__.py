@@ -2,7 +2,27 @@ from .config import (
     DB_USER,
     DB_PASSWORD,
     DB_DSN,
+    DB_POOL_ENABLED,
+    DB_POOL_MIN,
+    DB_POOL_MAX,
+    DB_POOL_INCREMENT,
+    DB_BACKEND,
+    SQLITE_PATH,
     CSV_FILE_PATH,
+    CSV_CHUNK_SIZE,
+    CSV_WORKERS,
+    CSV_ENGINE,
+    CACHE_DIR,
+    USE_TABLE_CACHE,
+    DELTA_SNAPSHOT_DIR,
+    DB_STORAGE_PROFILE,
+    DB_BATCH_SIZE,
+    DB_LOAD_WORKERS,
+    QUARANTINE_DIR,
+    DB_FETCH_ARRAYSIZE,
+    DB_DOCUMENT_CHUNK_SIZE,
+    DB_EXTRACT_VIEW,
+    DB_EXTRACT_PARTITIONS,
     XML_OUTPUT_PATH,
     DTD_PATH,
     DTD_DOCUMENTATION_PATH,
@@ -7,6 +7,19 @@ DB_USER = os.environ.get("DB_USER", "spotify_user")
 DB_PASSWORD = os.environ.get("DB_PASSWORD", "spotify123")
 DB_DSN = os.environ.get("DB_DSN", "localhost:1521/XEPDB1")
 
+# --- Pool de sessions Oracle (optionnel) ---
+# Si activé, les connexions sont empruntées à un pool partagé par le processus
+DB_POOL_ENABLED = os.environ.get("DB_POOL_ENABLED", "0") == "1"
+DB_POOL_MIN = int(os.environ.get("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.environ.get("DB_POOL_MAX", "8"))
+DB_POOL_INCREMENT = int(os.environ.get("DB_POOL_INCREMENT", "1"))
+
+# --- Moteur de stockage relationnel ---
+# "oracle" (défaut) ou "sqlite" (base locale, sans serveur : tests et benchmarks)
+DB_BACKEND = os.environ.get("DB_BACKEND", "oracle")
+# Fichier de la base SQLite (":memory:" pour une base en mémoire)
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "./data/spotify.db")
+
 # --- Configuration MongoDB ---
 MONGO_HOST = os.environ.get("MONGO_HOST", "localhost")
 MONGO_PORT = int(os.environ.get("MONGO_PORT", "27017"))
@@ -14,7 +27,52 @@ MONGO_DATABASE = os.environ.get("MONGO_DATABASE", "spotify_db")
 MONGO_COLLECTION = os.environ.get("MONGO_COLLECTION", "playlists")
 
 # --- Fichier de Données ---
-CSV_FILE_PATH = "./data/input/high_popularity_spotify_data.csv"
+# Fichier CSV, répertoire de CSV ou motif glob (ex. "./data/input/*_spotify_data.csv")
+CSV_FILE_PATH = os.environ.get("CSV_FILE_PATH", "./data/input/high_popularity_spotify_data.csv")
+# Nombre de processus pour normaliser plusieurs fichiers (0 = nombre de cœurs)
+CSV_WORKERS = int(os.environ.get("CSV_WORKERS", "0"))
+# Nombre de lignes lues par bloc en mode flux (--stream)
+CSV_CHUNK_SIZE = int(os.environ.get("CSV_CHUNK_SIZE", "50000"))
+# Moteur de lecture CSV : "c" (défaut) ou "pyarrow" (optionnel, plus rapide)
+CSV_ENGINE = os.environ.get("CSV_ENGINE", "c")
+
+# --- Cache des tables normalisées (Feather, nécessite pyarrow) ---
+CACHE_DIR = os.environ.get("CACHE_DIR", "./data/cache")
+# "1" = activé, "0" = désactivé ; non défini (None) : activé seulement si
+# pyarrow est installé, sans avertissement sinon
+USE_TABLE_CACHE = os.environ.get("USE_TABLE_CACHE")
+if USE_TABLE_CACHE is not None:
+    USE_TABLE_CACHE = USE_TABLE_CACHE == "1"
+
+# --- Ingestion incrémentale (empreintes de la dernière exécution réussie) ---
+DELTA_SNAPSHOT_DIR = os.environ.get("DELTA_SNAPSHOT_DIR", "./data/snapshot")
+
+# --- Stockage physique du schéma ---
+# Profil appliqué par initialize_db : "standard" (tables heap) ou "compact"
+# (tables organisées en index, compression, partitionnement ; voir DB/db_schema.py)
+DB_STORAGE_PROFILE = os.environ.get("DB_STORAGE_PROFILE", "standard")
+
+# --- Insertion par lots (executemany) ---
+# Nombre de lignes envoyées et validées (commit) par lot
+DB_BATCH_SIZE = int(os.environ.get("DB_BATCH_SIZE", "10000"))
+# Nombre de tables chargées en parallèle, sur des connexions séparées (1 = séquentiel)
+DB_LOAD_WORKERS = int(os.environ.get("DB_LOAD_WORKERS", "1"))
+# Répertoire des lignes rejetées par Oracle (un fichier JSON Lines par table)
+QUARANTINE_DIR = os.environ.get("QUARANTINE_DIR", "./data/quarantine")
+
+# --- Extraction (lecture en flux) ---
+# Nombre de lignes rapatriées par aller-retour (arraysize et prefetchrows)
+DB_FETCH_ARRAYSIZE = int(os.environ.get("DB_FETCH_ARRAYSIZE", "5000"))
+# Nombre de documents (un par playlist) rapatriés par paquet en génération côté serveur
+DB_DOCUMENT_CHUNK_SIZE = int(os.environ.get("DB_DOCUMENT_CHUNK_SIZE", "100"))
+# Vue matérialisée de l'extraction (1 = activée), rafraîchie en fin de
+# chargement et lue par les exports tant qu'elle est à jour. Désactivée par
+# défaut : chaque chargement recalcule alors toute la jointure, ce qui n'est
+# rentable que si l'on exporte plusieurs fois entre deux chargements
+DB_EXTRACT_VIEW = os.environ.get("DB_EXTRACT_VIEW", "0") == "1"
+# Nombre de tranches de playlists lues en parallèle, une connexion chacune (1 = en série)
+DB_EXTRACT_PARTITIONS = int(os.environ.get("DB_EXTRACT_PARTITIONS", "1"))
+
 XML_OUTPUT_PATH = "./data/output/spotify_data_export.xml"
 
 # --- Fichiers DTD ---
@@ -18,9 +18,16 @@ from pathlib import Path
 
 # Imports des modules du projet
 from DB.db_manager import DatabaseManager
+from DB.sqlite_manager import SQLiteDatabaseManager
 from DB.mongodb_manager import MongoDBManager
-from services.data_processor import preprocess_csv
-from services.xml_exporter import export_to_xml, validate_xml_structure
+from services.data_processor import preprocess_csv, preprocess_csv_chunks
+from services.delta_snapshot import (
+    load_snapshot, save_snapshot, build_snapshot, compute_delta, print_delta_summary,
+    restore_rejected_rows
+)
+from services.xml_exporter import (
+    export_to_xml_stream, export_to_xml_documents, export_to_xml_partitioned, validate_xml_structure
+)
 from services.dtd_validator import validate_xml_with_dtd
 from services.dtd_creator import create_spotify_dtd, generate_dtd_documentation
 from services.xslt_transformer import transform_to_html
@@ -31,9 +38,22 @@ from services.json_converter import convert_xml_to_json
 # Imports de configuration
 from configs.config import (
     XML_OUTPUT_PATH, XSD_PATH, XSLT_JSON_PATH, JSON_OUTPUT_PATH,
-    MONGO_HOST, MONGO_PORT, MONGO_DATABASE
+    MONGO_HOST, MONGO_PORT, MONGO_DATABASE, DB_BACKEND, DB_EXTRACT_PARTITIONS
 )
 
+# Gestionnaire de base relationnelle par moteur (DB_BACKEND)
+DATABASE_BACKENDS = {
+    'oracle': DatabaseManager,
+    'sqlite': SQLiteDatabaseManager
+}
+
+
+def new_database_manager():
+    """Crée le gestionnaire de base du moteur configuré (DB_BACKEND, Oracle par défaut)."""
+    if DB_BACKEND not in DATABASE_BACKENDS:
+        print(f"⚠️ Moteur de base inconnu '{DB_BACKEND}' : Oracle utilisé.")
+    return DATABASE_BACKENDS.get(DB_BACKEND, DatabaseManager)()
+
 
 def print_banner(text, char="="):
     """Affiche un bandeau décoratif."""
@@ -43,13 +63,48 @@ def print_banner(text, char="="):
     print(char * width + "\n")
 
 
-def run_ingestion_process(initialize=False, drop_first=False):
+def export_xml_from_db(db_manager, totals, server_side=False, partitions=None):
+    """
+    Exporte la base vers XML en flux.
+
+    Args:
+        db_manager: DatabaseManager connecté
+        totals: Tuple (nombre de playlists, nombre de lignes)
+        server_side: Si True, les éléments <playlist> sont construits par Oracle
+                     (export par lignes si le moteur ne sait pas les construire)
+        partitions: Nombre de tranches extraites en parallèle (défaut : DB_EXTRACT_PARTITIONS)
+
+    Returns:
+        str: Chemin du fichier XML généré (None en cas d'échec)
+    """
+    partitions = partitions or DB_EXTRACT_PARTITIONS
+    if server_side and not db_manager.SERVER_SIDE_DOCUMENTS:
+        print("⚠️  Documents côté serveur indisponibles avec ce moteur : export par lignes.")
+        server_side = False
+    if server_side:
+        return export_to_xml_documents(db_manager.iter_playlist_documents('xml'), totals)
+    if partitions > 1:
+        return export_to_xml_partitioned(db_manager.extract_partitioned, totals, partitions=partitions)
+    return export_to_xml_stream(db_manager.iter_data_for_xml(), totals)
+
+
+def run_ingestion_process(initialize=False, drop_first=False, stream=False, chunk_size=None,
+                          use_cache=None, delta=False, upsert=False, bulk=False,
+                          server_side=False, partitions=None):
     """
     Orchestre le processus complet de lecture CSV, initialisation BD et insertion.
     
     Args:
         initialize: Si True, initialise/crée les tables de la BD
         drop_first: Si True, supprime d'abord les tables existantes
+        stream: Si True, lit le CSV par blocs et insère lot par lot (mémoire bornée)
+        chunk_size: Nombre de lignes par bloc en mode flux (défaut : CSV_CHUNK_SIZE)
+        use_cache: Si False, ignore le cache des tables normalisées (défaut : USE_TABLE_CACHE)
+        delta: Si True, n'applique que les différences avec la dernière exécution réussie
+        upsert: Si True, fusionne (MERGE) les données dans un schéma déjà rempli
+        bulk: Si True (avec drop_first), chargement direct sans FK ni index pendant l'insertion
+        server_side: Si True, l'export XML utilise les documents construits par Oracle
+        partitions: Nombre de tranches extraites en parallèle pour l'export XML
         
     Returns:
         bool: True si le processus s'est terminé avec succès
@@ -63,8 +118,23 @@ def run_ingestion_process(initialize=False, drop_first=False):
     print_banner("ÉTAPE 1 : EXTRACTION ET NORMALISATION CSV", "-")
     
     try:
-        data_to_insert = preprocess_csv()
+        if stream:
+            # Les lots sont normalisés à la demande pendant l'insertion
+            data_to_insert = preprocess_csv_chunks(chunksize=chunk_size)
+            print("✅ Lecture en flux préparée : normalisation bloc par bloc.\n")
+        else:
+            data_to_insert = preprocess_csv(use_cache=use_cache)
         
+    except FileNotFoundError as e:
+        print(f"❌ Fichier CSV introuvable : {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Erreur lors du prétraitement CSV : {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    if not stream:
         # Vérifier que le dictionnaire contient des DataFrames valides
         if not data_to_insert or 'sp_genres' not in data_to_insert:
             print("❌ Erreur : Aucune donnée n'a été extraite du CSV.")
@@ -76,22 +146,29 @@ def run_ingestion_process(initialize=False, drop_first=False):
             return False
         
         print("✅ Données CSV extraites et normalisées avec succès.\n")
-        
-    except FileNotFoundError as e:
-        print(f"❌ Fichier CSV introuvable : {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Erreur lors du prétraitement CSV : {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+
+    # Calcul du delta par rapport au snapshot de la dernière exécution réussie
+    delta_data = None
+    if bulk and not drop_first:
+        print("ℹ️  Mode bulk ignoré (réservé aux rechargements complets --full-reset).\n")
+        bulk = False
+
+    if delta and (stream or drop_first):
+        print("ℹ️  Mode incrémental ignoré (incompatible avec --stream et --full-reset).\n")
+    elif delta:
+        previous_snapshot = load_snapshot()
+        if previous_snapshot is None:
+            print("ℹ️  Aucun snapshot précédent : chargement complet.\n")
+        else:
+            delta_data, new_snapshot = compute_delta(data_to_insert, previous_snapshot)
+            print_delta_summary(delta_data)
     
     # ==============================================
     # ÉTAPE 2 : CONNEXION À LA BASE DE DONNÉES
     # ==============================================
     print_banner("ÉTAPE 2 : CONNEXION À ORACLE", "-")
     
-    db_manager = DatabaseManager()
+    db_manager = new_database_manager()
     
     if not db_manager.connect():
         print("❌ Impossible de se connecter à la base de données.")
@@ -121,13 +198,25 @@ def run_ingestion_process(initialize=False, drop_first=False):
         # ==============================================
         print_banner("ÉTAPE 4 : INSERTION DES DONNÉES", "-")
         
-        success = db_manager.insert_data(data_to_insert)
+        rejected = {}
+        if delta_data is not None:
+            success = db_manager.apply_delta(delta_data, rejected=rejected)
+        else:
+            success = db_manager.insert_data(data_to_insert, upsert=upsert, bulk=bulk)
         
         if not success:
             print("❌ Erreur lors de l'insertion des données.")
             return False
         
         print("✅ Toutes les données ont été insérées avec succès.\n")
+
+        # Snapshot de référence pour la prochaine ingestion incrémentale
+        if not stream:
+            if delta_data is not None:
+                # Les lignes non appliquées seront reprises au prochain delta
+                save_snapshot(restore_rejected_rows(new_snapshot, previous_snapshot, rejected))
+            else:
+                save_snapshot(build_snapshot(data_to_insert))
         
         # ==============================================
         # ÉTAPE 5 : VÉRIFICATION DES STATISTIQUES
@@ -149,16 +238,17 @@ def run_ingestion_process(initialize=False, drop_first=False):
         # ==============================================
         print_banner("ÉTAPE 6 : EXTRACTION POUR XML", "-")
         
-        xml_data = db_manager.fetch_data_for_xml()
+        # Extraction en flux : seules les pistes de la playlist en cours sont en mémoire
+        totals = db_manager.count_data_for_xml()
         
-        if not xml_data:
+        if not totals or not totals[1]:
             print("⚠️  Aucune donnée à exporter vers XML.")
         else:
-            print(f"✅ {len(xml_data)} enregistrements prêts pour l'export XML.\n")
+            print(f"✅ {totals[1]} enregistrements prêts pour l'export XML.\n")
            
             # Décommenter quand les modules seront créés :
             print("🔄 Génération du fichier XML...")
-            xml_file = export_to_xml(xml_data)
+            xml_file = export_xml_from_db(db_manager, totals, server_side, partitions)
 
             # Générer la DTD avant tout
             dtd_file = create_spotify_dtd()
@@ -200,30 +290,34 @@ def run_ingestion_process(initialize=False, drop_first=False):
         db_manager.close()
 
 
-def run_xml_export_only():
+def run_xml_export_only(server_side=False, partitions=None):
     """
     Exporte uniquement les données existantes de la BD vers XML.
     Utile si les données sont déjà en base.
+
+    Args:
+        server_side: Si True, les éléments <playlist> sont construits par Oracle
+        partitions: Nombre de tranches extraites en parallèle (défaut : DB_EXTRACT_PARTITIONS)
     """
     print_banner("🎵 EXPORT XML DEPUIS LA BASE 🎵")
     
-    db_manager = DatabaseManager()
+    db_manager = new_database_manager()
     
     if not db_manager.connect():
         print("❌ Impossible de se connecter à la base de données.")
         return False
     
     try:
-        xml_data = db_manager.fetch_data_for_xml()
+        totals = db_manager.count_data_for_xml()
         
-        if not xml_data:
+        if not totals or not totals[1]:
             print("❌ Aucune donnée trouvée en base.")
             return False
         
-        print(f"✅ {len(xml_data)} enregistrements prêts pour l'export XML.\n")
+        print(f"✅ {totals[1]} enregistrements prêts pour l'export XML.\n")
         print_banner("ÉTAPE 7 : EXPORT VERS XML", "-")
         
-        xml_file = export_to_xml(xml_data)
+        xml_file = export_xml_from_db(db_manager, totals, server_side, partitions)
         
         if xml_file:
             print(f"\n✅ Export XML terminé avec succès !")
@@ -251,14 +345,14 @@ def test_connection():
     """Teste uniquement la connexion à la base de données."""
     print_banner("🔌 TEST DE CONNEXION ORACLE 🔌")
 
-    db_manager = DatabaseManager()
+    db_manager = new_database_manager()
 
     if db_manager.connect():
         print("✅ Connexion réussie !")
 
-        # Test de requête simple
+        # Test de requête simple (estimations du dictionnaire : pas de parcours des tables)
         try:
-            stats = db_manager.get_statistics()
+            stats = db_manager.get_statistics(estimate=True)
             if stats:
                 print("\n📊 Tables détectées :")
                 for table, count in stats.items():
@@ -438,6 +532,65 @@ def run_mongodb_pipeline():
         return False
 
 
+def run_mongodb_from_oracle():
+    """
+    Alimente MongoDB directement depuis Oracle : les playlists sont
+    construites en JSON par Oracle (JSON_OBJECT/JSON_ARRAYAGG) et insérées
+    par paquets, sans passer par le fichier XML ni la XSLT.
+
+    Returns:
+        bool: True si le processus s'est terminé avec succès
+    """
+    print_banner("🍃 PIPELINE ORACLE → JSON → MONGODB 🍃")
+
+    db_manager = new_database_manager()
+    if not db_manager.SERVER_SIDE_DOCUMENTS:
+        print("❌ Documents JSON côté serveur indisponibles avec ce moteur.")
+        print("💡 Utilisez le pipeline par fichier XML : python main.py --mongodb-pipeline")
+        return False
+
+    if not db_manager.connect():
+        print("❌ Impossible de se connecter à la base de données.")
+        return False
+
+    mongo_manager = MongoDBManager(
+        host=MONGO_HOST,
+        port=MONGO_PORT,
+        database=MONGO_DATABASE
+    )
+
+    try:
+        if not mongo_manager.connect():
+            print("❌ Impossible de se connecter à MongoDB")
+            print(f"💡 Vérifiez que MongoDB est démarré sur {MONGO_HOST}:{MONGO_PORT}")
+            return False
+
+        print("✅ Connexions Oracle et MongoDB établies.\n")
+        print_banner("INSERTION DES DOCUMENTS GÉNÉRÉS PAR ORACLE", "-")
+
+        success, count = mongo_manager.insert_playlist_documents(
+            db_manager.iter_playlist_documents('json'),
+            clear_first=True
+        )
+
+        if not success:
+            print("❌ Échec de l'insertion dans MongoDB")
+            return False
+
+        print_banner("✅ PIPELINE MONGODB TERMINÉ AVEC SUCCÈS ✅")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ ERREUR CRITIQUE : {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        mongo_manager.close()
+        db_manager.close()
+
+
 def test_mongodb_connection():
     """Teste uniquement la connexion à MongoDB."""
     print_banner("🔌 TEST DE CONNEXION MONGODB 🔌")
@@ -493,17 +646,44 @@ Exemples d'utilisation :
   # Insertion seule (tables déjà créées)
   python main.py
 
+  # Ingestion en flux par blocs (gros fichiers CSV)
+  python main.py --full-reset --stream --chunk-size 100000
+
+  # Ingestion en renormalisant le CSV (sans le cache des tables)
+  python main.py --full-reset --no-cache
+
+  # Ingestion incrémentale (seules les lignes ajoutées/modifiées/supprimées)
+  python main.py --delta
+
+  # Réingestion rejouable sur un schéma déjà rempli (staging + MERGE)
+  python main.py --upsert
+
+  # Rechargement complet en chargement direct (FK et index rétablis à la fin)
+  python main.py --full-reset --bulk
+
   # Export XML uniquement
   python main.py --export-xml
 
+  # Export XML avec les documents construits par Oracle (XMLAGG)
+  python main.py --export-xml --server-side
+
+  # Export XML en 4 tranches lues en parallèle (4 connexions, pool conseillé)
+  DB_POOL_ENABLED=1 python main.py --export-xml --partitions 4
+
   # Test de connexion Oracle
   python main.py --test-connection
 
+  # Pipeline complet sur une base SQLite locale (sans serveur Oracle)
+  DB_BACKEND=sqlite python main.py --full-reset
+
   PIPELINE 2 : XML → XSD → JSON → MongoDB
   ==========================================
   # Pipeline MongoDB complet
   python main.py --mongodb-pipeline
 
+  # MongoDB alimenté directement par Oracle (JSON_ARRAYAGG, sans XML)
+  python main.py --mongodb-pipeline --server-side
+
   # Test de connexion MongoDB
   python main.py --test-mongodb
         """
@@ -521,12 +701,62 @@ Exemples d'utilisation :
         help='Crée les tables si elles n\'existent pas (sans suppression)'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Lit le CSV par blocs et insère lot par lot (mémoire bornée)'
+    )
+
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Nombre de lignes CSV par bloc en mode --stream'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Renormalise le CSV sans utiliser le cache des tables normalisées'
+    )
+    
+    parser.add_argument(
+        '--delta',
+        action='store_true',
+        help='Applique uniquement les différences avec la dernière ingestion réussie'
+    )
+    
+    parser.add_argument(
+        '--upsert',
+        action='store_true',
+        help='Fusionne (MERGE) les données au lieu de les insérer (schéma déjà rempli)'
+    )
+    
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Avec --full-reset : chargement direct (APPEND_VALUES), FK et index rétablis à la fin'
+    )
+    
     parser.add_argument(
         '--export-xml',
         action='store_true',
         help='Exporte uniquement les données vers XML (sans insertion)'
     )
     
+    parser.add_argument(
+        '--server-side',
+        action='store_true',
+        help='Fait construire les documents XML/JSON par Oracle (un document par playlist)'
+    )
+
+    parser.add_argument(
+        '--partitions',
+        type=int,
+        default=None,
+        help='Export XML en N tranches de playlists lues en parallèle (défaut : DB_EXTRACT_PARTITIONS)'
+    )
+    
     parser.add_argument(
         '--test-connection',
         action='store_true',
@@ -553,16 +783,37 @@ Exemples d'utilisation :
     elif args.test_mongodb:
         success = test_mongodb_connection()
     elif args.mongodb_pipeline:
-        success = run_mongodb_pipeline()
+        if args.server_side:
+            success = run_mongodb_from_oracle()
+        else:
+            success = run_mongodb_pipeline()
     elif args.export_xml:
-        success = run_xml_export_only()
+        success = run_xml_export_only(server_side=args.server_side, partitions=args.partitions)
     elif args.full_reset:
-        success = run_ingestion_process(initialize=True, drop_first=True)
+        success = run_ingestion_process(initialize=True, drop_first=True,
+                                        stream=args.stream, chunk_size=args.chunk_size,
+                                        use_cache=False if args.no_cache else None, delta=args.delta,
+                                        upsert=args.upsert, bulk=args.bulk,
+                                        server_side=args.server_side,
+                                        partitions=args.partitions)
     elif args.initialize:
-        success = run_ingestion_process(initialize=True, drop_first=False)
+        success = run_ingestion_process(initialize=True, drop_first=False,
+                                        stream=args.stream, chunk_size=args.chunk_size,
+                                        use_cache=False if args.no_cache else None, delta=args.delta,
+                                        upsert=args.upsert, bulk=args.bulk,
+                                        server_side=args.server_side,
+                                        partitions=args.partitions)
     else:
         # Mode par défaut : insertion seule (tables déjà créées)
-        success = run_ingestion_process(initialize=False, drop_first=False)
+        success = run_ingestion_process(initialize=False, drop_first=False,
+                                        stream=args.stream, chunk_size=args.chunk_size,
+                                        use_cache=False if args.no_cache else None, delta=args.delta,
+                                        upsert=args.upsert, bulk=args.bulk,
+                                        server_side=args.server_side,
+                                        partitions=args.partitions)
+    
+    # Fermeture du pool de sessions Oracle (si DB_POOL_ENABLED)
+    DatabaseManager.close_pool()
     
     # Code de sortie
     sys.exit(0 if success else 1)
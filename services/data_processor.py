@@ -1,10 +1,19 @@
 # Fichier : data_processor.py
 
+import glob
+import os
+import numpy as np
 import pandas as pd
 import re
 import sys
-from datetime import datetime
-from configs import CSV_FILE_PATH
+from concurrent.futures import ProcessPoolExecutor
+from configs import CSV_FILE_PATH, CSV_CHUNK_SIZE, CSV_ENGINE, CSV_WORKERS, USE_TABLE_CACHE
+from services.table_cache import (FEATHER_AVAILABLE, compute_cache_key, load_cached_tables,
+                                  save_cached_tables)
+
+# Version du code de normalisation : à incrémenter à chaque changement du
+# contenu ou du format des tables produites (invalide le cache des tables)
+NORMALIZATION_VERSION = 4
 
 def extract_artists(artist_string):
     """
@@ -25,257 +34,799 @@ def extract_artists(artist_string):
     return [a for a in artists if a]
 
 
+def extract_artists_vectorized(artist_series):
+    """
+    Version vectorisée de extract_artists appliquée à une colonne entière.
+
+    Les chaînes distinctes sont d'abord factorisées, puis un seul passage
+    d'opérations de chaînes pandas (replace/split/explode/strip/lower) sur ces
+    valeurs distinctes produit à la fois l'ensemble des artistes et l'artiste
+    principal (premier artiste non vide) de chaque ligne.
+
+    Args:
+        artist_series: Série de chaînes d'artistes séparés par des virgules
+
+    Returns:
+        tuple: (liste triée des artistes uniques,
+                Série de l'artiste principal alignée sur l'index d'entrée, None si aucun)
+    """
+    codes, uniques = pd.factorize(artist_series)
+
+    exploded = (
+        pd.Series(uniques, dtype=object)
+        .astype(str)
+        .str.replace(r'["\']', '', regex=True)
+        .str.lower()
+        .str.split(',')
+        .explode()
+        .str.strip()
+    )
+    exploded = exploded[exploded.notna() & (exploded != '')]
+
+    unique_artists = sorted(exploded.unique())
+
+    # Premier artiste de chaque valeur distincte ; la dernière case (None)
+    # sert aux valeurs manquantes, codées -1 par factorize
+    first_artist = exploded[~exploded.index.duplicated()]
+    main_by_code = np.full(len(uniques) + 1, None, dtype=object)
+    main_by_code[first_artist.index.to_numpy()] = first_artist.to_numpy(dtype=object)
+    main_artist = pd.Series(main_by_code[codes], index=artist_series.index, dtype=object)
+
+    return unique_artists, main_artist
+
+
 def clean_column_name(col_name):
     """Nettoie les noms de colonnes (espaces, caractères spéciaux)."""
     return col_name.strip().lower()
 
 
-def parse_date(date_str):
+def normalize_release_dates(date_series):
     """
-    Parse les dates dans différents formats Spotify.
-    Retourne une date au format YYYY-MM-DD ou None.
+    Convertit en un seul passage vectorisé les dates de sortie Spotify
+    (formats YYYY, YYYY-MM et YYYY-MM-DD) en datetime64.
+
+    Le mois et le jour absents sont complétés par 01. Les valeurs manquantes,
+    invalides ou dans un autre format deviennent NaT. Chaque date distincte
+    n'est analysée qu'une fois (factorize), puis reportée sur les lignes.
+
+    Args:
+        date_series: Série de dates (chaînes) telles que lues dans le CSV
+
+    Returns:
+        Série datetime64 alignée sur l'index d'entrée
     """
-    if pd.isna(date_str) or date_str == '':
-        return None
-    
-    date_str = str(date_str).strip()
-    
-    # Format YYYY-MM-DD
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        return date_str
-    
-    # Format YYYY-MM
-    if re.match(r'^\d{4}-\d{2}$', date_str):
-        return f"{date_str}-01"
-    
-    # Format YYYY seulement
-    if re.match(r'^\d{4}$', date_str):
-        return f"{date_str}-01-01"
-    
-    return None
+    if pd.api.types.is_datetime64_any_dtype(date_series):
+        return date_series
+
+    codes, uniques = pd.factorize(date_series)
+
+    parts = pd.Series(uniques).astype(str).str.strip().str.extract(
+        r'^(?P<year>\d{4})(?:-(?P<month>\d{2}))?(?:-(?P<day>\d{2}))?$'
+    )
+    parts = parts.astype(float).fillna({'month': 1, 'day': 1})
+    dates = pd.to_datetime(parts[['year', 'month', 'day']], errors='coerce')
+
+    # Dernière case : valeur manquante (code -1)
+    by_code = np.append(dates.to_numpy(), np.datetime64('NaT'))
+    return pd.Series(by_code[codes], index=date_series.index)
+
+
+# Schéma déclaré du CSV brut : seules ces colonnes sont lues, avec un type explicite.
+# Les colonnes inutilisées (track_href, uri, type, id) ne sont jamais chargées.
+# Les colonnes entières sont lues en flottants (qui tolèrent les valeurs manquantes
+# sans le surcoût des types Int nullables) puis converties en int à l'extraction.
+CSV_SCHEMA = {
+    'playlist_genre': 'category',
+    'playlist_subgenre': 'category',
+    'playlist_name': 'category',
+    'playlist_id': str,
+    'track_artist': str,
+    'track_album_id': str,
+    'track_album_name': str,
+    'track_album_release_date': str,
+    'track_id': str,
+    'track_name': str,
+    'duration_ms': 'float64',
+    'track_popularity': 'float32',
+    'energy': 'float32',
+    'tempo': 'float32',
+    'danceability': 'float32',
+    'loudness': 'float32',
+    'liveness': 'float32',
+    'valence': 'float32',
+    'speechiness': 'float32',
+    'acousticness': 'float32',
+    'instrumentalness': 'float32',
+    'key': 'float32',
+    'mode': 'float32',
+    'time_signature': 'float32',
+    'analysis_url': str
+}
+
+# Mapping des colonnes du CSV vers les noms utilisés par le schéma
+COLUMN_MAPPING = {
+    'playlist_genre': 'nom_genre',
+    'playlist_subgenre': 'nom_subgenre',
+    'track_artist': 'artistes_collab',
+    'track_album_id': 'id_album',
+    'track_album_name': 'nom_album',
+    'track_album_release_date': 'date_sortie',
+    'track_id': 'id_track',
+    'track_name': 'nom_track',
+    'playlist_id': 'id_playlist',
+    'playlist_name': 'nom_playlist',
+    'key': 'key_musical',
+    'mode': 'mode_musical',
+    'time_signature': 'time_signature'
+}
+
+# Colonnes indispensables à la normalisation
+REQUIRED_COLUMNS = ['nom_genre', 'nom_subgenre', 'artistes_collab', 'id_album',
+                    'nom_album', 'date_sortie', 'id_track', 'nom_track']
+
+# Clés naturelles de chaque table (utilisées pour la déduplication)
+TABLE_KEYS = {
+    'sp_genres': ['nom_genre'],
+    'sp_artists': ['nom_artist'],
+    'sp_subgenres': ['nom_subgenre'],
+    'sp_albums': ['id_album'],
+    'sp_playlists': ['id_playlist'],
+    'sp_tracks': ['id_track'],
+    'sp_audio_features': ['id_track'],
+    'sp_playlist_tracks': ['id_playlist', 'id_track']
+}
+
+
+def _resolve_csv_engine(engine):
+    """Retourne le moteur de lecture CSV à utiliser (pyarrow seulement s'il est installé)."""
+    if engine == 'pyarrow':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("⚠️ pyarrow n'est pas installé : lecture avec le moteur 'c'.")
+            return 'c'
+    return engine
 
 
-def preprocess_csv():
+def read_spotify_csv(path=None, engine=None, chunksize=None):
     """
-    Lit le CSV, normalise et retourne un dictionnaire de DataFrames prêts pour l'insertion.
-    
+    Lit le CSV Spotify selon le schéma déclaré CSV_SCHEMA.
+
+    Seules les colonnes utiles sont chargées (usecols), les caractéristiques
+    audio en float32/entiers, genre, sous-genre et nom de playlist en
+    catégories. Les en-têtes sont comparés après nettoyage
+    (clean_column_name), comme dans _prepare_raw.
+
+    Args:
+        path: Chemin du fichier CSV (défaut : CSV_FILE_PATH)
+        engine: Moteur pandas ('c' ou 'pyarrow', défaut : CSV_ENGINE).
+                La lecture par blocs utilise toujours le moteur 'c'.
+        chunksize: Si renseigné, retourne un lecteur itérable par blocs
+
     Returns:
-        dict: Dictionnaire contenant les DataFrames pour chaque table
+        DataFrame brut, ou TextFileReader si chunksize est renseigné
     """
-    # Lecture du CSV avec gestion d'erreurs
-    try:
-        df_raw = pd.read_csv(CSV_FILE_PATH, encoding='utf-8')
-        print(f"✅ Fichier CSV chargé : {len(df_raw)} lignes")
-    except FileNotFoundError:
-        print(f"❌ Erreur : Le fichier {CSV_FILE_PATH} n'a pas été trouvé.")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ Erreur lors de la lecture du CSV : {e}")
-        sys.exit(1)
+    if path is None:
+        path = CSV_FILE_PATH
+    if engine is None:
+        engine = CSV_ENGINE
+    engine = 'c' if chunksize else _resolve_csv_engine(engine)
 
-    print(f"🔄 Analyse et normalisation de {CSV_FILE_PATH}...")
-    
-    # Nettoyage des noms de colonnes
+    header = pd.read_csv(path, encoding='utf-8', nrows=0).columns
+    dtypes = {col: CSV_SCHEMA[clean_column_name(col)]
+              for col in header if clean_column_name(col) in CSV_SCHEMA}
+
+    return pd.read_csv(path, encoding='utf-8', usecols=list(dtypes), dtype=dtypes,
+                       engine=engine, chunksize=chunksize)
+
+
+def _prepare_raw(df_raw, verbose=True):
+    """
+    Nettoie les noms de colonnes du CSV brut et les renomme selon le schéma.
+
+    Args:
+        df_raw: DataFrame brut lu depuis le CSV
+        verbose: Si True, signale les colonnes manquantes
+
+    Returns:
+        DataFrame avec les colonnes renommées
+    """
     df_raw.columns = [clean_column_name(col) for col in df_raw.columns]
-    
-    # Mapping des colonnes (au cas où il y a des variations)
-    column_mapping = {
-        'playlist_genre': 'nom_genre',
-        'playlist_subgenre': 'nom_subgenre',
-        'track_artist': 'artistes_collab',
-        'track_album_id': 'id_album',
-        'track_album_name': 'nom_album',
-        'track_album_release_date': 'date_sortie',
-        'track_id': 'id_track',
-        'track_name': 'nom_track',
-        'playlist_id': 'id_playlist',
-        'playlist_name': 'nom_playlist',
-        'key': 'key_musical',
-        'mode': 'mode_musical',
-        'time_signature': 'time_signature'
-    }
-    
-    df_raw = df_raw.rename(columns=column_mapping)
-    
-    # Vérification des colonnes essentielles
-    required_cols = ['nom_genre', 'nom_subgenre', 'artistes_collab', 'id_album', 
-                     'nom_album', 'date_sortie', 'id_track', 'nom_track']
-    missing_cols = [col for col in required_cols if col not in df_raw.columns]
-    
-    if missing_cols:
+    df_raw = df_raw.rename(columns=COLUMN_MAPPING)
+
+    missing_cols = [col for col in REQUIRED_COLUMNS if col not in df_raw.columns]
+    if missing_cols and verbose:
         print(f"⚠️ Colonnes manquantes : {missing_cols}")
         print(f"📋 Colonnes disponibles : {list(df_raw.columns)}")
-    
-    # --- 1. GENRES (sp_genres) ---
-    print("📊 Extraction des genres...")
-    genres_df = df_raw[['nom_genre']].dropna().drop_duplicates()
-    genres_df['nom_genre'] = genres_df['nom_genre'].str.strip().str.lower()
-    genres_df = genres_df[genres_df['nom_genre'] != ''].sort_values('nom_genre').reset_index(drop=True)
-    print(f"   → {len(genres_df)} genres uniques")
-    
-    # --- 2. ARTISTES (sp_artists) ---
-    print("🎤 Extraction des artistes...")
-    all_artists = set()
-    for artists_list in df_raw['artistes_collab'].apply(extract_artists):
-        all_artists.update(artists_list)
-    
-    all_artists.discard('')  # Supprime les chaînes vides
-    artists_df = pd.DataFrame(sorted(list(all_artists)), columns=['nom_artist'])
-    print(f"   → {len(artists_df)} artistes uniques")
-    
-    # --- 3. SOUS-GENRES (sp_subgenres) ---
-    print("🎵 Extraction des sous-genres...")
-    subgenres_temp = df_raw[['nom_subgenre', 'nom_genre']].dropna().copy()
-    subgenres_temp['nom_subgenre'] = subgenres_temp['nom_subgenre'].str.strip().str.lower()
-    subgenres_temp['nom_genre'] = subgenres_temp['nom_genre'].str.strip().str.lower()
-    
-    # Suppression des doublons en gardant la première occurrence
-    subgenres_df = subgenres_temp.drop_duplicates(subset=['nom_subgenre'], keep='first')
-    subgenres_df = subgenres_df[
-        (subgenres_df['nom_subgenre'] != '') & 
-        (subgenres_df['nom_genre'] != '')
-    ].reset_index(drop=True)
-    print(f"   → {len(subgenres_df)} sous-genres uniques")
-    
-    # --- 4. ALBUMS (sp_albums) ---
-    print("💿 Extraction des albums...")
-    albums_temp = df_raw[['id_album', 'nom_album', 'date_sortie', 'artistes_collab']].dropna(subset=['id_album'])
-    albums_temp = albums_temp.drop_duplicates(subset=['id_album'])
-    
-    # Conversion et nettoyage
-    albums_temp['id_album'] = albums_temp['id_album'].astype(str).str.strip()
-    albums_temp['nom_album'] = albums_temp['nom_album'].astype(str).str.strip()
-    albums_temp['date_sortie'] = albums_temp['date_sortie'].apply(parse_date)
-    
+
+    return df_raw
+
+
+# Colonnes texte nettoyées une seule fois par _clean_raw : colonne -> mise en minuscules
+TEXT_COLUMNS = {
+    'nom_genre': True,
+    'nom_subgenre': True,
+    'id_album': False,
+    'nom_album': False,
+    'id_track': False,
+    'nom_track': False,
+    'id_playlist': False,
+    'nom_playlist': False
+}
+
+# Valeur des noms manquants (album, piste, playlist), colonnes NOT NULL du
+# schéma : la chaîne 'nan' que produisait la conversion str() d'origine est
+# conservée, pour que la ligne et ses dépendantes soient chargées et que les
+# empreintes du mode incrémental restent celles des exécutions précédentes
+MISSING_NAME = 'nan'
+
+AUDIO_NUMERIC_COLUMNS = ['energy', 'tempo', 'danceability', 'loudness', 'liveness',
+                         'valence', 'speechiness', 'acousticness', 'instrumentalness']
+
+AUDIO_INTEGER_COLUMNS = ['key_musical', 'mode_musical', 'time_signature']
+
+
+def _clean_text(series, lower=False):
+    """
+    Supprime les espaces (et met en minuscules si demandé) d'une colonne texte
+    en conservant les valeurs manquantes.
+
+    Une colonne catégorielle n'est nettoyée que sur ses catégories distinctes
+    et reste catégorielle : les valeurs devenues identiques après nettoyage
+    partagent le même code.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cleaned = _clean_text(pd.Series(series.cat.categories), lower)
+        clean_codes, clean_values = pd.factorize(cleaned)
+        # Dernière case : valeur manquante (code -1)
+        codes = np.append(clean_codes, -1)[series.cat.codes.to_numpy()]
+        return pd.Series(pd.Categorical.from_codes(codes, categories=clean_values),
+                         index=series.index)
+
+    if not pd.api.types.is_string_dtype(series):
+        series = series.where(series.isna(), series.astype(str))
+    cleaned = series.str.strip()
+    return cleaned.str.lower() if lower else cleaned
+
+
+def _decode_text(df):
+    """Reconvertit en chaînes les colonnes catégorielles produites par _clean_text."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return df
+
+
+def _clean_raw(df_raw):
+    """
+    Étape de nettoyage unique : chaque colonne texte partagée entre plusieurs
+    tables (identifiants, noms, genres) est nettoyée une seule fois, avant la
+    dérivation des tables. Les autres colonnes sont reprises sans copie.
+
+    Args:
+        df_raw: DataFrame issu de _prepare_raw
+
+    Returns:
+        DataFrame nettoyé, aligné sur df_raw
+    """
+    cleaned = {col: _clean_text(df_raw[col], lower=lower)
+               for col, lower in TEXT_COLUMNS.items() if col in df_raw.columns}
+    return df_raw.assign(**cleaned)
+
+
+def _to_numeric(df, columns, integer=False):
+    """Convertit les colonnes présentes en nombres (0 pour les entiers manquants)."""
+    for col in columns:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            df[col] = values.fillna(0).astype(int) if integer else values
+    return df
+
+
+def _unique_rows(df, key_cols, required_cols=None):
+    """
+    Première occurrence de chaque clé, en écartant les lignes dont une clé (ou
+    une colonne de required_cols) est manquante ou vide.
+    """
+    required_cols = required_cols or key_cols
+    valid = df[required_cols].notna().all(axis=1) & (df[required_cols] != '').all(axis=1)
+    unique_df = df[valid].drop_duplicates(subset=key_cols).reset_index(drop=True)
+    return _decode_text(unique_df)
+
+
+def _extract_genres(clean):
+    """Construit la table sp_genres."""
+    genres_df = _unique_rows(clean[['nom_genre']], ['nom_genre'])
+    return genres_df.sort_values('nom_genre').reset_index(drop=True)
+
+
+def _extract_artists(clean):
+    """Construit la table sp_artists."""
+    unique_artists, _ = extract_artists_vectorized(clean['artistes_collab'])
+    return pd.DataFrame(unique_artists, columns=['nom_artist'])
+
+
+def _extract_subgenres(clean):
+    """Construit la table sp_subgenres (première occurrence de chaque sous-genre)."""
+    return _unique_rows(clean[['nom_subgenre', 'nom_genre']], ['nom_subgenre'],
+                        required_cols=['nom_subgenre', 'nom_genre'])
+
+
+def _extract_albums(clean):
+    """Construit la table sp_albums (avec l'artiste principal de chaque album)."""
+    albums_df = _unique_rows(clean[['id_album', 'nom_album', 'date_sortie', 'artistes_collab']], ['id_album'])
+    albums_df['nom_album'] = albums_df['nom_album'].fillna(MISSING_NAME)
+    albums_df['date_sortie'] = normalize_release_dates(albums_df['date_sortie'])
+
     # Extraction de l'artiste principal
-    albums_temp['artiste_principal'] = albums_temp['artistes_collab'].apply(
-        lambda x: extract_artists(x)[0] if extract_artists(x) else None
-    )
-    
-    albums_df = albums_temp[['id_album', 'nom_album', 'date_sortie', 'artiste_principal']].copy()
-    albums_df = albums_df[albums_df['id_album'] != ''].reset_index(drop=True)
-    print(f"   → {len(albums_df)} albums uniques")
-    
-    # --- 5. PLAYLISTS (sp_playlists) ---
-    print("📝 Extraction des playlists...")
-    playlists_temp = df_raw[['id_playlist', 'nom_playlist', 'nom_subgenre']].dropna(subset=['id_playlist'])
-    playlists_temp = playlists_temp.drop_duplicates(subset=['id_playlist'])
-    
-    # Conversion et nettoyage
-    playlists_temp['id_playlist'] = playlists_temp['id_playlist'].astype(str).str.strip()
-    playlists_temp['nom_playlist'] = playlists_temp['nom_playlist'].astype(str).str.strip()
-    playlists_temp['nom_subgenre'] = playlists_temp['nom_subgenre'].str.strip().str.lower()
-    
-    playlists_df = playlists_temp[['id_playlist', 'nom_playlist', 'nom_subgenre']].copy()
-    playlists_df = playlists_df[playlists_df['id_playlist'] != ''].reset_index(drop=True)
-    print(f"   → {len(playlists_df)} playlists uniques")
-    
-    # --- 6. TRACKS (sp_tracks) ---
-    print("🎶 Extraction des tracks...")
+    _, albums_df['artiste_principal'] = extract_artists_vectorized(albums_df.pop('artistes_collab'))
+    return albums_df
+
+
+def _extract_playlists(clean):
+    """Construit la table sp_playlists."""
+    playlists_df = _unique_rows(clean[['id_playlist', 'nom_playlist', 'nom_subgenre']], ['id_playlist'])
+    playlists_df['nom_playlist'] = playlists_df['nom_playlist'].fillna(MISSING_NAME)
+    return playlists_df
+
+
+def _extract_tracks(clean):
+    """Construit la table sp_tracks."""
     tracks_cols = ['id_track', 'nom_track', 'duration_ms', 'track_popularity', 'id_album']
-    tracks_temp = df_raw[tracks_cols].dropna(subset=['id_track'])
-    tracks_temp = tracks_temp.drop_duplicates(subset=['id_track'])
-    
-    # Conversion des types
-    tracks_temp['id_track'] = tracks_temp['id_track'].astype(str).str.strip()
-    tracks_temp['id_album'] = tracks_temp['id_album'].astype(str).str.strip()
-    tracks_temp['nom_track'] = tracks_temp['nom_track'].astype(str).str.strip()
-    
-    # Conversion numérique avec gestion d'erreurs
-    tracks_temp['duration_ms'] = pd.to_numeric(tracks_temp['duration_ms'], errors='coerce').fillna(0).astype(int)
-    tracks_temp['track_popularity'] = pd.to_numeric(tracks_temp['track_popularity'], errors='coerce').fillna(0).astype(int)
-    
-    tracks_df = tracks_temp.copy()
-    tracks_df = tracks_df[tracks_df['id_track'] != ''].reset_index(drop=True)
-    
+    tracks_df = _unique_rows(clean[tracks_cols], ['id_track'])
+    tracks_df['nom_track'] = tracks_df['nom_track'].fillna(MISSING_NAME)
+    tracks_df = _to_numeric(tracks_df, ['duration_ms', 'track_popularity'], integer=True)
+
     # Ajout de colonnes optionnelles
     tracks_df['track_href'] = None
     tracks_df['uri'] = None
-    print(f"   → {len(tracks_df)} tracks uniques")
-    
-    # --- 7. AUDIO FEATURES (sp_audio_features) ---
-    print("🎼 Extraction des audio features...")
-    audio_cols = ['id_track', 'energy', 'tempo', 'danceability', 'loudness', 'liveness',
-                  'valence', 'speechiness', 'acousticness', 'instrumentalness',
-                  'key_musical', 'mode_musical', 'time_signature']
-    
+    return tracks_df
+
+
+def _extract_audio_features(clean):
+    """Construit la table sp_audio_features."""
+    audio_cols = ['id_track'] + AUDIO_NUMERIC_COLUMNS + AUDIO_INTEGER_COLUMNS + ['analysis_url']
+
     # Vérifier quelles colonnes existent
-    available_audio_cols = [col for col in audio_cols if col in df_raw.columns]
-    
-    if 'analysis_url' in df_raw.columns:
-        available_audio_cols.append('analysis_url')
-    
-    audio_features_temp = df_raw[available_audio_cols].dropna(subset=['id_track'])
-    audio_features_temp = audio_features_temp.drop_duplicates(subset=['id_track'])
-    
-    # Conversion des types
-    audio_features_temp['id_track'] = audio_features_temp['id_track'].astype(str).str.strip()
-    
-    # Conversion des colonnes numériques
-    numeric_cols = ['energy', 'tempo', 'danceability', 'loudness', 'liveness',
-                    'valence', 'speechiness', 'acousticness', 'instrumentalness']
-    
-    for col in numeric_cols:
-        if col in audio_features_temp.columns:
-            audio_features_temp[col] = pd.to_numeric(audio_features_temp[col], errors='coerce')
-    
-    # Conversion des colonnes entières
-    int_cols = ['key_musical', 'mode_musical', 'time_signature']
-    for col in int_cols:
-        if col in audio_features_temp.columns:
-            audio_features_temp[col] = pd.to_numeric(audio_features_temp[col], errors='coerce').fillna(0).astype(int)
-    
-    audio_features_df = audio_features_temp.copy()
-    audio_features_df = audio_features_df[audio_features_df['id_track'] != ''].reset_index(drop=True)
-    print(f"   → {len(audio_features_df)} audio features")
-    
-    # --- 8. PLAYLIST TRACKS (sp_playlist_tracks) ---
-    print("🔗 Extraction des relations playlist-tracks...")
-    playlist_tracks_temp = df_raw[['id_playlist', 'id_track']].dropna()
-    playlist_tracks_temp = playlist_tracks_temp.drop_duplicates()
-    
-    # Conversion des types
-    playlist_tracks_temp['id_playlist'] = playlist_tracks_temp['id_playlist'].astype(str).str.strip()
-    playlist_tracks_temp['id_track'] = playlist_tracks_temp['id_track'].astype(str).str.strip()
-    
-    playlist_tracks_df = playlist_tracks_temp.copy()
-    playlist_tracks_df = playlist_tracks_df[
-        (playlist_tracks_df['id_playlist'] != '') & 
-        (playlist_tracks_df['id_track'] != '')
-    ].reset_index(drop=True)
-    print(f"   → {len(playlist_tracks_df)} relations playlist-track")
-    
-    print("\n✅ Normalisation terminée. 8 DataFrames créés.")
-    
-    # Résumé
+    available_audio_cols = [col for col in audio_cols if col in clean.columns]
+    audio_features_df = _unique_rows(clean[available_audio_cols], ['id_track'])
+
+    audio_features_df = _to_numeric(audio_features_df, AUDIO_NUMERIC_COLUMNS)
+    return _to_numeric(audio_features_df, AUDIO_INTEGER_COLUMNS, integer=True)
+
+
+def _extract_playlist_tracks(clean):
+    """Construit la table de liaison sp_playlist_tracks."""
+    return _unique_rows(clean[['id_playlist', 'id_track']], ['id_playlist', 'id_track'])
+
+
+# Étapes de normalisation : (table, libellé affiché, suffixe du compteur, fonction)
+ENTITY_EXTRACTORS = [
+    ('sp_genres', "📊 Extraction des genres...", "genres uniques", _extract_genres),
+    ('sp_artists', "🎤 Extraction des artistes...", "artistes uniques", _extract_artists),
+    ('sp_subgenres', "🎵 Extraction des sous-genres...", "sous-genres uniques", _extract_subgenres),
+    ('sp_albums', "💿 Extraction des albums...", "albums uniques", _extract_albums),
+    ('sp_playlists', "📝 Extraction des playlists...", "playlists uniques", _extract_playlists),
+    ('sp_tracks', "🎶 Extraction des tracks...", "tracks uniques", _extract_tracks),
+    ('sp_audio_features', "🎼 Extraction des audio features...", "audio features", _extract_audio_features),
+    ('sp_playlist_tracks', "🔗 Extraction des relations playlist-tracks...", "relations playlist-track", _extract_playlist_tracks),
+]
+
+
+def normalize_dataframe(df_raw, verbose=True):
+    """
+    Dérive les huit tables normalisées à partir d'un DataFrame brut déjà renommé.
+
+    Les colonnes brutes sont nettoyées une seule fois (_clean_raw), puis chaque
+    table est une simple sélection dédupliquée du DataFrame nettoyé.
+
+    Args:
+        df_raw: DataFrame issu de _prepare_raw
+        verbose: Si True, affiche la progression de chaque étape
+
+    Returns:
+        dict: Dictionnaire contenant les DataFrames pour chaque table
+    """
+    clean = _clean_raw(df_raw)
+
+    tables = {}
+    for table_name, label, unit, extractor in ENTITY_EXTRACTORS:
+        if verbose:
+            print(label)
+        tables[table_name] = extractor(clean)
+        if verbose:
+            print(f"   → {len(tables[table_name])} {unit}")
+
+    return {
+        'sp_genres': tables['sp_genres'],
+        'sp_subgenres': tables['sp_subgenres'],
+        'sp_artists': tables['sp_artists'],
+        'sp_albums': tables['sp_albums'],
+        'sp_tracks': tables['sp_tracks'],
+        'sp_audio_features': tables['sp_audio_features'],
+        'sp_playlists': tables['sp_playlists'],
+        'sp_playlist_tracks': tables['sp_playlist_tracks']
+    }
+
+
+# Codes de substitution denses (0..n-1) attribués par preprocess_csv :
+# table -> (colonne de code, colonne de clé naturelle)
+SURROGATE_CODES = {
+    'sp_genres': ('code_genre', 'nom_genre'),
+    'sp_subgenres': ('code_subgenre', 'nom_subgenre'),
+    'sp_artists': ('code_artist', 'nom_artist'),
+    'sp_albums': ('code_album', 'id_album'),
+    'sp_tracks': ('code_track', 'id_track'),
+    'sp_playlists': ('code_playlist', 'id_playlist')
+}
+
+# Références entre tables : (table, colonne référençante, table référencée)
+CODE_REFERENCES = [
+    ('sp_subgenres', 'nom_genre', 'sp_genres'),
+    ('sp_albums', 'artiste_principal', 'sp_artists'),
+    ('sp_tracks', 'id_album', 'sp_albums'),
+    ('sp_audio_features', 'id_track', 'sp_tracks'),
+    ('sp_playlists', 'nom_subgenre', 'sp_subgenres'),
+    ('sp_playlist_tracks', 'id_playlist', 'sp_playlists'),
+    ('sp_playlist_tracks', 'id_track', 'sp_tracks')
+]
+
+CODE_PREFIX = 'code_'
+
+
+def assign_surrogate_codes(data):
+    """
+    Attribue des codes entiers denses aux entités et à leurs références.
+
+    Chaque entité reçoit le code pd.factorize de sa clé naturelle (sa position
+    dans la table) ; chaque référence reçoit le code de l'entité référencée,
+    ou -1 si elle est manquante ou inconnue. Les codes sont en int32.
+
+    Args:
+        data: Dictionnaire {nom_table: DataFrame} (modifié et retourné)
+
+    Returns:
+        dict: Le même dictionnaire, avec les colonnes code_*
+    """
+    for table, (code_col, key_col) in SURROGATE_CODES.items():
+        codes, _ = pd.factorize(data[table][key_col])
+        data[table][code_col] = codes.astype(np.int32)
+
+    for table, ref_col, parent in CODE_REFERENCES:
+        code_col, parent_key = SURROGATE_CODES[parent]
+        categories = pd.Index(data[parent][parent_key])
+        codes = pd.Categorical(data[table][ref_col], categories=categories).codes
+        data[table][code_col] = codes.astype(np.int32)
+
+    return data
+
+
+def build_code_dictionaries(data):
+    """
+    Construit les dictionnaires code -> nom/identifiant de chaque entité.
+
+    Args:
+        data: Tables produites par preprocess_csv (avec les colonnes code_*)
+
+    Returns:
+        dict: {colonne de code: Série indexée par le code, valeur = clé naturelle}
+    """
+    return {
+        code_col: pd.Series(data[table][key_col].to_numpy(),
+                            index=data[table][code_col].to_numpy(), name=key_col)
+        for table, (code_col, key_col) in SURROGATE_CODES.items()
+    }
+
+
+def print_summary(data):
+    """Affiche le résumé du nombre d'enregistrements par table normalisée."""
     print("\n" + "="*50)
     print("RÉSUMÉ DES DONNÉES NORMALISÉES")
     print("="*50)
     summary = {
-        'Genres': len(genres_df),
-        'Sous-genres': len(subgenres_df),
-        'Artistes': len(artists_df),
-        'Albums': len(albums_df),
-        'Playlists': len(playlists_df),
-        'Tracks': len(tracks_df),
-        'Audio Features': len(audio_features_df),
-        'Relations Playlist-Track': len(playlist_tracks_df)
+        'Genres': len(data['sp_genres']),
+        'Sous-genres': len(data['sp_subgenres']),
+        'Artistes': len(data['sp_artists']),
+        'Albums': len(data['sp_albums']),
+        'Playlists': len(data['sp_playlists']),
+        'Tracks': len(data['sp_tracks']),
+        'Audio Features': len(data['sp_audio_features']),
+        'Relations Playlist-Track': len(data['sp_playlist_tracks'])
     }
-    
+
     for entity, count in summary.items():
         print(f"  • {entity:<25} : {count:>6} enregistrements")
     print("="*50 + "\n")
+
+
+def resolve_csv_paths(path=None):
+    """
+    Résout la source CSV configurée en liste de fichiers.
+
+    CSV_FILE_PATH peut désigner un fichier, un répertoire (tous ses *.csv) ou
+    un motif glob (ex. ./data/input/*_spotify_data.csv).
+
+    Args:
+        path: Source à résoudre (défaut : CSV_FILE_PATH)
+
+    Returns:
+        list: Chemins des fichiers CSV, triés
+    """
+    if path is None:
+        path = CSV_FILE_PATH
+
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.csv')))
+    if glob.has_magic(path):
+        return sorted(glob.glob(path))
+    return [path]
+
+
+def _normalize_file(path):
+    """
+    Tâche d'un processus de travail : lit et normalise un fichier CSV.
+
+    Returns:
+        tuple: (nombre de lignes lues, dictionnaire des tables normalisées)
+    """
+    df_raw = read_spotify_csv(path)
+    return len(df_raw), normalize_dataframe(_prepare_raw(df_raw, verbose=False), verbose=False)
+
+
+def merge_normalized_tables(parts):
+    """
+    Fusionne les tables normalisées de plusieurs fichiers avec déduplication
+    globale sur les clés naturelles (première occurrence conservée, dans
+    l'ordre des fichiers).
+
+    Args:
+        parts: Liste de dictionnaires {nom_table: DataFrame}
+
+    Returns:
+        dict: Dictionnaire fusionné {nom_table: DataFrame}
+    """
+    merged = {}
+    for table in parts[0]:
+        df = pd.concat([part[table] for part in parts], ignore_index=True)
+        df = df.drop_duplicates(subset=TABLE_KEYS[table], keep='first')
+        if table in ('sp_genres', 'sp_artists'):
+            df = df.sort_values(TABLE_KEYS[table])
+        merged[table] = df.reset_index(drop=True)
+    return merged
+
+
+def _normalize_files_parallel(csv_paths):
+    """Normalise plusieurs fichiers CSV en parallèle (un processus par fichier) puis fusionne."""
+    workers = min(len(csv_paths), CSV_WORKERS or os.cpu_count() or 1)
+    print(f"🔄 Normalisation de {len(csv_paths)} fichiers CSV sur {workers} processus...")
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_normalize_file, csv_paths))
+    else:
+        # Un seul cœur : pas de processus auxiliaire ni de sérialisation des tables
+        results = [_normalize_file(csv_path) for csv_path in csv_paths]
+
+    for path, (row_count, _) in zip(csv_paths, results):
+        print(f"✅ Fichier CSV chargé : {path} ({row_count} lignes)")
+
+    print("🔗 Fusion des tables avec déduplication globale...")
+    return merge_normalized_tables([tables for _, tables in results])
+
+
+def preprocess_csv(use_cache=None):
+    """
+    Lit le CSV, normalise et retourne un dictionnaire de DataFrames prêts pour l'insertion.
+
+    Si CSV_FILE_PATH désigne un répertoire ou un motif glob, chaque fichier est
+    normalisé dans un processus séparé puis les tables sont fusionnées.
+
+    Les tables produites sont mises en cache (Feather) sous une clé dérivée du
+    contenu des CSV et de NORMALIZATION_VERSION : une exécution ultérieure sur
+    les mêmes fichiers les recharge sans relire ni renormaliser les CSV.
+
+    Chaque entité et chaque référence reçoit un code entier dense (colonnes
+    code_*, voir assign_surrogate_codes) ; build_code_dictionaries en dérive
+    les dictionnaires code -> nom.
     
-    return {
-        'sp_genres': genres_df,
-        'sp_subgenres': subgenres_df,
-        'sp_artists': artists_df,
-        'sp_albums': albums_df,
-        'sp_tracks': tracks_df,
-        'sp_audio_features': audio_features_df,
-        'sp_playlists': playlists_df,
-        'sp_playlist_tracks': playlist_tracks_df
-    }
+    Args:
+        use_cache: Active le cache des tables normalisées (défaut : USE_TABLE_CACHE,
+                   ou la présence de pyarrow si USE_TABLE_CACHE n'est pas défini)
+
+    Returns:
+        dict: Dictionnaire contenant les DataFrames pour chaque table
+    """
+    if use_cache is None:
+        use_cache = FEATHER_AVAILABLE if USE_TABLE_CACHE is None else USE_TABLE_CACHE
+
+    csv_paths = resolve_csv_paths()
+    if not csv_paths:
+        print(f"❌ Erreur : aucun fichier CSV ne correspond à {CSV_FILE_PATH}.")
+        sys.exit(1)
+
+    cache_key = None
+    if use_cache:
+        try:
+            cache_key = compute_cache_key(csv_paths, NORMALIZATION_VERSION)
+        except FileNotFoundError as e:
+            print(f"❌ Erreur : Le fichier {e.filename} n'a pas été trouvé.")
+            sys.exit(1)
+
+        data = load_cached_tables(cache_key)
+        if data is not None:
+            print(f"⚡ Tables normalisées chargées depuis le cache (clé {cache_key[:12]}...)")
+            print_summary(data)
+            return data
+
+    if len(csv_paths) > 1:
+        try:
+            data = _normalize_files_parallel(csv_paths)
+        except FileNotFoundError as e:
+            print(f"❌ Erreur : Le fichier {e.filename} n'a pas été trouvé.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Erreur lors de la lecture des CSV : {e}")
+            sys.exit(1)
+    else:
+        csv_path = csv_paths[0]
+
+        # Lecture du CSV avec gestion d'erreurs
+        try:
+            df_raw = read_spotify_csv(csv_path)
+            print(f"✅ Fichier CSV chargé : {len(df_raw)} lignes")
+        except FileNotFoundError:
+            print(f"❌ Erreur : Le fichier {csv_path} n'a pas été trouvé.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Erreur lors de la lecture du CSV : {e}")
+            sys.exit(1)
+
+        print(f"🔄 Analyse et normalisation de {csv_path}...")
+        
+        df_raw = _prepare_raw(df_raw)
+        data = normalize_dataframe(df_raw)
+
+    data = assign_surrogate_codes(data)
+    print("\n✅ Normalisation terminée. 8 DataFrames créés.")
+    print_summary(data)
+
+    if cache_key and save_cached_tables(cache_key, data):
+        print(f"💾 Tables normalisées mises en cache (clé {cache_key[:12]}...)\n")
+
+    return data
+
+
+def _merge_sorted(left, right):
+    """Fusionne deux tableaux triés en temps linéaire (sans nouveau tri)."""
+    positions = np.searchsorted(left, right) + np.arange(len(right))
+    from_right = np.zeros(len(left) + len(right), dtype=bool)
+    from_right[positions] = True
+    merged = np.empty(len(from_right), dtype=left.dtype)
+    merged[from_right] = right
+    merged[~from_right] = left
+    return merged
+
+
+class _SeenKeys:
+    """
+    Ensemble compact des clés déjà émises pour une table.
+
+    Les clés sont conservées sous forme d'empreintes 64 bits dans des
+    tableaux NumPy triés (8 octets par clé) plutôt que sous forme de chaînes
+    Python, ce qui garde l'état de déduplication petit même sur des dizaines
+    de millions de lignes.
+
+    Les empreintes de chaque bloc forment un nouveau tableau trié ; un
+    tableau est fusionné avec le précédent dès qu'il atteint la moitié de sa
+    taille. Il reste ainsi O(log n) tableaux, et chaque empreinte n'est
+    recopiée que O(log n) fois : le coût total reste quasi linéaire au lieu
+    de recopier toutes les clés vues à chaque bloc.
+    """
+
+    def __init__(self, key_cols):
+        self.key_cols = key_cols
+        self._blocks = []
+
+    def __len__(self):
+        return sum(len(block) for block in self._blocks)
+
+    def _contains(self, hashes):
+        """Indique, pour chaque empreinte, si elle figure dans un des tableaux triés."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for block in self._blocks:
+            positions = np.searchsorted(block, hashes).clip(max=len(block) - 1)
+            found |= block[positions] == hashes
+        return found
+
+    def _add(self, hashes):
+        """Ajoute un tableau d'empreintes puis fusionne les tableaux de tailles voisines."""
+        self._blocks.append(np.unique(hashes))
+        while len(self._blocks) > 1 and 2 * len(self._blocks[-1]) >= len(self._blocks[-2]):
+            last = self._blocks.pop()
+            self._blocks.append(_merge_sorted(self._blocks.pop(), last))
+
+    def filter_new(self, df):
+        """
+        Retourne uniquement les lignes de df dont la clé n'a jamais été vue,
+        puis enregistre ces clés.
+        """
+        if df.empty:
+            return df
+
+        hashes = pd.util.hash_pandas_object(df[self.key_cols], index=False).to_numpy()
+        already_seen = self._contains(hashes)
+
+        new_hashes = hashes[~already_seen]
+        if len(new_hashes):
+            self._add(new_hashes)
+
+        return df[~already_seen].reset_index(drop=True)
+
+
+def _iter_normalized_chunks(reader):
+    """Générateur interne : normalise chaque bloc et ne garde que les nouvelles clés."""
+    seen = {table: _SeenKeys(keys) for table, keys in TABLE_KEYS.items()}
+    total_rows = 0
+
+    for chunk_number, chunk in enumerate(reader, 1):
+        total_rows += len(chunk)
+        chunk = _prepare_raw(chunk, verbose=(chunk_number == 1))
+        tables = normalize_dataframe(chunk, verbose=False)
+
+        batch = {table: seen[table].filter_new(df) for table, df in tables.items()}
+        new_rows = sum(len(df) for df in batch.values())
+        print(f"📦 Bloc {chunk_number} : {len(chunk)} lignes lues, {new_rows} nouveaux enregistrements")
+
+        yield batch
+
+    print(f"\n✅ Lecture en flux terminée : {total_rows} lignes traitées.")
+    print("="*50)
+    for table, keys in seen.items():
+        print(f"  • {table:<25} : {len(keys):>8} clés uniques")
+    print("="*50 + "\n")
+
+
+def _iter_file_chunks(csv_paths, chunksize):
+    """Enchaîne les blocs de plusieurs fichiers CSV, un fichier après l'autre."""
+    for csv_path in csv_paths:
+        yield from read_spotify_csv(csv_path, chunksize=chunksize)
+
+
+def preprocess_csv_chunks(chunksize=None):
+    """
+    Variante en flux de preprocess_csv : lit le CSV par blocs et produit, pour
+    chaque bloc, un dictionnaire des huit tables ne contenant que les
+    enregistrements jamais vus dans les blocs précédents.
+
+    La mémoire utilisée reste bornée par la taille d'un bloc plus l'état de
+    déduplication (empreintes 64 bits), quelle que soit la taille du fichier.
+    Si CSV_FILE_PATH désigne plusieurs fichiers, ils sont lus l'un après
+    l'autre avec un état de déduplication commun. Les lots ne portent pas de
+    codes de substitution (code_*), qui supposent toutes les tables connues.
+
+    Args:
+        chunksize: Nombre de lignes CSV par bloc (défaut : CSV_CHUNK_SIZE)
+
+    Returns:
+        Générateur de dictionnaires {nom_table: DataFrame}, consommable
+        directement par DatabaseManager.insert_data
+    """
+    if chunksize is None:
+        chunksize = CSV_CHUNK_SIZE
+
+    csv_paths = resolve_csv_paths()
+    if not csv_paths:
+        print(f"❌ Erreur : aucun fichier CSV ne correspond à {CSV_FILE_PATH}.")
+        sys.exit(1)
+
+    # Vérification immédiate pour signaler un fichier absent avant toute insertion
+    for csv_path in csv_paths:
+        if not os.path.isfile(csv_path):
+            print(f"❌ Erreur : Le fichier {csv_path} n'a pas été trouvé.")
+            sys.exit(1)
+
+    print(f"🔄 Lecture en flux de {len(csv_paths)} fichier(s) CSV (blocs de {chunksize} lignes)...")
+    return _iter_normalized_chunks(_iter_file_chunks(csv_paths, chunksize))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+"""
+Module d'ingestion incrémentale des données Spotify.
+Conserve, d'une exécution à l'autre, une empreinte du contenu de chaque
+enregistrement (par clé naturelle) et calcule les lignes insérées, modifiées
+et supprimées par rapport à l'exécution précédente.
+"""
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from services.data_processor import CODE_PREFIX, TABLE_KEYS
+from services.table_cache import FEATHER_AVAILABLE
+
+# Import de la configuration
+try:
+    from configs import DELTA_SNAPSHOT_DIR
+except ImportError:
+    DELTA_SNAPSHOT_DIR = "./data/snapshot"
+
+HASH_COLUMN = 'row_hash'
+
+
+def _canonical_columns(df):
+    """
+    Normalise les types avant calcul d'empreinte pour qu'une même valeur donne
+    toujours la même empreinte (float32/float64, unités datetime64, chaînes
+    object/str/catégorie).
+    """
+    canonical = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            canonical[col] = series.astype('datetime64[ns]')
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            canonical[col] = series.astype('float64')
+        else:
+            canonical[col] = series.astype(object)
+    return pd.DataFrame(canonical, index=df.index)
+
+
+def compute_row_hashes(df, key_cols):
+    """
+    Calcule l'empreinte 64 bits du contenu de chaque ligne.
+
+    Les codes de substitution (code_*) sont exclus : ils dépendent du rang des
+    autres enregistrements et changeraient sans que la ligne ne change.
+
+    Args:
+        df: DataFrame d'une table normalisée
+        key_cols: Colonnes de la clé naturelle
+
+    Returns:
+        DataFrame (colonnes de clé + row_hash)
+    """
+    content_cols = sorted(col for col in df.columns if not col.startswith(CODE_PREFIX))
+    hashes = pd.util.hash_pandas_object(_canonical_columns(df[content_cols]), index=False)
+
+    snapshot = df[key_cols].copy()
+    snapshot[HASH_COLUMN] = hashes.to_numpy()
+    return snapshot.reset_index(drop=True)
+
+
+def build_snapshot(data):
+    """Construit le snapshot {nom_table: clés + empreintes} des tables normalisées."""
+    return {table: compute_row_hashes(df, TABLE_KEYS[table]) for table, df in data.items()}
+
+
+def load_snapshot(snapshot_dir=None):
+    """
+    Charge le snapshot de la dernière exécution réussie.
+
+    Returns:
+        dict: {nom_table: DataFrame clés + empreintes} ou None si absent
+    """
+    if not FEATHER_AVAILABLE:
+        return None
+
+    root = Path(snapshot_dir or DELTA_SNAPSHOT_DIR)
+    if not all((root / f"{table}.feather").exists() for table in TABLE_KEYS):
+        return None
+
+    try:
+        return {table: pd.read_feather(root / f"{table}.feather") for table in TABLE_KEYS}
+    except Exception as e:
+        print(f"⚠️ Snapshot illisible ({root}) : {e}")
+        return None
+
+
+def save_snapshot(snapshot, snapshot_dir=None):
+    """
+    Enregistre le snapshot après une ingestion réussie.
+
+    Returns:
+        bool: True si le snapshot a été écrit
+    """
+    if not FEATHER_AVAILABLE:
+        print("ℹ️  pyarrow n'est pas installé : snapshot incrémental non enregistré.")
+        return False
+
+    root = Path(snapshot_dir or DELTA_SNAPSHOT_DIR)
+    tmp_dir = root.with_name(root.name + ".tmp")
+
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for table, df in snapshot.items():
+            df.to_feather(tmp_dir / f"{table}.feather")
+
+        shutil.rmtree(root, ignore_errors=True)
+        tmp_dir.rename(root)
+        print(f"💾 Snapshot incrémental enregistré : {root}")
+        return True
+
+    except Exception as e:
+        print(f"⚠️ Impossible d'enregistrer le snapshot ({root}) : {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
+
+
+def compute_delta(data, previous_snapshot):
+    """
+    Compare les tables normalisées au snapshot précédent.
+
+    Args:
+        data: Dictionnaire {nom_table: DataFrame} de l'exécution courante
+        previous_snapshot: Snapshot chargé par load_snapshot
+
+    Returns:
+        tuple: (delta, snapshot courant) où delta contient
+               'inserted' et 'updated' ({nom_table: lignes complètes}) et
+               'deleted' ({nom_table: clés supprimées})
+    """
+    snapshot = build_snapshot(data)
+    delta = {'inserted': {}, 'updated': {}, 'deleted': {}}
+
+    for table, current in snapshot.items():
+        key_cols = TABLE_KEYS[table]
+        merged = current.merge(
+            previous_snapshot[table], on=key_cols, how='outer',
+            suffixes=('', '_previous'), indicator=True
+        )
+
+        inserted_keys = merged.loc[merged['_merge'] == 'left_only', key_cols]
+        updated_keys = merged.loc[
+            (merged['_merge'] == 'both') &
+            (merged[HASH_COLUMN] != merged[f'{HASH_COLUMN}_previous']),
+            key_cols
+        ]
+
+        rows = data[table]
+        delta['inserted'][table] = rows.merge(inserted_keys, on=key_cols).reset_index(drop=True)
+        delta['updated'][table] = rows.merge(updated_keys, on=key_cols).reset_index(drop=True)
+        delta['deleted'][table] = merged.loc[merged['_merge'] == 'right_only', key_cols].reset_index(drop=True)
+
+    return delta, snapshot
+
+
+def restore_rejected_rows(snapshot, previous_snapshot, rejected):
+    """
+    Retire du snapshot courant les lignes que la base n'a pas reçues
+    (DatabaseManager.apply_delta : quarantaine, parent absent) : chaque clé
+    rejetée reprend son empreinte du snapshot précédent, ou disparaît si elle
+    y était absente. La ligne figure ainsi de nouveau dans le delta suivant.
+
+    Args:
+        snapshot: Snapshot courant (retourné par compute_delta)
+        previous_snapshot: Snapshot à partir duquel le delta a été calculé
+        rejected: Dictionnaire {nom_table: clés naturelles non appliquées}
+
+    Returns:
+        dict: Snapshot à enregistrer
+    """
+    restored = dict(snapshot)
+    for table, keys in rejected.items():
+        if not keys:
+            continue
+        key_cols = TABLE_KEYS[table]
+        rejected_keys = pd.DataFrame(list(keys), columns=key_cols)
+
+        current = snapshot[table].merge(rejected_keys, on=key_cols, how='left', indicator=True)
+        current = current[current['_merge'] == 'left_only'].drop(columns='_merge')
+        previous = previous_snapshot[table].merge(rejected_keys, on=key_cols)
+        restored[table] = pd.concat([current, previous], ignore_index=True)
+
+    return restored
+
+
+def print_delta_summary(delta):
+    """Affiche le nombre de lignes insérées, modifiées et supprimées par table."""
+    print("\n" + "="*62)
+    print("DELTA PAR RAPPORT À LA DERNIÈRE EXÉCUTION")
+    print("="*62)
+    print(f"  {'Table':<22} | {'Insérées':>9} | {'Modifiées':>9} | {'Supprimées':>10}")
+    print("-"*62)
+    for table in TABLE_KEYS:
+        print(f"  {table:<22} | {len(delta['inserted'][table]):>9} | "
+              f"{len(delta['updated'][table]):>9} | {len(delta['deleted'][table]):>10}")
+    print("="*62 + "\n")
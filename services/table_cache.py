@@ -0,0 +1,133 @@
+"""
+Module de cache persistant des tables normalisées.
+Sauvegarde les DataFrames produits par preprocess_csv au format colonnaire
+Feather, dans un répertoire dont le nom dépend du contenu du CSV source et
+de la version du code de normalisation.
+"""
+
+import hashlib
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Import de la configuration
+try:
+    from configs import CACHE_DIR
+except ImportError:
+    CACHE_DIR = "./data/cache"
+
+# Feather nécessite pyarrow (dépendance optionnelle)
+try:
+    import pyarrow  # noqa: F401
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+MANIFEST_FILE = "manifest.json"
+
+
+def compute_cache_key(csv_paths, code_version):
+    """
+    Calcule la clé de cache : empreinte SHA-256 du contenu des fichiers CSV
+    et de la version du code de normalisation.
+
+    Args:
+        csv_paths: Chemin (ou liste de chemins) des fichiers CSV sources
+        code_version: Version du code de normalisation
+
+    Returns:
+        str: Clé hexadécimale (tronquée à 32 caractères)
+    """
+    if isinstance(csv_paths, (str, Path)):
+        csv_paths = [csv_paths]
+
+    digest = hashlib.sha256(f"normalization-v{code_version}".encode('utf-8'))
+    for path in csv_paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+
+    return digest.hexdigest()[:32]
+
+
+def load_cached_tables(cache_key, cache_dir=None):
+    """
+    Charge les tables normalisées depuis le cache si elles existent.
+
+    Args:
+        cache_key: Clé calculée par compute_cache_key
+        cache_dir: Répertoire racine du cache (défaut : CACHE_DIR)
+
+    Returns:
+        dict: {nom_table: DataFrame} ou None si le cache est absent/invalide
+    """
+    if not FEATHER_AVAILABLE:
+        return None
+
+    entry_dir = Path(cache_dir or CACHE_DIR) / cache_key
+    manifest_path = entry_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        return {
+            table: pd.read_feather(entry_dir / f"{table}.feather")
+            for table in manifest['tables']
+        }
+    except Exception as e:
+        print(f"⚠️ Cache illisible ({entry_dir}) : {e}")
+        return None
+
+
+def save_cached_tables(cache_key, data, cache_dir=None):
+    """
+    Sauvegarde les tables normalisées dans le cache.
+
+    L'écriture se fait dans un répertoire temporaire renommé à la fin, pour
+    qu'un cache interrompu ne soit jamais lu comme valide.
+
+    Args:
+        cache_key: Clé calculée par compute_cache_key
+        data: Dictionnaire {nom_table: DataFrame}
+        cache_dir: Répertoire racine du cache (défaut : CACHE_DIR)
+
+    Returns:
+        bool: True si le cache a été écrit
+    """
+    if not FEATHER_AVAILABLE:
+        print("ℹ️  pyarrow n'est pas installé : cache des tables désactivé.")
+        return False
+
+    root = Path(cache_dir or CACHE_DIR)
+    entry_dir = root / cache_key
+    tmp_dir = root / f".{cache_key}.tmp"
+
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        for table, df in data.items():
+            df.reset_index(drop=True).to_feather(tmp_dir / f"{table}.feather")
+
+        manifest = {
+            'cache_key': cache_key,
+            'created_at': datetime.now().isoformat(),
+            'tables': {table: len(df) for table, df in data.items()}
+        }
+        with open(tmp_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        tmp_dir.rename(entry_dir)
+        return True
+
+    except Exception as e:
+        print(f"⚠️ Impossible d'écrire le cache ({entry_dir}) : {e}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return False
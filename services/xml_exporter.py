@@ -6,6 +6,9 @@ Génère un fichier XML structuré à partir des données de la base Oracle.
 from lxml import etree
 from pathlib import Path
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+import shutil
 import sys
 
 # Import de la configuration
@@ -125,6 +128,96 @@ def group_data_by_playlist(data_list):
     return playlists
 
 
+def build_playlist_element(playlist_data):
+    """
+    Construit l'élément <playlist> d'une playlist regroupée par
+    group_data_by_playlist.
+    
+    Args:
+        playlist_data: Dictionnaire d'une playlist (id, nom, genre, subgenre, tracks)
+        
+    Returns:
+        etree.Element: Élément <playlist> complet
+    """
+    playlist_elem = etree.Element("playlist")
+    playlist_elem.set("id", sanitize_xml_value(playlist_data['id']))
+    
+    # Informations de la playlist
+    nom_elem = etree.SubElement(playlist_elem, "nom")
+    nom_elem.text = sanitize_xml_value(playlist_data['nom'])
+    
+    genre_elem = etree.SubElement(playlist_elem, "genre")
+    genre_elem.text = sanitize_xml_value(playlist_data['genre'])
+    
+    subgenre_elem = etree.SubElement(playlist_elem, "subgenre")
+    subgenre_elem.text = sanitize_xml_value(playlist_data['subgenre'])
+    
+    # Élément tracks
+    tracks_elem = etree.SubElement(playlist_elem, "tracks")
+    tracks_elem.set("count", str(len(playlist_data['tracks'])))
+    
+    # Parcourir chaque track de la playlist
+    for track in playlist_data['tracks']:
+        track_elem = etree.SubElement(tracks_elem, "track")
+        track_elem.set("id", sanitize_xml_value(track['id_track']))
+        
+        # Nom de la track
+        track_name_elem = etree.SubElement(track_elem, "name")
+        track_name_elem.text = sanitize_xml_value(track['track_name'])
+        
+        # Durée
+        duration_elem = etree.SubElement(track_elem, "duration")
+        duration_elem.set("ms", str(track['duration_ms']))
+        duration_elem.text = format_duration(track['duration_ms'])
+        
+        # Popularité
+        popularity_elem = etree.SubElement(track_elem, "popularity")
+        popularity_elem.text = str(track['track_popularity'])
+        
+        # Album
+        album_elem = etree.SubElement(track_elem, "album")
+        album_elem.set("id", sanitize_xml_value(track['album']['id_album']))
+        
+        album_name_elem = etree.SubElement(album_elem, "name")
+        album_name_elem.text = sanitize_xml_value(track['album']['nom_album'])
+        
+        if track['album']['date_sortie']:
+            album_date_elem = etree.SubElement(album_elem, "release_date")
+            album_date_elem.text = sanitize_xml_value(track['album']['date_sortie'])
+        
+        # Artiste
+        artist_elem = etree.SubElement(track_elem, "artist")
+        artist_name_elem = etree.SubElement(artist_elem, "name")
+        artist_name_elem.text = sanitize_xml_value(track['artist']['nom_artist'])
+        
+        # Audio features (si disponibles)
+        audio_feat = track['audio_features']
+        if any(audio_feat.values()):
+            audio_elem = etree.SubElement(track_elem, "audio_features")
+            
+            if audio_feat['energy']:
+                energy_elem = etree.SubElement(audio_elem, "energy")
+                energy_elem.text = str(audio_feat['energy'])
+            
+            if audio_feat['tempo']:
+                tempo_elem = etree.SubElement(audio_elem, "tempo")
+                tempo_elem.text = str(audio_feat['tempo'])
+            
+            if audio_feat['danceability']:
+                dance_elem = etree.SubElement(audio_elem, "danceability")
+                dance_elem.text = str(audio_feat['danceability'])
+            
+            if audio_feat['loudness']:
+                loud_elem = etree.SubElement(audio_elem, "loudness")
+                loud_elem.text = str(audio_feat['loudness'])
+            
+            if audio_feat['valence']:
+                valence_elem = etree.SubElement(audio_elem, "valence")
+                valence_elem.text = str(audio_feat['valence'])
+    
+    return playlist_elem
+
+
 def create_xml_from_data(data_list, output_path=None):
     """
     Crée un fichier XML structuré à partir des données de la base.
@@ -166,81 +259,7 @@ def create_xml_from_data(data_list, output_path=None):
     
     # Parcourir chaque playlist
     for playlist_id, playlist_data in sorted(playlists_data.items()):
-        playlist_elem = etree.SubElement(playlists_elem, "playlist")
-        playlist_elem.set("id", sanitize_xml_value(playlist_data['id']))
-        
-        # Informations de la playlist
-        nom_elem = etree.SubElement(playlist_elem, "nom")
-        nom_elem.text = sanitize_xml_value(playlist_data['nom'])
-        
-        genre_elem = etree.SubElement(playlist_elem, "genre")
-        genre_elem.text = sanitize_xml_value(playlist_data['genre'])
-        
-        subgenre_elem = etree.SubElement(playlist_elem, "subgenre")
-        subgenre_elem.text = sanitize_xml_value(playlist_data['subgenre'])
-        
-        # Élément tracks
-        tracks_elem = etree.SubElement(playlist_elem, "tracks")
-        tracks_elem.set("count", str(len(playlist_data['tracks'])))
-        
-        # Parcourir chaque track de la playlist
-        for track in playlist_data['tracks']:
-            track_elem = etree.SubElement(tracks_elem, "track")
-            track_elem.set("id", sanitize_xml_value(track['id_track']))
-            
-            # Nom de la track
-            track_name_elem = etree.SubElement(track_elem, "name")
-            track_name_elem.text = sanitize_xml_value(track['track_name'])
-            
-            # Durée
-            duration_elem = etree.SubElement(track_elem, "duration")
-            duration_elem.set("ms", str(track['duration_ms']))
-            duration_elem.text = format_duration(track['duration_ms'])
-            
-            # Popularité
-            popularity_elem = etree.SubElement(track_elem, "popularity")
-            popularity_elem.text = str(track['track_popularity'])
-            
-            # Album
-            album_elem = etree.SubElement(track_elem, "album")
-            album_elem.set("id", sanitize_xml_value(track['album']['id_album']))
-            
-            album_name_elem = etree.SubElement(album_elem, "name")
-            album_name_elem.text = sanitize_xml_value(track['album']['nom_album'])
-            
-            if track['album']['date_sortie']:
-                album_date_elem = etree.SubElement(album_elem, "release_date")
-                album_date_elem.text = sanitize_xml_value(track['album']['date_sortie'])
-            
-            # Artiste
-            artist_elem = etree.SubElement(track_elem, "artist")
-            artist_name_elem = etree.SubElement(artist_elem, "name")
-            artist_name_elem.text = sanitize_xml_value(track['artist']['nom_artist'])
-            
-            # Audio features (si disponibles)
-            audio_feat = track['audio_features']
-            if any(audio_feat.values()):
-                audio_elem = etree.SubElement(track_elem, "audio_features")
-                
-                if audio_feat['energy']:
-                    energy_elem = etree.SubElement(audio_elem, "energy")
-                    energy_elem.text = str(audio_feat['energy'])
-                
-                if audio_feat['tempo']:
-                    tempo_elem = etree.SubElement(audio_elem, "tempo")
-                    tempo_elem.text = str(audio_feat['tempo'])
-                
-                if audio_feat['danceability']:
-                    dance_elem = etree.SubElement(audio_elem, "danceability")
-                    dance_elem.text = str(audio_feat['danceability'])
-                
-                if audio_feat['loudness']:
-                    loud_elem = etree.SubElement(audio_elem, "loudness")
-                    loud_elem.text = str(audio_feat['loudness'])
-                
-                if audio_feat['valence']:
-                    valence_elem = etree.SubElement(audio_elem, "valence")
-                    valence_elem.text = str(audio_feat['valence'])
+        playlists_elem.append(build_playlist_element(playlist_data))
     
     # Créer l'arbre XML
     tree = etree.ElementTree(root)
@@ -267,6 +286,221 @@ def create_xml_from_data(data_list, output_path=None):
     return str(output_file)
 
 
+def stream_xml_from_rows(rows, total_playlists, total_tracks, output_path=None):
+    """
+    Écrit le fichier XML en flux à partir de lignes triées par playlist
+    (DatabaseManager.iter_data_for_xml).
+
+    Seules les pistes de la playlist en cours sont gardées en mémoire :
+    chaque élément <playlist> est écrit puis libéré. Les totaux de l'en-tête
+    sont fournis par l'appelant (DatabaseManager.count_data_for_xml) car ils
+    doivent être écrits avant le parcours des lignes.
+
+    Args:
+        rows: Itérable de dictionnaires triés par id_playlist
+        total_playlists: Nombre de playlists (attribut total_playlists)
+        total_tracks: Nombre de lignes (attribut total_tracks)
+        output_path: Chemin du fichier XML de sortie (optionnel)
+
+    Returns:
+        str: Chemin du fichier XML généré
+    """
+    if output_path is None:
+        output_path = XML_OUTPUT_PATH
+
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"\n🔄 Génération du fichier XML (en flux)...")
+    print(f"📁 Destination : {output_path}")
+
+    written_playlists = 0
+    written_tracks = 0
+
+    with open(output_file, 'wb') as f:
+        with etree.xmlfile(f, encoding='UTF-8') as xf:
+            xf.write_declaration()
+            root_attrs = {
+                'generated_at': datetime.now().isoformat(),
+                'total_playlists': str(total_playlists),
+                'total_tracks': str(total_tracks)
+            }
+            with xf.element("spotify_data", root_attrs):
+                xf.write("\n  ")
+                xf.write(etree.Comment(" Données Spotify exportées depuis Oracle Database "))
+                xf.write("\n  ")
+                with xf.element("playlists"):
+                    for playlist_id, playlist_rows in groupby(rows, key=itemgetter('id_playlist')):
+                        playlist_data = group_data_by_playlist(playlist_rows)[playlist_id]
+                        playlist_elem = build_playlist_element(playlist_data)
+                        etree.indent(playlist_elem, level=2)
+                        playlist_elem.tail = None
+                        xf.write("\n    ")
+                        xf.write(playlist_elem)
+
+                        written_playlists += 1
+                        written_tracks += len(playlist_data['tracks'])
+                    xf.write("\n  ")
+                xf.write("\n")
+        f.write(b"\n")
+
+    if written_playlists != total_playlists or written_tracks != total_tracks:
+        print(f"⚠️  Totaux de l'en-tête ({total_playlists} playlists, {total_tracks} tracks) "
+              f"différents des données écrites ({written_playlists}, {written_tracks})")
+
+    file_size_kb = output_file.stat().st_size / 1024
+
+    print(f"\n Fichier XML généré avec succès !")
+    print(f" Fichier : {output_path}")
+    print(f" Taille : {file_size_kb:.2f} KB")
+    print(f" Structure :")
+    print(f"   • {written_playlists} playlists")
+    print(f"   • {written_tracks} tracks")
+
+    return str(output_file)
+
+
+def write_xml_from_documents(document_chunks, total_playlists, total_tracks, output_path=None):
+    """
+    Écrit le fichier XML à partir d'éléments <playlist> déjà construits et
+    sérialisés par Oracle (DatabaseManager.iter_playlist_documents).
+
+    Les fragments sont recopiés tels quels, indentés sous <playlists> :
+    aucun regroupement ni construction d'arbre n'a lieu côté Python.
+
+    Args:
+        document_chunks: Itérable de paquets (listes) de fragments XML
+        total_playlists: Nombre de playlists (attribut total_playlists)
+        total_tracks: Nombre de tracks (attribut total_tracks)
+        output_path: Chemin du fichier XML de sortie (optionnel)
+
+    Returns:
+        str: Chemin du fichier XML généré
+    """
+    if output_path is None:
+        output_path = XML_OUTPUT_PATH
+
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"\n🔄 Génération du fichier XML (documents construits par Oracle)...")
+    print(f"📁 Destination : {output_path}")
+
+    written_playlists = 0
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+        f.write(f'<spotify_data generated_at="{datetime.now().isoformat()}" '
+                f'total_playlists="{total_playlists}" total_tracks="{total_tracks}">\n')
+        f.write("  <!-- Données Spotify exportées depuis Oracle Database -->\n")
+        f.write("  <playlists>\n")
+        for chunk in document_chunks:
+            for document in chunk:
+                f.write("    " + document.strip().replace("\n", "\n    ") + "\n")
+            written_playlists += len(chunk)
+        f.write("  </playlists>\n")
+        f.write("</spotify_data>\n")
+
+    if written_playlists != total_playlists:
+        print(f"⚠️  Totaux de l'en-tête ({total_playlists} playlists) "
+              f"différents des données écrites ({written_playlists})")
+
+    file_size_kb = output_file.stat().st_size / 1024
+
+    print(f"\n Fichier XML généré avec succès !")
+    print(f" Fichier : {output_path}")
+    print(f" Taille : {file_size_kb:.2f} KB")
+    print(f" Structure :")
+    print(f"   • {written_playlists} playlists")
+    print(f"   • {total_tracks} tracks")
+
+    return str(output_file)
+
+
+def write_playlist_fragment(rows, fragment_path):
+    """
+    Écrit les éléments <playlist> de lignes triées par playlist dans un
+    fragment de fichier, indentés comme sous <playlists> : une tranche de
+    l'extraction parallèle (DatabaseManager.extract_partitioned).
+
+    Args:
+        rows: Itérable de dictionnaires triés par id_playlist
+        fragment_path: Chemin du fragment à écrire
+
+    Returns:
+        tuple: (nombre de playlists, nombre de tracks) écrits
+    """
+    written_playlists = 0
+    written_tracks = 0
+
+    with open(fragment_path, 'wb') as f:
+        for playlist_id, playlist_rows in groupby(rows, key=itemgetter('id_playlist')):
+            playlist_data = group_data_by_playlist(playlist_rows)[playlist_id]
+            playlist_elem = build_playlist_element(playlist_data)
+            etree.indent(playlist_elem, level=2)
+            playlist_elem.tail = None
+            f.write(b"    " + etree.tostring(playlist_elem, encoding='UTF-8') + b"\n")
+
+            written_playlists += 1
+            written_tracks += len(playlist_data['tracks'])
+
+    return written_playlists, written_tracks
+
+
+def write_xml_from_fragments(fragments, total_playlists, total_tracks, output_path=None):
+    """
+    Assemble le fichier XML à partir des fragments de l'extraction parallèle,
+    recopiés dans l'ordre des tranches (donc des playlists).
+
+    Args:
+        fragments: Liste de tuples (chemin du fragment, (playlists, tracks))
+        total_playlists: Nombre de playlists (attribut total_playlists)
+        total_tracks: Nombre de tracks (attribut total_tracks)
+        output_path: Chemin du fichier XML de sortie (optionnel)
+
+    Returns:
+        str: Chemin du fichier XML généré
+    """
+    if output_path is None:
+        output_path = XML_OUTPUT_PATH
+
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"\n🔄 Assemblage du fichier XML ({len(fragments)} fragments)...")
+    print(f"📁 Destination : {output_path}")
+
+    written_playlists = sum(counts[0] for _, counts in fragments)
+    written_tracks = sum(counts[1] for _, counts in fragments)
+
+    with open(output_file, 'wb') as f:
+        f.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+        f.write(f'<spotify_data generated_at="{datetime.now().isoformat()}" '
+                f'total_playlists="{total_playlists}" total_tracks="{total_tracks}">\n'.encode('utf-8'))
+        f.write("  <!-- Données Spotify exportées depuis Oracle Database -->\n".encode('utf-8'))
+        f.write(b"  <playlists>\n")
+        for fragment_path, _ in fragments:
+            with open(fragment_path, 'rb') as fragment:
+                shutil.copyfileobj(fragment, f)
+        f.write(b"  </playlists>\n")
+        f.write(b"</spotify_data>\n")
+
+    if written_playlists != total_playlists or written_tracks != total_tracks:
+        print(f"⚠️  Totaux de l'en-tête ({total_playlists} playlists, {total_tracks} tracks) "
+              f"différents des données écrites ({written_playlists}, {written_tracks})")
+
+    file_size_kb = output_file.stat().st_size / 1024
+
+    print(f"\n Fichier XML généré avec succès !")
+    print(f" Fichier : {output_path}")
+    print(f" Taille : {file_size_kb:.2f} KB")
+    print(f" Structure :")
+    print(f"   • {written_playlists} playlists")
+    print(f"   • {written_tracks} tracks")
+
+    return str(output_file)
+
+
 def export_to_xml(data_list, output_path=None):
     """
     Fonction principale d'export XML.
@@ -293,6 +527,106 @@ def export_to_xml(data_list, output_path=None):
         return None
 
 
+def export_to_xml_stream(rows, totals, output_path=None):
+    """
+    Export XML en flux, à mémoire constante.
+
+    Args:
+        rows: Itérable de dictionnaires triés par playlist
+        totals: Tuple (nombre de playlists, nombre de lignes)
+        output_path: Chemin du fichier de sortie (optionnel)
+
+    Returns:
+        str: Chemin du fichier XML généré
+    """
+    try:
+        if not totals or not totals[1]:
+            print("⚠️  Aucune donnée à exporter.")
+            return None
+
+        return stream_xml_from_rows(rows, totals[0], totals[1], output_path)
+
+    except Exception as e:
+        print(f" Erreur lors de l'export XML : {e}")
+        import traceback
+        traceback.print_exc()
+        # Un fichier interrompu en cours d'extraction ne doit pas être publié
+        Path(output_path or XML_OUTPUT_PATH).unlink(missing_ok=True)
+        return None
+
+
+def export_to_xml_documents(document_chunks, totals, output_path=None):
+    """
+    Export XML à partir des documents générés côté serveur par Oracle.
+
+    Args:
+        document_chunks: Itérable de paquets de fragments <playlist>
+        totals: Tuple (nombre de playlists, nombre de lignes)
+        output_path: Chemin du fichier de sortie (optionnel)
+
+    Returns:
+        str: Chemin du fichier XML généré
+    """
+    try:
+        if not totals or not totals[1]:
+            print("⚠️  Aucune donnée à exporter.")
+            return None
+
+        return write_xml_from_documents(document_chunks, totals[0], totals[1], output_path)
+
+    except Exception as e:
+        print(f" Erreur lors de l'export XML : {e}")
+        import traceback
+        traceback.print_exc()
+        # Un fichier interrompu en cours de génération ne doit pas être publié
+        Path(output_path or XML_OUTPUT_PATH).unlink(missing_ok=True)
+        return None
+
+
+def export_to_xml_partitioned(extract_partitioned, totals, output_path=None, partitions=None):
+    """
+    Export XML à partir de l'extraction parallèle : chaque tranche de
+    playlists est écrite dans son fragment par le thread qui la lit, puis
+    les fragments sont assemblés dans l'ordre des tranches.
+
+    Args:
+        extract_partitioned: Fonction (consommateur, partitions) → résultats
+                             (DatabaseManager.extract_partitioned)
+        totals: Tuple (nombre de playlists, nombre de lignes)
+        output_path: Chemin du fichier de sortie (optionnel)
+        partitions: Nombre de tranches (défaut : celui du gestionnaire)
+
+    Returns:
+        str: Chemin du fichier XML généré
+    """
+    output_file = Path(output_path or XML_OUTPUT_PATH)
+
+    def write_partition(index, rows):
+        fragment_path = output_file.with_name(f"{output_file.name}.part{index}")
+        return fragment_path, write_playlist_fragment(rows, fragment_path)
+
+    try:
+        if not totals or not totals[1]:
+            print("⚠️  Aucune donnée à exporter.")
+            return None
+
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        fragments = extract_partitioned(write_partition, partitions)
+        if fragments is None:
+            return None
+
+        return write_xml_from_fragments(fragments, totals[0], totals[1], str(output_file))
+
+    except Exception as e:
+        print(f" Erreur lors de l'export XML : {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+    finally:
+        for fragment_path in output_file.parent.glob(f"{output_file.name}.part*"):
+            fragment_path.unlink()
+
+
 def validate_xml_structure(xml_file):
     """
     Valide que le fichier XML est bien formé.
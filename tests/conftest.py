@@ -0,0 +1,39 @@
+# Fichier : conftest.py
+
+import pytest
+
+import DB.db_manager
+import services.data_processor as data_processor
+from tests.helpers import SAMPLE_CSV
+
+
+@pytest.fixture(autouse=True)
+def isolated_outputs(tmp_path, monkeypatch):
+    """Écrit la quarantaine dans un répertoire temporaire propre à chaque test."""
+    monkeypatch.setattr(DB.db_manager, "QUARANTINE_DIR", str(tmp_path / "quarantine"))
+
+
+@pytest.fixture
+def sample_csv(monkeypatch):
+    """Source CSV configurée sur le fichier d'exemple du dépôt."""
+    monkeypatch.setattr(data_processor, "CSV_FILE_PATH", str(SAMPLE_CSV))
+    return SAMPLE_CSV
+
+
+@pytest.fixture
+def sqlite_db():
+    """Fabrique de bases SQLite en mémoire initialisées, fermées en fin de test."""
+    from DB.sqlite_manager import SQLiteDatabaseManager
+
+    managers = []
+
+    def create(db_path=':memory:'):
+        manager = SQLiteDatabaseManager(db_path)
+        assert manager.connect()
+        assert manager.initialize_db()
+        managers.append(manager)
+        return manager
+
+    yield create
+    for manager in managers:
+        manager.close()
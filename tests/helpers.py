@@ -0,0 +1,30 @@
+# Fichier : helpers.py
+
+from pathlib import Path
+
+import services.data_processor as data_processor
+
+# CSV d'exemple livré avec le dépôt
+SAMPLE_CSV = Path(__file__).resolve().parent.parent / "data" / "input" / "high_popularity_spotify_data.csv"
+
+
+def read_raw(path=SAMPLE_CSV):
+    """Lit et renomme le CSV brut, comme preprocess_csv."""
+    return data_processor._prepare_raw(data_processor.read_spotify_csv(str(path)), verbose=False)
+
+
+def normalize(df_raw):
+    """Tables normalisées (avec codes de substitution) d'un extrait du CSV brut."""
+    tables = data_processor.normalize_dataframe(df_raw.reset_index(drop=True), verbose=False)
+    return data_processor.assign_surrogate_codes(tables)
+
+
+def sorted_by_key(df, table):
+    """Trie une table par sa clé naturelle, index remis à zéro."""
+    keys = data_processor.TABLE_KEYS[table]
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+def extract_rows(db_manager, use_view=False):
+    """Lignes de l'extraction XML, triées (comparables d'une base à l'autre)."""
+    return sorted(tuple(sorted(row.items())) for row in db_manager.iter_data_for_xml(use_view=use_view))
@@ -0,0 +1,110 @@
+# Fichier : test_data_processor.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import services.data_processor as data_processor
+from services.data_processor import (CODE_PREFIX, CODE_REFERENCES, CSV_SCHEMA, SURROGATE_CODES,
+                                     TABLE_KEYS, _SeenKeys, build_code_dictionaries,
+                                     clean_column_name, preprocess_csv, preprocess_csv_chunks,
+                                     read_spotify_csv)
+from tests.helpers import sorted_by_key
+
+
+def test_reader_loads_only_declared_columns(sample_csv):
+    df = read_spotify_csv(str(sample_csv))
+
+    assert len(pd.read_csv(sample_csv, nrows=0).columns) > len(df.columns)
+    for col in df.columns:
+        declared = CSV_SCHEMA[clean_column_name(col)]
+        if declared is str:
+            assert pd.api.types.is_string_dtype(df[col]), col
+        else:
+            assert df[col].dtype == declared, col
+
+
+@pytest.mark.parametrize("chunksize", [97, 500, 5000])
+def test_chunks_match_full_preprocessing(sample_csv, chunksize):
+    full = preprocess_csv(use_cache=False)
+    batches = list(preprocess_csv_chunks(chunksize=chunksize))
+
+    for table in TABLE_KEYS:
+        expected = full[table][[col for col in full[table].columns if not col.startswith(CODE_PREFIX)]]
+        streamed = pd.concat([batch[table] for batch in batches], ignore_index=True)
+
+        assert not streamed.duplicated(subset=TABLE_KEYS[table]).any(), table
+        pd.testing.assert_frame_equal(
+            sorted_by_key(streamed[expected.columns], table),
+            sorted_by_key(expected, table),
+            check_dtype=False, check_categorical=False, obj=table
+        )
+
+
+def test_seen_keys_emits_each_key_once():
+    seen = _SeenKeys(['key'])
+    rng = np.random.default_rng(0)
+    emitted = []
+
+    for _ in range(40):
+        chunk = pd.DataFrame({'key': rng.integers(0, 2000, 300).astype(str)}).drop_duplicates()
+        emitted.extend(seen.filter_new(chunk)['key'])
+
+    assert len(emitted) == len(set(emitted)) == len(seen)
+    # Les tableaux triés sont fusionnés au fil des blocs : leur nombre reste logarithmique
+    assert len(seen._blocks) <= 12
+
+
+def test_cache_defaults_off_without_pyarrow(sample_csv, monkeypatch, capsys):
+    def no_cache_key(*args):
+        raise AssertionError("le cache ne doit pas être consulté")
+
+    monkeypatch.setattr(data_processor, "USE_TABLE_CACHE", None)
+    monkeypatch.setattr(data_processor, "FEATHER_AVAILABLE", False)
+    monkeypatch.setattr(data_processor, "compute_cache_key", no_cache_key)
+    preprocess_csv()
+
+    assert "pyarrow" not in capsys.readouterr().out
+
+
+def test_missing_names_stored_as_nan_string(sample_csv):
+    data = preprocess_csv(use_cache=False)
+
+    for table, col in [('sp_albums', 'nom_album'), ('sp_tracks', 'nom_track'),
+                       ('sp_playlists', 'nom_playlist')]:
+        assert data[table][col].notna().all(), table
+    assert (data['sp_albums']['nom_album'] == 'nan').any()
+
+
+def test_surrogate_codes_are_dense_and_decodable(sample_csv):
+    data = preprocess_csv(use_cache=False)
+    dictionaries = build_code_dictionaries(data)
+
+    for table, (code_col, key_col) in SURROGATE_CODES.items():
+        codes = data[table][code_col]
+        assert codes.dtype == np.int32, table
+        assert np.array_equal(codes.to_numpy(), np.arange(len(codes))), table
+        decoded = dictionaries[code_col].loc[codes].to_numpy()
+        assert np.array_equal(decoded, data[table][key_col].to_numpy()), table
+
+    for table, ref_col, parent in CODE_REFERENCES:
+        code_col, parent_key = SURROGATE_CODES[parent]
+        refs = data[table]
+        known = refs[ref_col].isin(data[parent][parent_key])
+        assert (refs.loc[~known, code_col] == -1).all(), (table, ref_col)
+        decoded = dictionaries[code_col].loc[refs.loc[known, code_col]].to_numpy()
+        assert np.array_equal(decoded, refs.loc[known, ref_col].to_numpy()), (table, ref_col)
+
+
+def test_multi_file_preprocessing_matches_single_file(sample_csv, tmp_path, monkeypatch):
+    lines = sample_csv.read_text(encoding='utf-8').splitlines(keepends=True)
+    # Deux fichiers qui se recouvrent : la fusion doit dédupliquer entre fichiers
+    (tmp_path / "a.csv").write_text(''.join(lines[:1100]), encoding='utf-8')
+    (tmp_path / "b.csv").write_text(''.join(lines[:1] + lines[700:]), encoding='utf-8')
+    single = preprocess_csv(use_cache=False)
+
+    monkeypatch.setattr(data_processor, "CSV_FILE_PATH", str(tmp_path))
+    merged = preprocess_csv(use_cache=False)
+
+    for table in TABLE_KEYS:
+        pd.testing.assert_frame_equal(merged[table], single[table], obj=table)
@@ -0,0 +1,130 @@
+# Fichier : test_db_manager.py
+
+import time
+
+import oracledb
+import pandas as pd
+import pytest
+
+from DB.db_manager import TABLE_LOADERS, DatabaseManager
+from DB.db_schema import TABLE_DEPENDENCIES
+
+
+class FakeCursor:
+    """Curseur minimal : executemany échoue sur les lots contenant une ligne marquée."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def execute(self, sql, parameters=None):
+        self.connection.statements.append(sql.split()[0])
+
+    def executemany(self, sql, rows, batcherrors=False):
+        self.connection.batcherrors.append(batcherrors)
+        if any(row[0] == 'bad' for row in rows):
+            raise oracledb.DatabaseError("ORA-01438: valeur trop grande")
+        self.rowcount = len(rows)
+
+    def getbatcherrors(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class ReturningCursor(FakeCursor):
+    """Curseur dont executemany renvoie un ID généré par ligne (RETURNING ... INTO)."""
+
+    def var(self, type_, arraysize):
+        self.returned = FakeVar()
+        return self.returned
+
+    def setinputsizes(self, *sizes):
+        pass
+
+    def executemany(self, sql, rows, batcherrors=False):
+        super().executemany(sql, rows, batcherrors)
+        self.returned.values = [[100 + i] for i in range(len(rows))]
+
+
+class FakeVar:
+    def getvalue(self, position):
+        return self.values[position]
+
+
+class FakeConnection:
+    def __init__(self, cursor_class=FakeCursor):
+        self.cursor_class = cursor_class
+        self.commits = 0
+        self.rollbacks = 0
+        self.batcherrors = []
+        self.statements = []
+
+    def cursor(self):
+        return self.cursor_class(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_failed_chunk_does_not_drop_following_chunks():
+    connection = FakeConnection()
+    rows = [['ok']] * 4 + [['bad']] + [['ok']] * 5
+    failed = []
+
+    processed = DatabaseManager()._execute_many(
+        "INSERT /*+ APPEND_VALUES */ INTO t (c) VALUES (:1)", rows, batch_size=3,
+        connection=connection, batch_errors=False, failed_chunks=failed
+    )
+
+    # Lots [0:3] [3:6] [6:9] [9:10] : seul le deuxième est annulé
+    assert processed == 7
+    assert [(start, size) for start, size, _ in failed] == [(3, 3)]
+    assert connection.commits == 3 and connection.rollbacks == 1
+    assert connection.batcherrors == [False] * 4
+
+
+def test_failed_staging_chunk_aborts_merge():
+    connection = FakeConnection()
+    rows = [['ok', 1]] * 4 + [['bad', 1]]
+
+    with pytest.raises(oracledb.Error):
+        DatabaseManager()._merge_rows('sp_playlists', ['id_playlist', 'id_subgenre'], rows, connection)
+
+    # Préparation partielle : le MERGE n'est pas lancé et rien n'est validé
+    assert connection.statements == ['TRUNCATE']
+    assert connection.commits == 0
+
+
+def test_identity_insert_maps_keys_in_one_round_trip():
+    connection = FakeConnection(ReturningCursor)
+    genres = pd.DataFrame({'nom_genre': ['pop', 'rock', 'jazz']})
+
+    id_map = DatabaseManager()._insert_with_identity('sp_genres', genres, ['nom_genre'], 'id_genre',
+                                                     connection=connection)
+
+    assert id_map == {'pop': 100, 'rock': 101, 'jazz': 102}
+    assert len(connection.batcherrors) == 1 and connection.commits == 1
+
+
+def test_load_graph_starts_tables_after_their_parents(monkeypatch):
+    def timed_load(table, data_dict, state, load_start, connection=None):
+        start = time.perf_counter() - load_start
+        time.sleep(0.05)
+        return start, time.perf_counter() - load_start
+
+    manager = DatabaseManager()
+    monkeypatch.setattr(manager, "_timed_load", timed_load)
+    timings = manager._run_load_graph({}, {}, workers=4, load_start=time.perf_counter())
+
+    assert timings.keys() == TABLE_LOADERS.keys()
+    for table, (start, _) in timings.items():
+        for parent in TABLE_DEPENDENCIES.get(table, []):
+            assert start >= timings[parent][1], (parent, table)
+    # Tables sans dépendance entre elles : chargées en même temps
+    genres, artists = timings['sp_genres'], timings['sp_artists']
+    assert genres[0] < artists[1] and artists[0] < genres[1]
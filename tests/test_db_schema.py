@@ -0,0 +1,32 @@
+# Fichier : test_db_schema.py
+
+import re
+
+from DB.db_schema import (CREATE_TABLES_SQL, SECONDARY_INDEXES, STORAGE_PROFILES,
+                          TABLE_DEPENDENCIES, get_create_tables_sql, get_table_dependencies)
+
+
+def _table_blocks(create_sql):
+    """{table: corps du CREATE TABLE}"""
+    return {match.group(1).lower(): match.group(2)
+            for match in re.finditer(r'CREATE\s+TABLE\s+(\w+)\s*\((.*?)\n\)', create_sql, re.DOTALL)}
+
+
+def test_every_foreign_key_is_indexed():
+    indexed = {(table, columns[0]) for table, columns in SECONDARY_INDEXES.values()}
+
+    for table, body in _table_blocks(CREATE_TABLES_SQL).items():
+        # Colonne de tête de la clé primaire (en ligne ou en contrainte) : déjà indexée
+        primary = re.search(r'^\s*(\w+) [^,\n]*PRIMARY KEY|PRIMARY KEY \((\w+)', body, re.MULTILINE)
+        leading = primary.group(1) or primary.group(2)
+        for column in re.findall(r'FOREIGN KEY \((\w+)\)', body):
+            assert (table, column) in indexed or column == leading, (table, column)
+
+
+def test_compact_profile_keeps_schema_and_adds_clauses():
+    compact = get_create_tables_sql('compact')
+
+    assert get_create_tables_sql('standard') == CREATE_TABLES_SQL
+    assert get_table_dependencies(compact) == TABLE_DEPENDENCIES
+    for table, clause in STORAGE_PROFILES['compact'].items():
+        assert re.search(rf'CREATE TABLE {table} \(.*?\n\)\n{re.escape(clause)};', compact, re.DOTALL), table
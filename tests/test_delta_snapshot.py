@@ -0,0 +1,102 @@
+# Fichier : test_delta_snapshot.py
+
+import pytest
+
+from services.data_processor import TABLE_KEYS
+from services.delta_snapshot import (build_snapshot, compute_delta, load_snapshot,
+                                     restore_rejected_rows, save_snapshot)
+from tests.helpers import extract_rows, normalize, read_raw
+
+
+@pytest.fixture(scope="module")
+def versions():
+    """Deux exécutions successives : lignes retirées, ajoutées et modifiées."""
+    raw = read_raw()
+    previous = raw.iloc[:1200].copy()
+    current = raw.iloc[400:].copy()
+    current.loc[current.index[:50], 'energy'] = 0.5
+    return normalize(previous), normalize(current)
+
+
+def test_unchanged_data_gives_empty_delta(versions):
+    previous, _ = versions
+    delta, _ = compute_delta(previous, build_snapshot(previous))
+
+    for kind in ('inserted', 'updated', 'deleted'):
+        assert all(df.empty for df in delta[kind].values()), kind
+
+
+def test_delta_classifies_rows(versions):
+    previous, current = versions
+    delta, snapshot = compute_delta(current, build_snapshot(previous))
+
+    assert not delta['inserted']['sp_playlist_tracks'].empty
+    assert not delta['deleted']['sp_playlist_tracks'].empty
+    assert len(delta['updated']['sp_audio_features']) > 0
+    assert snapshot.keys() == TABLE_KEYS.keys()
+
+
+def test_apply_delta_matches_full_load(sqlite_db, versions):
+    previous, current = versions
+    delta, _ = compute_delta(current, build_snapshot(previous))
+
+    db = sqlite_db()
+    assert db.insert_data(previous)
+    assert db.apply_delta(delta)
+
+    reference = sqlite_db()
+    reference.insert_data(current)
+    assert extract_rows(db) == extract_rows(reference)
+
+
+def test_rejected_delta_rows_are_retried(sqlite_db, versions):
+    previous, current = versions
+    previous_snapshot = build_snapshot(previous)
+    delta, snapshot = compute_delta(current, previous_snapshot)
+    # Nouvel album sans nom (NOT NULL) : mis en quarantaine avec ses pistes
+    albums = delta['inserted']['sp_albums']
+    album = albums.loc[0, 'id_album']
+    albums.loc[0, 'nom_album'] = None
+
+    db = sqlite_db()
+    db.insert_data(previous)
+    rejected = {}
+    assert db.apply_delta(delta, rejected=rejected)
+    assert (album,) in rejected['sp_albums']
+    assert rejected['sp_tracks']
+
+    retry, _ = compute_delta(current, restore_rejected_rows(snapshot, previous_snapshot, rejected))
+    assert list(retry['inserted']['sp_albums']['id_album']) == [album]
+    assert db.apply_delta(retry)
+
+    reference = sqlite_db()
+    reference.insert_data(current)
+    assert extract_rows(db) == extract_rows(reference)
+
+
+def test_snapshot_round_trip(versions, tmp_path):
+    pytest.importorskip("pyarrow")
+    previous, _ = versions
+    snapshot = build_snapshot(previous)
+
+    assert save_snapshot(snapshot, tmp_path / "snapshot")
+    loaded = load_snapshot(tmp_path / "snapshot")
+    for table, df in snapshot.items():
+        assert loaded[table].equals(df), table
+
+
+def test_failed_delta_leaves_database_unchanged(sqlite_db, versions, monkeypatch):
+    previous, current = versions
+    delta, _ = compute_delta(current, build_snapshot(previous))
+
+    db = sqlite_db()
+    db.insert_data(previous)
+    before = extract_rows(db)
+
+    # Échec après les insertions et les mises à jour, au moment des suppressions
+    def fail(*args, **kwargs):
+        raise db.Error("échec simulé")
+
+    monkeypatch.setattr(db, "_delete_rows", fail)
+    assert not db.apply_delta(delta)
+    assert extract_rows(db) == before
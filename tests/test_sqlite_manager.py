@@ -0,0 +1,122 @@
+# Fichier : test_sqlite_manager.py
+
+import pytest
+
+from services.data_processor import preprocess_csv, preprocess_csv_chunks
+from services.delta_snapshot import build_snapshot, compute_delta
+from tests.helpers import extract_rows, normalize, read_raw
+
+
+@pytest.fixture(scope="module")
+def sample_data():
+    return normalize(read_raw())
+
+
+def test_round_trip_counts(sqlite_db, sample_data):
+    db = sqlite_db()
+    assert db.insert_data(sample_data)
+
+    stats = db.get_statistics()
+    assert stats == {table: len(df) for table, df in sample_data.items()}
+
+
+def test_extract_rows_types_and_nulls(sqlite_db, sample_data):
+    db = sqlite_db()
+    db.insert_data(sample_data)
+
+    rows = list(db.iter_data_for_xml(use_view=False))
+    assert len(rows) == len(sample_data['sp_playlist_tracks'])
+    for row in rows:
+        assert isinstance(row['duration_ms'], int)
+        assert isinstance(row['track_popularity'], int)
+        assert None not in row.values()
+
+
+def test_extract_view_matches_join(sqlite_db, sample_data, monkeypatch):
+    monkeypatch.setattr("DB.db_manager.DB_EXTRACT_VIEW", True)
+    db = sqlite_db()
+    db.insert_data(sample_data)
+
+    assert db._use_extract_view()
+    assert extract_rows(db, use_view=True) == extract_rows(db, use_view=False)
+
+
+def test_upsert_replay_keeps_contents(sqlite_db, sample_data):
+    db = sqlite_db()
+    db.insert_data(sample_data)
+    before = extract_rows(db)
+
+    assert db.insert_data(sample_data, upsert=True)
+    assert extract_rows(db) == before
+    assert db.get_statistics() == {table: len(df) for table, df in sample_data.items()}
+
+
+def test_upsert_applies_changes_idempotently(sqlite_db, sample_data):
+    changed = {table: df.copy() for table, df in sample_data.items()}
+    changed['sp_tracks'].loc[:19, 'track_popularity'] = 1
+    changed['sp_playlists'].loc[:4, 'nom_playlist'] = 'Renommée'
+
+    db = sqlite_db()
+    db.insert_data(sample_data)
+    assert db.insert_data(changed, upsert=True)
+    after_first = extract_rows(db)
+    assert db.insert_data(changed, upsert=True)
+
+    reference = sqlite_db()
+    reference.insert_data(changed)
+    assert extract_rows(db) == after_first == extract_rows(reference)
+
+
+def test_statistics_cache_follows_writes(sqlite_db, sample_data):
+    db = sqlite_db()
+    expected = {table: len(df) for table, df in sample_data.items()}
+    assert set(db.get_statistics().values()) == {0}
+
+    db.insert_data(sample_data)
+    assert db.get_statistics() == expected
+
+    # Écriture hors du gestionnaire : visible seulement avec refresh
+    db.connection.execute("DELETE FROM sp_playlist_tracks")
+    db.connection.commit()
+    assert db.get_statistics() == expected
+    assert db.get_statistics(refresh=True)['sp_playlist_tracks'] == 0
+
+    db.insert_data(sample_data, upsert=True)
+    assert db.get_statistics() == expected
+
+    delta, _ = compute_delta(normalize(read_raw()[:600]), build_snapshot(sample_data))
+    db.apply_delta(delta)
+    after_delta = db.get_statistics()
+    assert after_delta != expected
+    assert after_delta == db.get_statistics(refresh=True)
+
+    db.initialize_db(drop_first=True)
+    assert set(db.get_statistics().values()) == {0}
+
+
+def test_streamed_load_matches_full_load(sqlite_db, sample_csv):
+    full_db, streamed_db = sqlite_db(), sqlite_db()
+    full_db.insert_data(preprocess_csv(use_cache=False))
+    streamed_db.insert_data(preprocess_csv_chunks(chunksize=250))
+
+    assert extract_rows(streamed_db) == extract_rows(full_db)
+
+
+@pytest.mark.parametrize("partitions", [1, 3])
+def test_partitioned_extract_matches_serial(sqlite_db, sample_data, tmp_path, partitions):
+    db = sqlite_db(str(tmp_path / "spotify.db"))
+    db.insert_data(sample_data)
+
+    parts = db.extract_partitioned(lambda index, rows: list(rows), partitions=partitions)
+
+    assert len(parts) == partitions
+    assert [row for part in parts for row in part] == list(db.iter_data_for_xml())
+
+
+def test_partitioned_extract_in_memory(sqlite_db, sample_data):
+    db = sqlite_db()
+    db.insert_data(sample_data)
+
+    assert db.extract_partitioned(lambda index, rows: list(rows), partitions=3) is None
+    parts = db.extract_partitioned(lambda index, rows: list(rows), partitions=1)
+    assert parts == [list(db.iter_data_for_xml())]
@@ -0,0 +1,43 @@
+# Fichier : test_xml_exporter.py
+
+import sqlite3
+
+import pytest
+
+from services.xml_exporter import export_to_xml_documents, export_to_xml_stream
+from tests.helpers import normalize, read_raw
+
+
+def test_extraction_error_fails_stream_export(sqlite_db, monkeypatch, tmp_path):
+    db = sqlite_db()
+    db.insert_data(normalize(read_raw()))
+    rows = list(db.iter_data_for_xml())
+
+    def failing_rows(*args, **kwargs):
+        yield from rows[:50]
+        raise sqlite3.OperationalError("connexion perdue")
+
+    monkeypatch.setattr(db, "_iter_extract_rows", failing_rows)
+    output = tmp_path / "export.xml"
+
+    assert export_to_xml_stream(db.iter_data_for_xml(), (72, len(rows)), str(output)) is None
+    assert not output.exists()
+
+
+def test_document_error_fails_document_export(tmp_path):
+    def failing_documents():
+        yield ["<playlist id_playlist=\"1\"/>"]
+        raise sqlite3.OperationalError("connexion perdue")
+
+    output = tmp_path / "export.xml"
+
+    assert export_to_xml_documents(failing_documents(), (72, 1670), str(output)) is None
+    assert not output.exists()
+
+
+def test_sqlite_refuses_server_side_documents(sqlite_db):
+    db = sqlite_db()
+
+    assert not db.SERVER_SIDE_DOCUMENTS
+    with pytest.raises(NotImplementedError):
+        db.iter_playlist_documents('xml')